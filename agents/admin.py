@@ -1,3 +1,33 @@
 from django.contrib import admin
+from .models import ExtractionJob, PipelineResultCache, TranscriptCache, VerificationJob
 
-# Register your models here.
+
+@admin.register(VerificationJob)
+class VerificationJobAdmin(admin.ModelAdmin):
+    list_display = ['id', 'canonical_claim', 'status', 'lane', 'priority', 'attempts', 'lease_owner', 'created_at', 'completed_at']
+    list_filter = ['status', 'lane', 'created_at']
+    search_fields = ['canonical_claim', 'last_error']
+    readonly_fields = ['created_at', 'updated_at', 'completed_at']
+    raw_id_fields = ['claim']
+
+
+@admin.register(TranscriptCache)
+class TranscriptCacheAdmin(admin.ModelAdmin):
+    list_display = ['video_id', 'language_code', 'is_generated', 'segment_count', 'hits', 'fetched_at', 'expires_at']
+    list_filter = ['language_code', 'is_generated']
+    search_fields = ['video_id']
+    exclude = ['segments']
+
+
+@admin.register(ExtractionJob)
+class ExtractionJobAdmin(admin.ModelAdmin):
+    list_display = ['id', 'source_type', 'status', 'stage', 'attempts', 'created_by', 'created_at', 'completed_at']
+    list_filter = ['status', 'source_type', 'created_at']
+    readonly_fields = ['created_at', 'started_at', 'completed_at']
+
+
+@admin.register(PipelineResultCache)
+class PipelineResultCacheAdmin(admin.ModelAdmin):
+    list_display = ['key', 'source_type', 'pipeline_version', 'timed_out_sentences', 'hits', 'created_at', 'expires_at']
+    list_filter = ['source_type', 'pipeline_version']
+    exclude = ['claims']
@@ -0,0 +1,185 @@
+# agents/batch_ingestion.py
+"""
+Batch ingestion of YouTube playlists, channels and lists of videos.
+
+Playlists and channels are expanded to their videos, then transcripts
+are fetched and their claims extracted on two thread pools (see
+agents/batch_pipeline.py). Cached transcripts cost no request to
+YouTube. Videos making the same claim are counted, so the summary can
+point at the claims repeated most widely.
+"""
+import re
+import time
+from collections import Counter
+from urllib.parse import parse_qs, urlsplit
+
+import requests
+from django.conf import settings
+from django.db import close_old_connections
+
+from agents.batch_pipeline import HostRateLimiter, StagePools
+from agents.claim_extractor.pipeline import run_pipeline
+from agents.claim_extractor.result_cache import cached_result, store_result, transcript_key
+from agents.deadline import Deadline
+from agents.verification_queue import enqueue_claims
+from agents.yt_transcript_extractor.extractor import extract_video_id, load_transcript
+
+YOUTUBE_HOST = "www.youtube.com"
+
+# Largest playlist/channel page we expand (YouTube lists ~100 videos per page)
+MAX_VIDEOS_PER_SOURCE = 200
+
+PLAYLIST_TIMEOUT = 15
+VIDEO_ID_IN_PAGE = re.compile(r'"videoId":"([0-9A-Za-z_-]{11})"')
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
+    'Accept-Language': 'en-US,en;q=0.9',
+}
+
+
+def is_collection_url(value: str) -> bool:
+    """Playlist or channel URLs, as opposed to a single video"""
+    parts = urlsplit(value)
+    if 'list' in parse_qs(parts.query) and 'v' not in parse_qs(parts.query):
+        return True
+    return bool(re.match(r'^/(@[^/]+|channel/[^/]+|c/[^/]+|user/[^/]+)', parts.path))
+
+
+def expand_collection(url: str, limiter: HostRateLimiter) -> list[str]:
+    """Video ids listed on a playlist or channel page, in page order"""
+    parts = urlsplit(url)
+    if 'list' in parse_qs(parts.query):
+        page_url = f"https://{YOUTUBE_HOST}/playlist?list={parse_qs(parts.query)['list'][0]}"
+    else:
+        page_url = f"https://{YOUTUBE_HOST}{parts.path.rstrip('/')}"
+        if not page_url.endswith('/videos'):
+            page_url += '/videos'
+
+    limiter.wait(YOUTUBE_HOST)
+    response = requests.get(page_url, headers=HEADERS, timeout=PLAYLIST_TIMEOUT)
+    response.raise_for_status()
+    return list(dict.fromkeys(VIDEO_ID_IN_PAGE.findall(response.text)))[:MAX_VIDEOS_PER_SOURCE]
+
+
+def resolve_video_ids(inputs: list[str], limiter: HostRateLimiter) -> tuple[list[str], list[dict]]:
+    """
+    Turns video URLs/ids, playlist URLs and channel URLs into a de-duplicated
+    list of video ids. Returns (video_ids, errors).
+    """
+    video_ids, errors = [], []
+    for value in inputs:
+        value = value.strip()
+        if not value:
+            continue
+        try:
+            if is_collection_url(value):
+                found = expand_collection(value, limiter)
+                print(f"[Batch] {value}: {len(found)} videos")
+                video_ids.extend(found)
+            else:
+                video_id = extract_video_id(value)
+                if not video_id:
+                    raise ValueError("Could not extract video ID from URL")
+                video_ids.append(video_id)
+        except Exception as e:
+            errors.append({'input': value, 'error': str(e)})
+    return list(dict.fromkeys(video_ids)), errors
+
+
+def save_video_claims(claims: list[dict], video_id: str, user=None) -> int:
+    """Saves a video's claims to notes and queues them for verification"""
+    from notes.services.claim_persistence import save_pipeline_claims
+
+    video_url = f"https://{YOUTUBE_HOST}/watch?v={video_id}"
+    saved = save_pipeline_claims(claims, 'youtube', video_url, user)
+    return enqueue_claims(saved, lane='bulk') if saved else 0
+
+
+def fetch_video(video_id: str, limiter: HostRateLimiter, force_refresh: bool = False):
+    try:
+        # A transcript costs two YouTube requests (list, then fetch), each
+        # spaced by the limiter; cache hits make none
+        return load_transcript(video_id, force_refresh=force_refresh,
+                               before_request=lambda: limiter.wait(YOUTUBE_HOST))[0]
+    finally:
+        close_old_connections()
+
+
+def extract_video(video_id: str, document, save: bool, user=None, force_refresh: bool = False) -> dict:
+    try:
+        key = transcript_key(document)
+        cached = None if force_refresh else cached_result(key)
+        if cached:
+            claims = cached.claims
+        else:
+            deadline = Deadline(settings.EXTRACTION_JOB_DEADLINE_SECONDS)
+            store = run_pipeline(document.page_content, deadline, document=document)
+            claims = store.all()
+            store_result(key, 'youtube', claims, len(store.timed_out_sentences))
+        queued = save_video_claims(claims, video_id, user) if save else 0
+        return {'claims': claims, 'queued': queued}
+    finally:
+        close_old_connections()
+
+
+def ingest_videos(inputs: list[str], fetch_workers: int = None, extract_workers: int = None,
+                  requests_per_second: float = None, save: bool = True,
+                  force_refresh: bool = False, user=None):
+    """
+    Ingests videos, playlists and channels, yielding 'resolved', then
+    'fetched' / 'extracted' / 'error' for each video, and finally
+    {'event': 'done', 'summary': {...}} with per-video results.
+    """
+    fetch_workers = fetch_workers or settings.BATCH_FETCH_WORKERS
+    extract_workers = extract_workers or settings.BATCH_EXTRACT_WORKERS
+    limiter = HostRateLimiter(requests_per_second or settings.YOUTUBE_REQUESTS_PER_SECOND)
+    started = time.monotonic()
+
+    video_ids, errors = resolve_video_ids(inputs, limiter)
+    for error in errors:
+        yield {'event': 'error', 'stage': 'resolve', **error}
+    yield {'event': 'resolved', 'videos': len(video_ids)}
+
+    results = {}
+    claim_videos = Counter()
+    with StagePools({'fetch': fetch_workers, 'extract': extract_workers}, 'yt') as pools:
+        for video_id in video_ids:
+            pools.submit('fetch', video_id, fetch_video, video_id, limiter, force_refresh)
+        for stage, video_id, future in pools.completed():
+            try:
+                value = future.result()
+            except Exception as e:
+                results[video_id] = {'status': 'failed', 'stage': stage, 'error': str(e)}
+                yield {'event': 'error', 'stage': stage, 'video_id': video_id, 'error': str(e)}
+                continue
+
+            if stage == 'fetch':
+                cached = value.metadata.get('cached', False)
+                results[video_id] = {'status': 'fetched', 'cached': cached}
+                yield {'event': 'fetched', 'video_id': video_id, 'cached': cached,
+                       'characters': len(value.page_content)}
+                pools.submit('extract', video_id, extract_video, video_id, value, save, user, force_refresh)
+            else:
+                claims = value['claims']
+                claim_videos.update({c['canonical_claim'] for c in claims})
+                results[video_id].update(status='done', claims=len(claims), queued=value['queued'])
+                yield {'event': 'extracted', 'video_id': video_id, 'claims': len(claims),
+                       'queued': value['queued'],
+                       'done': sum(1 for r in results.values() if r['status'] in ('done', 'failed')),
+                       'total': len(video_ids)}
+
+    yield {'event': 'done', 'summary': {
+        'videos': len(video_ids),
+        'succeeded': sum(1 for r in results.values() if r['status'] == 'done'),
+        'failed': sum(1 for r in results.values() if r['status'] == 'failed') + len(errors),
+        'from_cache': sum(1 for r in results.values() if r.get('cached')),
+        'claims': sum(r.get('claims', 0) for r in results.values()),
+        'queued_for_verification': sum(r.get('queued', 0) for r in results.values()),
+        # Claims made in more than one video are the most worth checking
+        'repeated_claims': [
+            {'canonical_claim': claim, 'videos': count}
+            for claim, count in claim_videos.most_common(10) if count > 1
+        ],
+        'per_video': results,
+        'seconds': round(time.monotonic() - started, 1),
+    }}
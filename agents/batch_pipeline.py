@@ -0,0 +1,81 @@
+# agents/batch_pipeline.py
+"""
+Building blocks shared by the batch pipelines (video ingestion in
+agents/batch_ingestion.py, article analysis in analyzer/batch.py).
+
+Both fetch items over the network on one thread pool and hand each
+fetched item to a second pool as soon as it arrives, so slow pages or
+transcripts never hold up work on the ones already downloaded. Requests
+are kept polite per host by HostRateLimiter.
+"""
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+
+class HostRateLimiter:
+    """
+    Per-host politeness: requests spaced at least 1/rate seconds apart
+    and, with `max_concurrent`, at most that many in flight per host
+    """
+
+    def __init__(self, requests_per_second: float, max_concurrent: int = None):
+        self.interval = 1.0 / requests_per_second if requests_per_second > 0 else 0.0
+        self.max_concurrent = max_concurrent
+        self._lock = threading.Lock()
+        self._next_slot: dict[str, float] = {}
+        self._semaphores: dict[str, threading.BoundedSemaphore] = {}
+
+    def wait(self, host: str):
+        """Blocks until the next request to `host` may be sent"""
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, 0.0))
+            self._next_slot[host] = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+    def acquire(self, host: str):
+        """wait(), first taking one of the host's in-flight slots; pair with release()"""
+        if self.max_concurrent:
+            with self._lock:
+                semaphore = self._semaphores.setdefault(host, threading.BoundedSemaphore(self.max_concurrent))
+            semaphore.acquire()
+        self.wait(host)
+
+    def release(self, host: str):
+        if self.max_concurrent:
+            self._semaphores[host].release()
+
+
+class StagePools:
+    """
+    One thread pool per pipeline stage. Calls are submitted with the stage
+    and the item they work on; `completed()` yields (stage, item, future)
+    as each finishes, and may be fed new calls (the next stage) meanwhile.
+    Leaving the `with` block cancels whatever hasn't started.
+    """
+
+    def __init__(self, workers: dict[str, int], thread_name_prefix: str):
+        self.pools = {
+            stage: ThreadPoolExecutor(max_workers=count, thread_name_prefix=f"{thread_name_prefix}-{stage}")
+            for stage, count in workers.items()
+        }
+        self.pending = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        for pool in self.pools.values():
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def submit(self, stage: str, item, fn, *args):
+        self.pending[self.pools[stage].submit(fn, *args)] = (stage, item)
+
+    def completed(self):
+        while self.pending:
+            done, _ = wait(self.pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                stage, item = self.pending.pop(future)
+                yield stage, item, future
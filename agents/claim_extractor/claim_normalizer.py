@@ -1,6 +1,7 @@
 from langchain_core.prompts import ChatPromptTemplate, PromptTemplate
 from langchain_core.output_parsers import StrOutputParser, PydanticOutputParser
-from .llm_config import llm
+from .llm_config import llm, llm_for
+from agents.singleflight import flight_key, singleflight
 
 from pydantic import BaseModel, Field
 from typing import Optional
@@ -77,19 +78,29 @@ def build_canonical_claim(fields: dict) -> str:
     ])
 
 
-def normalize_claim(sentence_record: dict) -> dict | None:
+def normalize_claim(sentence_record: dict, deadline=None) -> dict | None:
     if sentence_record.get("label") != "FACT_CLAIM":
         return None
 
-    temp = chain.invoke(
-        {"sentence": sentence_record["text"]}
+    text = sentence_record["text"]
+    temp = singleflight.do(
+        flight_key("normalize", llm.model_name, text),
+        lambda: (prompt | llm_for(deadline) | parser).invoke({"sentence": text}),
+        serialize=lambda claim: claim.model_dump(),
+        deserialize=ExtractedClaim.model_validate,
+        deadline=deadline
     )
 
     canonical = build_canonical_claim(temp.model_dump())
 
-    return {
+    claim = {
         "canonical_claim": canonical,
         "sentence_id": sentence_record["sentence_id"],
         "paragraph_index": sentence_record["paragraph_index"],
         "original_sentence": sentence_record["text"]
     }
+    # Video timestamps, for sentences from a transcript
+    for key in ("start_time", "end_time", "timestamp", "timestamp_url"):
+        if key in sentence_record:
+            claim[key] = sentence_record[key]
+    return claim
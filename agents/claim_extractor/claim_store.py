@@ -6,6 +6,8 @@ from datetime import datetime
 class GlobalClaimStore:
     def __init__(self):
         self.claims: Dict[str, dict] = {}
+        # Sentences the request deadline cut off before they were processed
+        self.timed_out_sentences: List[dict] = []
 
     def add_claim(self, claim: dict):
         key = claim["canonical_claim"]
@@ -20,14 +22,19 @@ class GlobalClaimStore:
                     "reasoning": None,
                     "evidence_sources": [],
                     "verified_at": None
-                }
+                },
+                "retrieval": None
             }
 
-        self.claims[key]["occurrences"].append({
+        occurrence = {
             "sentence_id": claim["sentence_id"],
             "paragraph_index": claim["paragraph_index"],
             "original_sentence": claim["original_sentence"]
-        })
+        }
+        for field in ("start_time", "end_time", "timestamp", "timestamp_url"):
+            if field in claim:
+                occurrence[field] = claim[field]
+        self.claims[key]["occurrences"].append(occurrence)
 
     def update_verification(
         self,
@@ -46,10 +53,32 @@ class GlobalClaimStore:
                 "verified_at": datetime.now().isoformat()
             }
 
+    def record_retrieval(self, canonical_claim: str, stats: dict):
+        """Evidence-gathering stats, e.g. how many searches were avoided"""
+        if canonical_claim in self.claims:
+            self.claims[canonical_claim]["retrieval"] = stats
+
+    def mark_timed_out(self, canonical_claim: str, reason: str = "Request deadline reached before verification"):
+        if canonical_claim in self.claims:
+            self.claims[canonical_claim]["verification"].update({
+                "verdict": "TIMED_OUT",
+                "reasoning": reason,
+            })
+
     def unverified_claims(self):
         return [
             claim for claim in self.claims.values()
-            if claim["verification"]["verdict"] is None
+            if claim["verification"]["verdict"] in (None, "TIMED_OUT")
+        ]
+
+    def claims_between(self, start_time: float, end_time: float):
+        """Claims with an occurrence inside a video time window (seconds)"""
+        return [
+            claim for claim in self.claims.values()
+            if any(
+                occ.get("start_time") is not None and start_time <= occ["start_time"] < end_time
+                for occ in claim["occurrences"]
+            )
         ]
 
     def all(self):
@@ -1,9 +1,34 @@
-from langchain_groq import ChatGroq
+import os
+
 from dotenv import load_dotenv
 
+from agents.llm_pool import LLMPool
+
 load_dotenv()
 
-llm = ChatGroq(
+# Each model is served by a pool of API keys/providers with failover;
+# see agents/llm_pool.py for configuration
+llm = LLMPool(
     model="openai/gpt-oss-20b",
     temperature=0
 )
+
+# Verification cascade tiers: every claim goes to the fast model first,
+# only doubtful verdicts are escalated to the strong one
+fast_llm = LLMPool(
+    model=os.getenv("VERIFIER_FAST_MODEL", "llama-3.1-8b-instant"),
+    temperature=0
+)
+
+strong_llm = LLMPool(
+    model=os.getenv("VERIFIER_STRONG_MODEL", "llama-3.3-70b-versatile"),
+    temperature=0
+)
+
+
+def llm_for(deadline=None, model=None):
+    """The shared LLM (or `model`), with its request timeout capped by the deadline"""
+    model = model or llm
+    if deadline is None:
+        return model
+    return model.bind(timeout=deadline.call_timeout())
@@ -5,16 +5,49 @@ from .claim_store import GlobalClaimStore
 from dotenv import load_dotenv
 
 load_dotenv()
-def run_pipeline(text: str):
+def run_pipeline(text: str, deadline=None, document=None, progress=None):
+    """
+    Extracts claims from text. With a deadline, classification falls back
+    to a heuristic when time runs low, and sentences not reached before it
+    expires are recorded in `store.timed_out_sentences`.
+
+    `document` is the TranscriptDocument the text came from, if any; its
+    video timestamps are carried onto sentences and claim occurrences.
+
+    `progress(stage, store, **counts)` is called after segmentation and
+    after each sentence, so callers can report partial results.
+    """
     sentences = sentence_segmentation(text)
+    if document is not None:
+        sentences = document.annotate_sentences(sentences)
     store = GlobalClaimStore()
 
-    for sentence in sentences:
-        sentence = classify_sentence(sentence)
+    normalized_count = 0
+    if progress:
+        progress("classifying", store, sentences_total=len(sentences),
+                 sentences_classified=0, claims_normalized=0)
+
+    for i, sentence in enumerate(sentences):
+        if deadline is not None and deadline.expired():
+            store.timed_out_sentences = sentences[i:]
+            print(f"⏱️  Deadline reached, {len(sentences) - i} of {len(sentences)} sentences not processed")
+            break
 
-        normalized = normalize_claim(sentence)
+        try:
+            sentence = classify_sentence(sentence, deadline)
+            normalized = normalize_claim(sentence, deadline)
+        except TimeoutError:
+            # Deadline ran out waiting on an identical call from another request
+            store.timed_out_sentences = sentences[i:]
+            print(f"⏱️  Deadline reached, {len(sentences) - i} of {len(sentences)} sentences not processed")
+            break
         if normalized:
             store.add_claim(normalized)
+            normalized_count += 1
+
+        if progress:
+            progress("classifying", store, sentences_total=len(sentences),
+                     sentences_classified=i + 1, claims_normalized=normalized_count)
 
     return store
 
@@ -0,0 +1,155 @@
+# agents/claim_extractor/result_cache.py
+"""
+Whole-request cache of claim extraction results (agents.models.PipelineResultCache).
+
+The key is a hash of the normalized input (the submitted text, or the
+YouTube video id), PIPELINE_VERSION and the model configuration, so
+changing models or bumping the version never serves old output. The
+value is the serialized `store.all()` list.
+
+How long an entry stays fresh depends on the least settled verdict among
+its claims. The pipeline output itself carries no verdicts (verification
+is queued after the claims are saved), so they are read from the
+notes.Claim rows the claims were saved as each time the entry is looked
+up: an entry whose claims are still unverified goes stale after a day,
+one whose claims all got conclusive verdicts lasts a week. Results cut
+short by the deadline expire within minutes.
+"""
+import hashlib
+import json
+from datetime import timedelta
+
+from django.db.models import F
+from django.utils import timezone
+
+# Bump when segmentation, classification or normalization changes output
+PIPELINE_VERSION = "1"
+
+# Hours an entry stays fresh, by verdict; an entry gets the shortest TTL
+# of the verdicts in it. None is a claim not saved to notes (yet).
+VERDICT_TTL_HOURS = {
+    'TIMED_OUT': 0.25,
+    None: 24,
+    'PENDING': 24,
+    'UNVERIFIABLE': 24,
+    'MISLEADING': 72,
+    'PARTIALLY_VERIFIED': 72,
+    'FALSE': 168,
+    'TRUE': 168,
+    'VERIFIED': 168,
+}
+DEFAULT_TTL_HOURS = 24
+# Stored expiry of an entry that wasn't cut short: the longest any
+# verdicts can keep it; cached_result applies the actual TTL
+MAX_TTL_HOURS = max(VERDICT_TTL_HOURS.values())
+
+# notes.Claim status -> verdict (a 'verified' row may have been
+# PARTIALLY_VERIFIED, which the status doesn't record)
+STATUS_VERDICTS = {
+    'verified': 'VERIFIED',
+    'false': 'FALSE',
+    'misleading': 'MISLEADING',
+    'pending': 'PENDING',
+}
+
+
+def model_config() -> dict:
+    """Everything about the models that can change extraction output"""
+    from agents.claim_extractor.llm_config import fast_llm, llm, strong_llm
+    from agents.verifier.cascade import CASCADE_ENABLED
+
+    return {
+        'extractor': llm.model_name,
+        'fast': fast_llm.model_name,
+        'strong': strong_llm.model_name,
+        'cascade': CASCADE_ENABLED,
+    }
+
+
+def normalize_input(text: str) -> str:
+    """
+    Collapses whitespace within paragraphs but keeps the paragraph breaks
+    sentence segmentation splits on, since they decide the paragraph_index
+    and sentence_id of every occurrence
+    """
+    paragraphs = (' '.join(paragraph.split()) for paragraph in text.split('\n\n'))
+    return '\n\n'.join(paragraph for paragraph in paragraphs if paragraph)
+
+
+def result_key(source_type: str, source: str) -> str:
+    """`source` is the submitted text, or the video id for YouTube"""
+    raw = json.dumps(
+        [source_type, normalize_input(source), PIPELINE_VERSION, model_config()],
+        sort_keys=True,
+    )
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+
+def transcript_key(document) -> str:
+    """Key for a YouTube transcript: the video id and caption language"""
+    metadata = document.metadata
+    return result_key('youtube', f"{metadata.get('video_id')}:{metadata.get('language_code')}")
+
+
+def result_ttl(verdicts: list, timed_out_sentences: int = 0) -> timedelta:
+    if timed_out_sentences:
+        hours = VERDICT_TTL_HOURS['TIMED_OUT']
+    else:
+        hours = min(
+            (VERDICT_TTL_HOURS.get(verdict, DEFAULT_TTL_HOURS) for verdict in verdicts),
+            default=DEFAULT_TTL_HOURS,
+        )
+    return timedelta(hours=hours)
+
+
+def saved_verdicts(entry) -> list:
+    """
+    Current verdicts of the entry's claims, from the notes.Claim rows with
+    the same text and source type; None for claims not saved (yet)
+    """
+    from notes.models import Claim
+
+    texts = {claim['canonical_claim'] for claim in entry.claims}
+    rows = Claim.objects.filter(source_type=entry.source_type, content__in=texts).values_list('content', 'status')
+    verdicts = [STATUS_VERDICTS.get(status) for _, status in rows]
+    saved = {content for content, _ in rows}
+    return verdicts + [None] * len(texts - saved)
+
+
+def cached_result(key: str):
+    """The fresh cache entry for `key`, or None"""
+    from agents.models import PipelineResultCache
+
+    now = timezone.now()
+    entry = PipelineResultCache.objects.filter(key=key, expires_at__gt=now).first()
+    if entry is None:
+        return None
+
+    expires_at = entry.created_at + result_ttl(saved_verdicts(entry), entry.timed_out_sentences)
+    if expires_at <= now:
+        PipelineResultCache.objects.filter(key=key).update(expires_at=expires_at)
+        print(f"[Result cache] Stale {key[:12]} (claims verified as of {entry.created_at:%Y-%m-%d %H:%M})")
+        return None
+
+    PipelineResultCache.objects.filter(key=key).update(hits=F('hits') + 1)
+    print(f"[Result cache] Hit {key[:12]} ({len(entry.claims)} claims)")
+    return entry
+
+
+def store_result(key: str, source_type: str, claims: list[dict], timed_out_sentences: int = 0):
+    from agents.models import PipelineResultCache
+
+    now = timezone.now()
+    ttl = result_ttl([], timed_out_sentences) if timed_out_sentences else timedelta(hours=MAX_TTL_HOURS)
+    PipelineResultCache.objects.update_or_create(
+        key=key,
+        defaults={
+            'source_type': source_type,
+            'pipeline_version': PIPELINE_VERSION,
+            'claims': claims,
+            'timed_out_sentences': timed_out_sentences,
+            'created_at': now,
+            'expires_at': now + ttl,
+        }
+    )
+    print(f"[Result cache] Stored {key[:12]}: {len(claims)} claims, kept for up to {ttl}")
@@ -1,6 +1,9 @@
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import StrOutputParser
-from .llm_config import llm
+import re
+
+from .llm_config import llm, llm_for
+from agents.singleflight import flight_key, singleflight
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -24,7 +27,33 @@ Return ONLY the label.
 chain = prompt | llm | StrOutputParser()
 
 
-def classify_sentence(sentence_record: dict) -> dict:
-    label = chain.invoke({"sentence": sentence_record["text"]})
+# Used instead of the LLM when the request deadline is running low:
+# sentences with numbers, dates or attributions are treated as claims
+HEURISTIC_CLAIM_PATTERN = re.compile(
+    r"\d|\b(said|says|according to|reported|announced|percent|million|billion)\b",
+    re.IGNORECASE
+)
+
+
+def heuristic_label(text: str) -> str:
+    if text.strip().rstrip(":").upper() in ("BREAKING", "UPDATE", "EXCLUSIVE", "WATCH", "JUST IN"):
+        return "STRUCTURAL"
+    if HEURISTIC_CLAIM_PATTERN.search(text):
+        return "FACT_CLAIM"
+    return "CONTEXT"
+
+
+def classify_sentence(sentence_record: dict, deadline=None) -> dict:
+    if deadline is not None and deadline.low():
+        sentence_record["label"] = heuristic_label(sentence_record["text"])
+        sentence_record["label_source"] = "heuristic"
+        return sentence_record
+
+    text = sentence_record["text"]
+    label = singleflight.do(
+        flight_key("classify", llm.model_name, text),
+        lambda: (prompt | llm_for(deadline) | StrOutputParser()).invoke({"sentence": text}),
+        deadline=deadline
+    )
     sentence_record["label"] = label.strip()
     return sentence_record
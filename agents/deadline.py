@@ -0,0 +1,42 @@
+# agents/deadline.py
+"""
+Per-request time budget shared by every stage of the claim pipeline.
+
+A stage asks the deadline how much time is left before starting a unit of
+work (an LLM call, a search). When the budget runs low it does cheaper
+work; when it runs out it stops and the caller returns what's finished.
+"""
+import time
+
+# Seconds a single LLM call or search is assumed to take; below this much
+# remaining budget a stage switches to its cheaper mode
+LOW_BUDGET_SECONDS = 10.0
+
+
+class Deadline:
+    def __init__(self, seconds: float = None):
+        self.seconds = seconds
+        self.expires_at = time.monotonic() + seconds if seconds is not None else None
+
+    @classmethod
+    def unlimited(cls) -> "Deadline":
+        return cls(None)
+
+    def remaining(self) -> float:
+        if self.expires_at is None:
+            return float("inf")
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+    def low(self, reserve: float = LOW_BUDGET_SECONDS) -> bool:
+        """True when less than `reserve` seconds are left"""
+        return self.remaining() < reserve
+
+    def call_timeout(self, cap: float = 30.0) -> float:
+        """Timeout for one outbound call so it can't outlive the request"""
+        return max(1.0, min(cap, self.remaining()))
+
+    def __repr__(self):
+        return f"Deadline(remaining={self.remaining():.1f}s)"
@@ -0,0 +1,208 @@
+# agents/extraction_jobs.py
+"""
+Background claim extraction jobs.
+
+`extract_claims` creates an ExtractionJob and returns straight away; the
+`extraction_worker` management command leases jobs, runs the claim
+pipeline with a progress callback (so the job page can show stage
+counters and the claims found so far), saves the claims and queues them
+for verification. Text that was extracted before is served from the
+result cache: the job is finished as soon as it is created.
+"""
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .claim_extractor.result_cache import cached_result, result_key, store_result
+from .deadline import Deadline
+from .models import ExtractionJob, VerificationJob
+from .verification_queue import enqueue_claims
+
+LEASE_SECONDS = 600
+
+# Progress is written to the database at most this often
+PROGRESS_WRITE_INTERVAL = 1.0
+
+# notes.Claim status -> verdict shown on the results page
+STATUS_TO_VERDICT = {
+    'verified': 'VERIFIED',
+    'false': 'FALSE',
+    'misleading': 'MISLEADING',
+}
+
+
+def create_job(text: str, source_type: str = 'text', user=None, force_refresh: bool = False) -> ExtractionJob:
+    """Queues extraction of `text`, or finishes at once from the result cache"""
+    cached = None if force_refresh else cached_result(result_key(source_type, text))
+    job = ExtractionJob.objects.create(text=text, source_type=source_type, created_by=user)
+    if cached:
+        job.progress['cached'] = True
+        finish_job(job, cached.claims, cached.timed_out_sentences)
+        job.refresh_from_db()
+        return job
+
+    print(f"[Extraction] Queued job {job.id} ({len(text)} chars)")
+    return job
+
+
+def runnable_jobs(now):
+    return ExtractionJob.objects.filter(
+        Q(status='queued') |
+        Q(status='running', lease_expires_at__lt=now)
+    )
+
+
+def lease_job(owner: str, lease_seconds: int = LEASE_SECONDS):
+    """Claims the oldest runnable job for `owner` (compare-and-set)"""
+    now = timezone.now()
+    for job_id in runnable_jobs(now).order_by('created_at').values_list('id', flat=True)[:10]:
+        with transaction.atomic():
+            won = runnable_jobs(now).filter(id=job_id).update(
+                status='running',
+                lease_owner=owner,
+                lease_expires_at=now + timedelta(seconds=lease_seconds),
+                started_at=now,
+                attempts=F('attempts') + 1,
+            )
+        if won:
+            return ExtractionJob.objects.get(id=job_id)
+    return None
+
+
+def save_claims(claims: list[dict], source_type: str, user=None) -> dict:
+    """Saves extracted claims to notes; returns {canonical_claim: Claim id}"""
+    from notes.services.claim_persistence import save_pipeline_claims
+
+    saved = save_pipeline_claims(claims, source_type, user=user)
+    enqueue_claims(saved)
+    return {canonical: claim.id for claim, canonical, _ in saved}
+
+
+class ProgressWriter:
+    """Pipeline progress callback that saves counters and partial claims"""
+
+    def __init__(self, job: ExtractionJob):
+        self.job = job
+        self.last_write = 0.0
+
+    def __call__(self, stage, store, **counts):
+        self.job.progress.update(counts)
+        done = counts.get('sentences_classified') == counts.get('sentences_total')
+        if not done and time.monotonic() - self.last_write < PROGRESS_WRITE_INTERVAL:
+            return
+        self.last_write = time.monotonic()
+        ExtractionJob.objects.filter(id=self.job.id).update(
+            stage=stage,
+            progress=self.job.progress,
+            claims=store.all(),
+        )
+
+
+def run_job(job: ExtractionJob):
+    from agents.claim_extractor.pipeline import run_pipeline
+
+    try:
+        # Sentences not reached in time are counted as timed out, like a request's
+        deadline = Deadline(settings.EXTRACTION_JOB_DEADLINE_SECONDS)
+        store = run_pipeline(job.text, deadline, progress=ProgressWriter(job))
+
+        ExtractionJob.objects.filter(id=job.id).update(stage='saving')
+        claims = store.all()
+        timed_out = len(store.timed_out_sentences)
+        store_result(result_key(job.source_type, job.text), job.source_type, claims, timed_out)
+        finish_job(job, claims, timed_out)
+    except Exception as e:
+        fail_job(job, str(e))
+
+
+def finish_job(job: ExtractionJob, claims: list[dict], timed_out_sentences: int = 0):
+    """Saves the claims, queues their verification and marks the job done"""
+    saved_ids = save_claims(claims, job.source_type, job.created_by)
+
+    job.progress['timed_out_sentences'] = timed_out_sentences
+    ExtractionJob.objects.filter(id=job.id).update(
+        status='done',
+        stage='verifying',
+        progress=job.progress,
+        claims=claims,
+        saved_claim_ids=saved_ids,
+        lease_expires_at=None,
+        completed_at=timezone.now(),
+    )
+    print(f"[Extraction] Job {job.id}: {len(claims)} claims extracted")
+
+
+def fail_job(job: ExtractionJob, error: str):
+    retry = job.attempts < job.max_attempts
+    ExtractionJob.objects.filter(id=job.id).update(
+        status='queued' if retry else 'failed',
+        stage='queued' if retry else 'failed',
+        error=error,
+        lease_expires_at=None,
+        completed_at=None if retry else timezone.now(),
+    )
+    print(f"[Extraction] Job {job.id} failed{' (will retry)' if retry else ''}: {error}")
+
+
+def finished_claim_ids(claim_ids) -> dict:
+    """{claim id: verification job status} for claims whose verification ended"""
+    return dict(
+        VerificationJob.objects.filter(claim_id__in=claim_ids, status__in=['done', 'failed'])
+        .values_list('claim_id', 'status')
+    )
+
+
+def job_claims(job: ExtractionJob, finished: dict = None) -> list[dict]:
+    """
+    The job's claims with verdicts filled in from notes.Claim as the
+    verification worker gets through them.
+    """
+    from notes.models import Claim
+
+    if not job.saved_claim_ids:
+        return job.claims
+
+    claim_ids = list(job.saved_claim_ids.values())
+    finished = finished if finished is not None else finished_claim_ids(claim_ids)
+    saved = Claim.objects.in_bulk(claim_ids)
+    claims = []
+    for claim_data in job.claims:
+        claim = saved.get(job.saved_claim_ids.get(claim_data['canonical_claim']))
+        if claim is not None and finished.get(claim.id) == 'done':
+            claim_data = {**claim_data, 'verification': {
+                **claim_data['verification'],
+                # Verified claims left 'pending' had no conclusive evidence
+                'verdict': STATUS_TO_VERDICT.get(claim.status, 'UNVERIFIABLE'),
+                'reasoning': claim.verification_notes,
+            }}
+        claims.append(claim_data)
+    return claims
+
+
+def job_status(job: ExtractionJob) -> dict:
+    """Stage-level progress and (partial) results of a job, for polling"""
+    progress = dict(job.progress)
+    claim_ids = list(job.saved_claim_ids.values())
+    finished = finished_claim_ids(claim_ids) if claim_ids else {}
+    if claim_ids:
+        progress['claims_total'] = len(claim_ids)
+        progress['claims_verified'] = sum(1 for status in finished.values() if status == 'done')
+
+    stage = job.stage
+    if job.status == 'done':
+        stage = 'done' if len(finished) >= len(claim_ids) else 'verifying'
+
+    return {
+        'id': str(job.id),
+        'status': job.status,
+        'stage': stage,
+        'progress': progress,
+        'claims': job_claims(job, finished),
+        'error': job.error,
+        'created_at': job.created_at.isoformat(),
+        'completed_at': job.completed_at.isoformat() if job.completed_at else None,
+    }
@@ -8,3 +8,7 @@ class ClaimsExtractorForm(forms.Form):
         }),
         label="Text Content"
     )
+    force_refresh = forms.BooleanField(
+        required=False,
+        label="Re-run extraction even if this text was analyzed before"
+    )
@@ -0,0 +1,257 @@
+# agents/llm_pool.py
+"""
+Pool of LLM clients spread over several API keys and providers.
+
+One Groq key's rate limit used to cap the whole deployment. An LLMPool
+holds one client per configured key/endpoint and picks a member per call
+by weighted round-robin, weighting members by their observed headroom
+(recent rate limits and errors, calls in flight). A call that hits a
+429, a 5xx or a connection error is retried on the next member; members
+that keep failing are ejected for a cool-down period. A member whose key is
+rejected (401/403) is ejected for good and the call moves on.
+
+Members are configured with LLM_POOL_MEMBERS, a JSON list such as
+
+    [{"provider": "groq", "api_key": "gsk_..."},
+     {"provider": "openai", "api_key": "...", "base_url": "https://...",
+      "models": {"llama-3.3-70b-versatile": "meta-llama/Llama-3.3-70B"}}]
+
+or, for Groq only, a comma-separated GROQ_API_KEYS. Without either the
+pool has a single member using GROQ_API_KEY, as before.
+"""
+import hashlib
+import json
+import math
+import os
+import threading
+import time
+
+from dotenv import load_dotenv
+from langchain_core.runnables import Runnable
+
+load_dotenv()
+
+# Members are ejected for this long after a rate limit (unless the
+# provider says when to retry) or after repeated failures
+EJECT_SECONDS = 30
+MAX_CONSECUTIVE_FAILURES = 3
+
+# Headroom is a 0-1 weight: halved on a rate limit, recovered on success
+MIN_HEADROOM = 0.05
+HEADROOM_RECOVERY = 0.1
+
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+# A revoked or unauthorised key won't recover by waiting
+AUTH_STATUS_CODES = {401, 403}
+
+
+def pool_members_config() -> list[dict]:
+    raw = os.getenv("LLM_POOL_MEMBERS")
+    if raw:
+        return json.loads(raw)
+    keys = os.getenv("GROQ_API_KEYS") or os.getenv("GROQ_API_KEY") or ""
+    return [{"provider": "groq", "api_key": key.strip()} for key in keys.split(",") if key.strip()]
+
+
+def error_status(error: Exception):
+    return getattr(error, "status_code", None) or getattr(getattr(error, "response", None), "status_code", None)
+
+
+def is_auth_error(error: Exception) -> bool:
+    return error_status(error) in AUTH_STATUS_CODES
+
+
+def is_retryable(error: Exception) -> bool:
+    """Rate limits, server errors, network and auth failures are worth another member"""
+    if error_status(error) in RETRYABLE_STATUS_CODES or is_auth_error(error):
+        return True
+    name = type(error).__name__
+    return "Connection" in name or "Timeout" in name
+
+
+def retry_after(error: Exception):
+    headers = getattr(getattr(error, "response", None), "headers", None) or {}
+    try:
+        return float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+
+class MemberHealth:
+    """
+    Health of one key/endpoint. Shared by every pool using that key, since
+    rate limits apply per key rather than per model.
+    """
+
+    def __init__(self, label: str):
+        self.label = label
+        self.headroom = 1.0
+        self.in_flight = 0
+        self.consecutive_failures = 0
+        self.ejected_until = 0.0
+        self.counters = {"calls": 0, "rate_limited": 0, "auth_errors": 0, "errors": 0, "ejections": 0}
+
+    def available(self, now: float) -> bool:
+        return now >= self.ejected_until
+
+    def revoked(self) -> bool:
+        return math.isinf(self.ejected_until)
+
+    def weight(self) -> float:
+        return self.headroom / (1 + self.in_flight)
+
+    def eject(self, seconds: float):
+        self.ejected_until = time.monotonic() + seconds
+        self.counters["ejections"] += 1
+        if math.isinf(seconds):
+            print(f"[LLM pool] Ejecting {self.label}: key rejected")
+        else:
+            print(f"[LLM pool] Ejecting {self.label} for {seconds:.0f}s")
+
+
+_health_lock = threading.Lock()
+_health: dict[str, MemberHealth] = {}
+
+
+def member_health(provider: str, api_key: str, base_url: str = None) -> MemberHealth:
+    identity = f"{provider}|{base_url or ''}|{api_key}"
+    key = hashlib.sha256(identity.encode("utf-8")).hexdigest()
+    with _health_lock:
+        if key not in _health:
+            _health[key] = MemberHealth(f"{provider}:…{api_key[-4:]}")
+        return _health[key]
+
+
+def build_client(member: dict, model: str, **kwargs):
+    provider = member.get("provider", "groq")
+    model = member.get("models", {}).get(model, model)
+    if provider == "groq":
+        from langchain_groq import ChatGroq
+        return ChatGroq(api_key=member["api_key"], model=model, max_retries=0, **kwargs)
+    if provider == "openai":
+        # Any OpenAI-compatible endpoint; needs langchain-openai installed
+        from langchain_openai import ChatOpenAI
+        return ChatOpenAI(
+            api_key=member["api_key"], base_url=member.get("base_url"),
+            model=model, max_retries=0, **kwargs
+        )
+    raise ValueError(f"Unknown LLM provider: {provider}")
+
+
+class LLMPool(Runnable):
+    """
+    Drop-in replacement for a single chat model in `prompt | llm | parser`
+    chains. Extra invoke kwargs (e.g. from .bind(timeout=...)) are passed
+    through to the chosen member.
+    """
+
+    def __init__(self, model: str, members: list[dict] = None, **client_kwargs):
+        self.model_name = model
+        members = members if members is not None else pool_members_config()
+        if not members:
+            raise ValueError("No LLM API keys configured (GROQ_API_KEY, GROQ_API_KEYS or LLM_POOL_MEMBERS)")
+
+        self.members = [
+            (build_client(m, model, **client_kwargs),
+             member_health(m.get("provider", "groq"), m["api_key"], m.get("base_url")))
+            for m in members
+        ]
+        # Member health is shared between pools, so it's guarded by one lock
+        self._lock = _health_lock
+        # Smooth weighted round-robin state, one entry per member
+        self._current = [0.0] * len(self.members)
+
+    def _pick(self, exclude: set) -> int | None:
+        """Smooth weighted round-robin over healthy members not yet tried"""
+        now = time.monotonic()
+        with self._lock:
+            candidates = [
+                i for i, (_, health) in enumerate(self.members)
+                if i not in exclude and health.available(now)
+            ]
+            if not candidates:
+                # Everything is ejected: try the member that returns soonest
+                # (never one whose key was rejected)
+                rest = [
+                    i for i, (_, health) in enumerate(self.members)
+                    if i not in exclude and not health.revoked()
+                ]
+                if not rest:
+                    return None
+                chosen = min(rest, key=lambda i: self.members[i][1].ejected_until)
+                self.members[chosen][1].in_flight += 1
+                return chosen
+
+            total = 0.0
+            for i in candidates:
+                weight = self.members[i][1].weight()
+                self._current[i] += weight
+                total += weight
+            chosen = max(candidates, key=lambda i: self._current[i])
+            self._current[chosen] -= total
+            self.members[chosen][1].in_flight += 1
+            return chosen
+
+    def _record_success(self, health: MemberHealth):
+        with self._lock:
+            health.counters["calls"] += 1
+            health.consecutive_failures = 0
+            health.headroom = min(1.0, health.headroom + HEADROOM_RECOVERY)
+
+    def _record_failure(self, health: MemberHealth, error: Exception):
+        with self._lock:
+            health.counters["calls"] += 1
+            health.consecutive_failures += 1
+            if error_status(error) == 429:
+                health.counters["rate_limited"] += 1
+                health.headroom = max(MIN_HEADROOM, health.headroom / 2)
+                health.eject(retry_after(error) or EJECT_SECONDS)
+            elif is_auth_error(error):
+                health.counters["auth_errors"] += 1
+                health.eject(math.inf)
+            else:
+                health.counters["errors"] += 1
+                if health.consecutive_failures >= MAX_CONSECUTIVE_FAILURES:
+                    health.eject(EJECT_SECONDS)
+
+    def invoke(self, input, config=None, **kwargs):
+        tried = set()
+        last_error = None
+        while True:
+            i = self._pick(tried)
+            if i is None:
+                if last_error is None:
+                    raise RuntimeError("Every LLM pool member's API key was rejected")
+                raise last_error
+            tried.add(i)
+            client, health = self.members[i]
+
+            try:
+                result = client.invoke(input, config, **kwargs)
+            except Exception as e:
+                self._record_failure(health, e)
+                if not is_retryable(e):
+                    raise
+                last_error = e
+                print(f"[LLM pool] {health.label} failed ({error_status(e) or type(e).__name__}), failing over")
+                continue
+            finally:
+                with self._lock:
+                    health.in_flight -= 1
+
+            self._record_success(health)
+            return result
+
+    def status(self) -> list[dict]:
+        now = time.monotonic()
+        with self._lock:
+            return [
+                {
+                    "member": health.label,
+                    "available": health.available(now),
+                    "headroom": round(health.headroom, 2),
+                    "in_flight": health.in_flight,
+                    **health.counters,
+                }
+                for _, health in self.members
+            ]
@@ -0,0 +1,24 @@
+# agents/management/commands/enqueue_pending_claims.py
+from django.core.management.base import BaseCommand
+
+from agents.verification_queue import enqueue_claims
+from notes.models import Claim
+
+
+class Command(BaseCommand):
+    help = "Backfill: queue every pending claim that has no verification job yet"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--limit', type=int, default=None, help='Maximum number of claims to queue')
+
+    def handle(self, *args, **options):
+        claims = (
+            Claim.objects.filter(status='pending', is_archived=False, verification_jobs__isnull=True)
+            .order_by('created_at')
+        )
+        if options['limit']:
+            claims = claims[:options['limit']]
+
+        # Bulk lane: interactive submissions always run ahead of the backfill
+        count = enqueue_claims([(claim, claim.content, 1) for claim in claims], lane='bulk')
+        self.stdout.write(self.style.SUCCESS(f"Queued {count} pending claims"))
@@ -0,0 +1,55 @@
+# agents/management/commands/extraction_worker.py
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from agents.extraction_jobs import LEASE_SECONDS, lease_job, run_job
+from agents.management.worker_options import add_worker_arguments
+from agents.verification_queue import worker_id
+
+
+class Command(BaseCommand):
+    help = "Run queued claim extraction jobs with a pool of worker threads"
+
+    def add_arguments(self, parser):
+        add_worker_arguments(parser, settings.EXTRACTION_WORKER_THREADS, LEASE_SECONDS, poll_interval=1.0)
+
+    def handle(self, *args, **options):
+        threads = max(1, options['threads'])
+        self.stop = threading.Event()
+        self.stdout.write(f"[Extraction worker] Starting {threads} threads")
+
+        with ThreadPoolExecutor(max_workers=threads, thread_name_prefix='extract') as pool:
+            futures = [pool.submit(self.work_loop, options) for _ in range(threads)]
+            try:
+                for future in futures:
+                    future.result()
+            except KeyboardInterrupt:
+                self.stdout.write("[Extraction worker] Stopping after current jobs...")
+                self.stop.set()
+
+        self.stdout.write("[Extraction worker] Stopped")
+
+    def work_loop(self, options):
+        owner = worker_id()
+        processed = 0
+
+        while not self.stop.is_set():
+            close_old_connections()
+            job = lease_job(owner, options['lease_seconds'])
+
+            if job is None:
+                if options['once']:
+                    break
+                time.sleep(options['poll_interval'])
+                continue
+
+            run_job(job)
+            processed += 1
+
+        close_old_connections()
+        return processed
@@ -0,0 +1,48 @@
+# agents/management/commands/ingest_videos.py
+import json
+
+from django.core.management.base import BaseCommand
+
+from agents.batch_ingestion import ingest_videos
+
+
+class Command(BaseCommand):
+    help = "Fetch transcripts and extract claims for playlists, channels or lists of videos"
+
+    def add_arguments(self, parser):
+        parser.add_argument('inputs', nargs='*', help='Video URLs/ids, playlist URLs or channel URLs')
+        parser.add_argument('--file', help='Read inputs from a file, one per line')
+        parser.add_argument('--fetch-workers', type=int, default=None, help='Concurrent transcript fetches')
+        parser.add_argument('--extract-workers', type=int, default=None, help='Concurrent claim extractions')
+        parser.add_argument('--rate', type=float, default=None, help='Requests per second to YouTube')
+        parser.add_argument('--no-save', action='store_true', help="Don't save claims or queue verification")
+        parser.add_argument('--force-refresh', action='store_true', help='Refetch transcripts even if cached')
+
+    def handle(self, *args, **options):
+        inputs = list(options['inputs'])
+        if options['file']:
+            with open(options['file']) as f:
+                inputs.extend(line.strip() for line in f if line.strip())
+
+        for event in ingest_videos(
+            inputs,
+            fetch_workers=options['fetch_workers'],
+            extract_workers=options['extract_workers'],
+            requests_per_second=options['rate'],
+            save=not options['no_save'],
+            force_refresh=options['force_refresh'],
+        ):
+            kind = event['event']
+            if kind == 'resolved':
+                self.stdout.write(f"📺 {event['videos']} videos to ingest")
+            elif kind == 'fetched':
+                source = 'cache' if event['cached'] else 'YouTube'
+                self.stdout.write(f"   ⬇️  {event['video_id']}: transcript from {source} ({event['characters']} chars)")
+            elif kind == 'extracted':
+                self.stdout.write(f"   ✅ [{event['done']}/{event['total']}] {event['video_id']}: {event['claims']} claims")
+            elif kind == 'error':
+                self.stderr.write(f"   ✗ {event.get('video_id') or event.get('input')} ({event['stage']}): {event['error']}")
+            elif kind == 'done':
+                summary = event['summary']
+                summary.pop('per_video')
+                self.stdout.write(self.style.SUCCESS(json.dumps(summary, indent=2)))
@@ -0,0 +1,78 @@
+# agents/management/commands/reverify_claims.py
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from agents.verification_queue import apply_verdict
+from agents.verifier.batch_verifier import plan_batches, verify_claims_batch
+from agents.verifier.evidence_pool import EvidencePool
+from agents.verifier.evidence_selector import select_evidence
+from agents.verifier.search_tool import search
+from notes.models import Claim
+
+
+class Command(BaseCommand):
+    help = (
+        "Re-check stale verdicts (run periodically, e.g. from cron). Only the "
+        "fingerprint search is re-run; evidence is gathered and the verifier LLM "
+        "called only for claims whose evidence fingerprint changed since their "
+        "last verdict."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--stale-days', type=float, default=settings.REVERIFY_AFTER_DAYS,
+                            help='Re-check verdicts older than this many days')
+        parser.add_argument('--limit', type=int, default=None, help='Maximum number of claims to re-check')
+        parser.add_argument('--force', action='store_true',
+                            help='Re-verify even when the evidence is unchanged')
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(days=options['stale_days'])
+        claims = (
+            Claim.objects.filter(is_archived=False, verified_at__lt=cutoff)
+            .order_by('verified_at')
+        )
+        if options['limit']:
+            claims = claims[:options['limit']]
+        claims = list(claims)
+        self.stdout.write(f"🔁 {len(claims)} claims verified before {cutoff:%Y-%m-%d %H:%M}")
+
+        pool = EvidencePool(search)
+        unchanged, changed = [], {}
+        items = []
+        for claim in claims:
+            # '' means the search failed, or the claim has no fingerprint yet
+            # (the worker doesn't compute one): the evidence can't be compared
+            fingerprint = pool.fingerprint(claim.content)
+            if fingerprint and fingerprint == claim.evidence_fingerprint and not options['force']:
+                unchanged.append(claim.id)
+                continue
+            if claim.content not in changed:
+                evidence = pool.evidence_for(claim.content)
+                items.append((claim.content, select_evidence(claim.content, evidence)))
+            changed.setdefault(claim.content, []).append((claim, fingerprint))
+
+        # Same evidence as last time: the verdict stands, just confirm it
+        Claim.objects.filter(id__in=unchanged).update(verified_at=timezone.now())
+        self.stdout.write(f"   ✓ {len(unchanged)} unchanged, verified_at bumped")
+
+        reverified = 0
+        for batch in plan_batches(items):
+            for canonical, result in verify_claims_batch(batch).items():
+                if result.failed:
+                    self.stderr.write(f"   ✗ {canonical}: {result.reasoning}")
+                    continue
+                for claim, fingerprint in changed[canonical]:
+                    old_status = claim.status
+                    claim.save(update_fields=apply_verdict(claim, result, fingerprint))
+                    reverified += 1
+                    if claim.status != old_status:
+                        self.stdout.write(f"   ↻ {canonical}: {old_status} → {claim.status}")
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Re-checked {len(claims)} claims: {len(unchanged)} unchanged, "
+            f"{reverified} re-verified "
+            f"({pool.shared_searches + pool.claim_searches + pool.fingerprint_searches} searches)"
+        ))
@@ -0,0 +1,66 @@
+# agents/management/commands/verification_worker.py
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from agents.management.worker_options import add_worker_arguments
+from agents.verifier.cascade import CASCADE_ENABLED, cascade_stats
+from agents.verification_queue import LEASE_SECONDS, batch_deadline, lease_jobs, process_jobs, worker_id
+
+
+class Command(BaseCommand):
+    help = "Process queued claim verifications with a pool of worker threads"
+
+    def add_arguments(self, parser):
+        add_worker_arguments(parser, settings.VERIFICATION_WORKER_THREADS, LEASE_SECONDS, poll_interval=2.0)
+        parser.add_argument(
+            '--jobs-per-lease', type=int, default=settings.VERIFICATION_JOBS_PER_LEASE,
+            help='Jobs each thread leases at once (they share evidence and verifier calls)'
+        )
+
+    def handle(self, *args, **options):
+        threads = max(1, options['threads'])
+        self.stop = threading.Event()
+        self.stdout.write(f"[Worker] Starting {threads} verification threads")
+
+        with ThreadPoolExecutor(max_workers=threads, thread_name_prefix='verify') as pool:
+            futures = [pool.submit(self.work_loop, options) for _ in range(threads)]
+            try:
+                for future in futures:
+                    future.result()
+            except KeyboardInterrupt:
+                self.stdout.write("[Worker] Stopping after current jobs...")
+                self.stop.set()
+
+        if CASCADE_ENABLED:
+            self.stdout.write(f"[Worker] Verification cascade: {cascade_stats.summary()}")
+        self.stdout.write("[Worker] Stopped")
+
+    def work_loop(self, options):
+        owner = worker_id()
+        processed = 0
+
+        while not self.stop.is_set():
+            close_old_connections()
+            jobs = lease_jobs(owner, options['jobs_per_lease'], options['lease_seconds'])
+            deadline = batch_deadline(options['lease_seconds'])
+
+            if not jobs:
+                if options['once']:
+                    break
+                time.sleep(options['poll_interval'])
+                continue
+
+            try:
+                process_jobs(jobs, deadline)
+            except Exception as e:
+                # Leases expire, so the jobs are picked up again later
+                self.stderr.write(f"[Worker] {owner} batch failed: {str(e)}")
+            processed += len(jobs)
+
+        close_old_connections()
+        return processed
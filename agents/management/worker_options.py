@@ -0,0 +1,21 @@
+# agents/management/worker_options.py
+"""Command-line options shared by the queue worker commands"""
+
+
+def add_worker_arguments(parser, threads: int, lease_seconds: int, poll_interval: float):
+    parser.add_argument(
+        '--threads', type=int, default=threads,
+        help='Number of worker threads'
+    )
+    parser.add_argument(
+        '--lease-seconds', type=int, default=lease_seconds,
+        help='How long a leased job is reserved before others may retry it'
+    )
+    parser.add_argument(
+        '--poll-interval', type=float, default=poll_interval,
+        help='Seconds to wait when the queue is empty'
+    )
+    parser.add_argument(
+        '--once', action='store_true',
+        help='Exit once the queue is drained instead of polling forever'
+    )
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-19 00:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('agents', '0001_initial'),
+        ('notes', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='verificationjob',
+            name='lane',
+            field=models.CharField(choices=[('interactive', 'Interactive'), ('bulk', 'Bulk')], default='interactive', max_length=20),
+        ),
+        migrations.AddField(
+            model_name='verificationjob',
+            name='occurrences',
+            field=models.PositiveIntegerField(default=1),
+        ),
+        migrations.AddField(
+            model_name='verificationjob',
+            name='priority',
+            field=models.FloatField(default=0.0),
+        ),
+        migrations.AddIndex(
+            model_name='verificationjob',
+            index=models.Index(fields=['status', 'lane', '-priority'], name='agents_veri_status_459e73_idx'),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-19 00:24
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('agents', '0003_inflight_call'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TranscriptCache',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('video_id', models.CharField(max_length=20)),
+                ('language_code', models.CharField(max_length=20)),
+                ('language', models.CharField(blank=True, max_length=100)),
+                ('is_generated', models.BooleanField(default=False)),
+                ('segments', models.BinaryField()),
+                ('segment_count', models.PositiveIntegerField(default=0)),
+                ('content_hash', models.CharField(max_length=64)),
+                ('fetched_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('expires_at', models.DateTimeField()),
+                ('hits', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('video_id', 'language_code'), name='unique_transcript_language')],
+            },
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.18 on 2026-10-19 00:36
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('agents', '0005_extraction_job'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PipelineResultCache',
+            fields=[
+                ('key', models.CharField(max_length=64, primary_key=True, serialize=False)),
+                ('source_type', models.CharField(default='text', max_length=50)),
+                ('pipeline_version', models.CharField(max_length=20)),
+                ('claims', models.JSONField(default=list)),
+                ('timed_out_sentences', models.PositiveIntegerField(default=0)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('expires_at', models.DateTimeField()),
+                ('hits', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['expires_at'], name='agents_pipe_expires_7e3750_idx')],
+            },
+        ),
+    ]
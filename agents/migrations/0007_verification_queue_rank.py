@@ -0,0 +1,39 @@
+# Generated by Django 5.2.18 on 2026-10-19 01:05
+
+from django.db import migrations, models
+
+# verifier.priority.AGE_WEIGHT_PER_MINUTE when this migration was written
+AGE_WEIGHT_PER_MINUTE = 0.05
+
+
+def backfill_queue_rank(apps, schema_editor):
+    VerificationJob = apps.get_model('agents', 'VerificationJob')
+    jobs = list(VerificationJob.objects.only('id', 'priority', 'created_at'))
+    for job in jobs:
+        job.queue_rank = job.priority - AGE_WEIGHT_PER_MINUTE * job.created_at.timestamp() / 60
+    VerificationJob.objects.bulk_update(jobs, ['queue_rank'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('agents', '0006_pipeline_result_cache'),
+        ('notes', '0003_claim_content_hash'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='verificationjob',
+            name='agents_veri_status_459e73_idx',
+        ),
+        migrations.AddField(
+            model_name='verificationjob',
+            name='queue_rank',
+            field=models.FloatField(default=0.0),
+        ),
+        migrations.RunPython(backfill_queue_rank, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='verificationjob',
+            index=models.Index(fields=['status', 'lane', '-queue_rank'], name='agents_veri_status_279a67_idx'),
+        ),
+    ]
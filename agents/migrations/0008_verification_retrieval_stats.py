@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 01:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('agents', '0007_verification_queue_rank'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='verificationjob',
+            name='retrieval_stats',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
@@ -1,3 +1,194 @@
+import uuid
+
+from django.contrib.auth.models import User
 from django.db import models
+from django.utils import timezone
+
+
+class VerificationJob(models.Model):
+    """A claim waiting to be verified by the background worker"""
+
+    STATUS_CHOICES = [
+        ('queued', 'Queued'),
+        ('running', 'Running'),
+        ('done', 'Done'),
+        ('failed', 'Failed'),
+    ]
+
+    # Interactive jobs (someone is waiting on the page) always run before
+    # bulk backfills, and preempt bulk work between verifier batches
+    LANE_CHOICES = [
+        ('interactive', 'Interactive'),
+        ('bulk', 'Bulk'),
+    ]
+
+    claim = models.ForeignKey('notes.Claim', on_delete=models.CASCADE, related_name='verification_jobs')
+    canonical_claim = models.TextField()
+
+    lane = models.CharField(max_length=20, choices=LANE_CHOICES, default='interactive')
+    occurrences = models.PositiveIntegerField(default=1)
+    # Base priority from occurrences and check-worthiness; age is added at lease time
+    priority = models.FloatField(default=0.0)
+    # priority with ageing folded in (verifier.priority.queue_rank), so
+    # jobs are leased in effective-priority order straight from the index
+    queue_rank = models.FloatField(default=0.0)
+
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='queued')
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=3)
+    last_error = models.TextField(blank=True)
+    # EvidencePool.retrieval_stats of the run that verified the claim:
+    # planned, run and avoided searches and the evidence's sufficiency
+    retrieval_stats = models.JSONField(default=dict, blank=True)
+
+    # A worker owns a running job until its lease expires; after that
+    # another worker may pick it up again (e.g. the first one crashed)
+    lease_owner = models.CharField(max_length=100, blank=True)
+    lease_expires_at = models.DateTimeField(null=True, blank=True)
+
+    # Not picked up before this time (used for retry backoff)
+    available_at = models.DateTimeField(default=timezone.now)
+
+    created_at = models.DateTimeField(default=timezone.now)
+    updated_at = models.DateTimeField(auto_now=True)
+    completed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['created_at']
+        indexes = [
+            models.Index(fields=['status', 'available_at']),
+            models.Index(fields=['status', 'lane', '-queue_rank']),
+        ]
+
+    def __str__(self):
+        return f"Verification Job {self.id} - {self.status}"
+
+
+class InFlightCall(models.Model):
+    """
+    Cross-process lock for an LLM or search call in flight (see
+    agents/singleflight.py). Other processes making the same call wait
+    for the row to be marked done and reuse its result.
+    """
+
+    STATUS_CHOICES = [
+        ('running', 'Running'),
+        ('done', 'Done'),
+        ('failed', 'Failed'),
+    ]
+
+    key = models.CharField(max_length=64, primary_key=True)
+    owner = models.CharField(max_length=100)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='running')
+    result = models.TextField(blank=True)
+    created_at = models.DateTimeField(default=timezone.now)
+    expires_at = models.DateTimeField(db_index=True)
+
+    def __str__(self):
+        return f"In-flight call {self.key[:12]} - {self.status}"
+
+
+class TranscriptCache(models.Model):
+    """
+    A fetched YouTube transcript, one row per video and language. The raw
+    segments (text/start/duration) are stored zlib-compressed JSON.
+    """
+
+    video_id = models.CharField(max_length=20)
+    language_code = models.CharField(max_length=20)
+    language = models.CharField(max_length=100, blank=True)
+    is_generated = models.BooleanField(default=False)
+
+    segments = models.BinaryField()
+    segment_count = models.PositiveIntegerField(default=0)
+    # Hash of the segments, so a refresh that returns the same captions
+    # only extends the expiry instead of rewriting the blob
+    content_hash = models.CharField(max_length=64)
+
+    fetched_at = models.DateTimeField(default=timezone.now)
+    expires_at = models.DateTimeField()
+    hits = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['video_id', 'language_code'], name='unique_transcript_language'),
+        ]
+
+    def __str__(self):
+        return f"Transcript {self.video_id} ({self.language_code})"
+
+
+class ExtractionJob(models.Model):
+    """
+    A claim extraction request run by the extraction worker. Views create
+    the job and return at once; the page polls it for progress.
+    """
+
+    STATUS_CHOICES = [
+        ('queued', 'Queued'),
+        ('running', 'Running'),
+        ('done', 'Done'),
+        ('failed', 'Failed'),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    text = models.TextField()
+    source_type = models.CharField(max_length=50, default='text')
+    created_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True)
+
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='queued')
+    stage = models.CharField(max_length=30, default='queued')
+    # Stage counters: sentences_total, sentences_classified, claims_normalized
+    progress = models.JSONField(default=dict)
+    # Claims found so far (GlobalClaimStore.all()), then the final list
+    claims = models.JSONField(default=list)
+    # canonical claim -> notes.Claim id, once saved
+    saved_claim_ids = models.JSONField(default=dict)
+    error = models.TextField(blank=True)
+
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=2)
+    lease_owner = models.CharField(max_length=100, blank=True)
+    lease_expires_at = models.DateTimeField(null=True, blank=True)
+
+    created_at = models.DateTimeField(default=timezone.now)
+    started_at = models.DateTimeField(null=True, blank=True)
+    completed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['created_at']
+        indexes = [
+            models.Index(fields=['status', 'created_at']),
+        ]
+
+    def __str__(self):
+        return f"Extraction Job {self.id} - {self.status}"
+
+
+class PipelineResultCache(models.Model):
+    """
+    Claims extracted for an exact input (see
+    agents/claim_extractor/result_cache.py), so repeated submissions are
+    served without re-running the pipeline.
+    """
+
+    # sha256 of normalized input + pipeline version + model configuration
+    key = models.CharField(max_length=64, primary_key=True)
+    source_type = models.CharField(max_length=50, default='text')
+    pipeline_version = models.CharField(max_length=20)
+
+    # GlobalClaimStore.all() output
+    claims = models.JSONField(default=list)
+    timed_out_sentences = models.PositiveIntegerField(default=0)
+
+    created_at = models.DateTimeField(default=timezone.now)
+    expires_at = models.DateTimeField()
+    hits = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['expires_at']),
+        ]
 
-# Create your models here.
+    def __str__(self):
+        return f"Pipeline result {self.key[:12]} ({self.source_type})"
@@ -0,0 +1,161 @@
+# agents/singleflight.py
+"""
+Coalesces identical in-flight LLM and search calls.
+
+When several requests make the same call at the same time (e.g. editors
+submitting the same breaking story), only the first one runs it; the
+others wait for its result instead of firing their own. Nothing is kept
+once the call finishes, so this is not a cache.
+
+With SINGLEFLIGHT_CROSS_PROCESS enabled, calls are also coalesced across
+worker processes through the agents.InFlightCall lock table.
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+from datetime import timedelta
+
+SINGLEFLIGHT_CROSS_PROCESS = os.getenv("SINGLEFLIGHT_CROSS_PROCESS", "false").lower() in ("1", "true", "yes")
+
+# A cross-process leader that hasn't finished by then is assumed dead
+LOCK_LEASE_SECONDS = 60
+
+# How long a finished call's result stays readable for processes polling it
+RESULT_RETENTION_SECONDS = 30
+
+POLL_INTERVAL = 0.2
+
+
+def flight_key(*parts) -> str:
+    """Stable key for a call from its namespace, model and inputs"""
+    raw = json.dumps(parts, sort_keys=True, default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    def __init__(self, cross_process: bool = SINGLEFLIGHT_CROSS_PROCESS):
+        self.cross_process = cross_process
+        self._lock = threading.Lock()
+        self._calls: dict[str, _Call] = {}
+        self.counters = {"executed": 0, "coalesced": 0, "coalesced_cross_process": 0, "follower_timeouts": 0}
+
+    def do(self, key: str, fn, serialize=None, deserialize=None, deadline=None):
+        """
+        Runs fn() unless an identical call is already in flight, in which
+        case that call's result (or exception) is returned instead.
+        serialize/deserialize convert results to and from JSON-compatible
+        values for the cross-process lock table.
+
+        A caller with a Deadline waits for another caller's call only as
+        long as its own budget lasts, then raises TimeoutError: a leader
+        stuck in a slow search or LLM call can't hold it past its deadline.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                call.waiters += 1
+                self.counters["coalesced"] += 1
+                leader = False
+            else:
+                call = self._calls[key] = _Call()
+                leader = True
+
+        if not leader:
+            timeout = None if deadline is None or deadline.expires_at is None else deadline.remaining()
+            if not call.done.wait(timeout):
+                self._count("follower_timeouts")
+                raise TimeoutError("Deadline reached waiting for an identical in-flight call")
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            if self.cross_process:
+                call.result = self._do_cross_process(key, fn, serialize, deserialize, deadline)
+            else:
+                call.result = fn()
+                self._count("executed")
+            return call.result
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def _count(self, name: str):
+        with self._lock:
+            self.counters[name] += 1
+
+    def _do_cross_process(self, key, fn, serialize, deserialize, deadline=None):
+        from django.db import IntegrityError, transaction
+        from django.utils import timezone
+
+        from agents.models import InFlightCall
+        from agents.verification_queue import worker_id
+
+        serialize = serialize or (lambda value: value)
+        deserialize = deserialize or (lambda value: value)
+        owner = worker_id()
+
+        while True:
+            now = timezone.now()
+            InFlightCall.objects.filter(expires_at__lt=now).delete()
+            try:
+                with transaction.atomic():
+                    InFlightCall.objects.create(
+                        key=key,
+                        owner=owner,
+                        expires_at=now + timedelta(seconds=LOCK_LEASE_SECONDS),
+                    )
+                break
+            except IntegrityError:
+                pass
+
+            # Another process leads this call: wait for its result
+            row = InFlightCall.objects.filter(key=key).values("status", "result").first()
+            if row is None:
+                continue
+            if row["status"] == "done":
+                self._count("coalesced_cross_process")
+                return deserialize(json.loads(row["result"]))
+            if row["status"] == "failed":
+                # Errors aren't shared across processes; take over the call
+                InFlightCall.objects.filter(key=key, status="failed").delete()
+                continue
+            if deadline is not None and deadline.expired():
+                self._count("follower_timeouts")
+                raise TimeoutError("Deadline reached waiting for an identical call in another process")
+            time.sleep(POLL_INTERVAL)
+
+        try:
+            result = fn()
+        except Exception:
+            InFlightCall.objects.filter(key=key, owner=owner).update(status="failed")
+            raise
+        self._count("executed")
+
+        InFlightCall.objects.filter(key=key, owner=owner).update(
+            status="done",
+            result=json.dumps(serialize(result)),
+            expires_at=timezone.now() + timedelta(seconds=RESULT_RETENTION_SECONDS),
+        )
+        return result
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"in_flight": len(self._calls), **self.counters}
+
+
+singleflight = SingleFlight()
@@ -1,3 +1,839 @@
-from django.test import TestCase
+import contextlib
+import io
+import threading
+import time
+from datetime import timedelta
+from unittest import mock
 
-# Create your tests here.
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from notes.models import Claim
+from notes.services.claim_persistence import save_pipeline_claims
+
+from .batch_ingestion import YOUTUBE_HOST, fetch_video, ingest_videos
+from .claim_extractor.claim_store import GlobalClaimStore
+from .claim_extractor.pipeline import run_pipeline
+from .claim_extractor.result_cache import cached_result, normalize_input, result_key, store_result
+from .extraction_jobs import create_job, run_job
+from .deadline import Deadline
+from .llm_pool import EJECT_SECONDS, LLMPool
+from .models import InFlightCall, PipelineResultCache, VerificationJob
+from .singleflight import SingleFlight
+from .verification_queue import BATCH_DEADLINE_FRACTION, CANDIDATE_WINDOW, batch_deadline, enqueue_claims, lease_jobs, process_jobs
+from .verifier.batch_verifier import (
+    BATCH_VERIFIER_PROMPT, OUTPUT_TOKENS_PER_CLAIM, batch_parser, format_claim_block, parse_batch_output,
+    plan_batches, verify_claims_batch, verify_individually,
+)
+from .verifier.cascade import CascadeStats, escalate_if_needed
+from .verifier.claim_verifier_schema import VerificationFailure, VerificationResult
+from .verifier.evidence_pool import EvidencePool
+from .verifier.evidence_selector import (
+    bm25_scores, canonical_url, claim_term_weights, deduplicate, estimate_tokens, select_evidence,
+)
+from .verifier.fingerprint import evidence_fingerprint
+from .verifier.priority import claim_priority, prioritize_claims, queue_rank
+from .verifier.verify_all_claims import verify_unverified_claims
+
+
+def pipeline_claims(*texts):
+    return [{'canonical_claim': text, 'occurrences': [], 'verification': {'verdict': None}} for text in texts]
+
+
+class ResultCacheTests(TestCase):
+    def store(self, claims, timed_out=0, age_hours=0):
+        key = result_key('text', ' '.join(claim['canonical_claim'] for claim in claims))
+        store_result(key, 'text', claims, timed_out)
+        PipelineResultCache.objects.filter(key=key).update(
+            created_at=timezone.now() - timedelta(hours=age_hours)
+        )
+        return key
+
+    def test_normalization_keeps_paragraph_breaks(self):
+        self.assertEqual(normalize_input('One  two\nthree.\n\n\n  Four. '), 'One two three.\n\nFour.')
+        self.assertNotEqual(
+            result_key('text', 'First sentence. Second sentence.'),
+            result_key('text', 'First sentence.\n\nSecond sentence.'),
+        )
+        self.assertEqual(
+            result_key('text', 'First  sentence.\n\nSecond sentence.'),
+            result_key('text', 'First sentence.\n\n Second\tsentence.'),
+        )
+
+    def test_hit_counts(self):
+        key = self.store(pipeline_claims('The sky is green.'))
+
+        self.assertIsNotNone(cached_result(key))
+        self.assertEqual(PipelineResultCache.objects.get(key=key).hits, 1)
+
+    def test_unverified_claims_go_stale_after_a_day(self):
+        claims = pipeline_claims('The sky is green.')
+        save_pipeline_claims(claims, 'text')
+
+        self.assertIsNotNone(cached_result(self.store(claims, age_hours=23)))
+        self.assertIsNone(cached_result(self.store(claims, age_hours=25)))
+
+    def test_conclusive_verdicts_keep_the_entry_for_a_week(self):
+        claims = pipeline_claims('The sky is green.', 'Water boils at 50C.')
+        save_pipeline_claims(claims, 'text')
+        Claim.objects.update(status='false')
+
+        self.assertIsNotNone(cached_result(self.store(claims, age_hours=100)))
+        self.assertIsNone(cached_result(self.store(claims, age_hours=170)))
+
+    def test_least_settled_verdict_decides(self):
+        claims = pipeline_claims('The sky is green.', 'Water boils at 50C.')
+        save_pipeline_claims(claims, 'text')
+        Claim.objects.filter(content='The sky is green.').update(status='false')
+        Claim.objects.filter(content='Water boils at 50C.').update(status='misleading')
+
+        self.assertIsNotNone(cached_result(self.store(claims, age_hours=48)))
+        self.assertIsNone(cached_result(self.store(claims, age_hours=80)))
+
+    def test_timed_out_results_expire_within_minutes(self):
+        claims = pipeline_claims('The sky is green.')
+        save_pipeline_claims(claims, 'text')
+        Claim.objects.update(status='false')
+
+        self.assertIsNone(cached_result(self.store(claims, timed_out=3, age_hours=1)))
+
+
+class CreateJobCacheTests(TestCase):
+    text = 'The sky is green. Water boils at 50C.'
+
+    def setUp(self):
+        store_result(result_key('text', self.text), 'text', pipeline_claims('The sky is green.'))
+
+    def test_cached_text_finishes_at_once(self):
+        job = create_job(self.text)
+
+        self.assertEqual(job.status, 'done')
+        self.assertTrue(job.progress['cached'])
+        self.assertEqual(list(job.saved_claim_ids), ['The sky is green.'])
+
+    def test_force_refresh_queues_the_pipeline(self):
+        job = create_job(self.text, force_refresh=True)
+
+        self.assertEqual(job.status, 'queued')
+        self.assertFalse(Claim.objects.exists())
+
+    @override_settings(EXTRACTION_JOB_DEADLINE_SECONDS=0)
+    def test_jobs_stop_at_their_deadline(self):
+        job = create_job(self.text, force_refresh=True)
+        run_job(job)
+        job.refresh_from_db()
+
+        self.assertEqual(job.status, 'done')
+        self.assertEqual(job.progress['timed_out_sentences'], 2)
+
+
+class LeaseJobsTests(TestCase):
+    def job(self, text, lane='interactive', priority=1.0, age_hours=0):
+        created_at = timezone.now() - timedelta(hours=age_hours)
+        [claim_id] = [claim.id for claim, _, _ in save_pipeline_claims([text], 'text')]
+        return VerificationJob.objects.create(
+            claim_id=claim_id, canonical_claim=text, lane=lane, priority=priority,
+            queue_rank=queue_rank(priority, created_at), created_at=created_at,
+        )
+
+    def test_enqueue_sets_queue_rank(self):
+        saved = save_pipeline_claims(['india|grow|7.2%|2023|india|null'], 'text')
+        enqueue_claims(saved)
+
+        job = VerificationJob.objects.get()
+        self.assertAlmostEqual(job.queue_rank, queue_rank(job.priority, job.created_at), places=6)
+
+    def test_higher_priority_first(self):
+        self.job('low', priority=1.0)
+        high = self.job('high', priority=3.0)
+
+        self.assertEqual([job.id for job in lease_jobs('w')], [high.id])
+
+    def test_interactive_before_bulk(self):
+        self.job('bulk', lane='bulk', priority=9.0)
+        interactive = self.job('interactive', priority=0.5)
+
+        self.assertEqual([job.id for job in lease_jobs('w')], [interactive.id])
+
+    def test_ageing_lets_an_old_job_overtake_a_full_window_of_fresh_work(self):
+        for n in range(CANDIDATE_WINDOW * 10 + 1):
+            self.job(f'fresh {n}', priority=3.0)
+        # 3.0 - 0.5 = 2.5 behind, made up after 50 minutes at 0.05/minute
+        starved = self.job('starved', priority=0.5, age_hours=2)
+
+        self.assertEqual([job.id for job in lease_jobs('w')], [starved.id])
+
+    def test_a_lease_never_mixes_lanes(self):
+        self.job('interactive')
+        self.job('bulk', lane='bulk')
+
+        self.assertEqual([job.lane for job in lease_jobs('w', limit=5)], ['interactive'])
+
+    def test_leased_jobs_are_not_leased_twice(self):
+        self.job('one')
+        self.job('two')
+
+        first, second = lease_jobs('a'), lease_jobs('b')
+
+        self.assertNotEqual(first[0].id, second[0].id)
+        self.assertEqual(lease_jobs('c'), [])
+
+    def test_bulk_work_is_released_when_interactive_jobs_wait(self):
+        self.job('bulk 1', lane='bulk')
+        self.job('bulk 2', lane='bulk')
+        bulk = lease_jobs('w', limit=2)
+        self.job('interactive')
+
+        with mock.patch('agents.verifier.agent.gather_evidence') as gather_evidence:
+            process_jobs(bulk)
+
+        gather_evidence.assert_not_called()
+        for job in VerificationJob.objects.filter(lane='bulk'):
+            self.assertEqual((job.status, job.attempts, job.lease_owner), ('queued', 0, ''))
+
+
+class BatchDeadlineTests(TestCase):
+    claims = ['india|grow|7.2%|2023|india|null', 'china|grow|5%|2023|china|null']
+
+    def leased_jobs(self):
+        enqueue_claims(save_pipeline_claims(self.claims, 'text'))
+        return lease_jobs('w', limit=2)
+
+    def assert_released(self):
+        for job in VerificationJob.objects.all():
+            self.assertEqual((job.status, job.attempts, job.lease_owner), ('queued', 0, ''))
+
+    def test_the_deadline_leaves_room_in_the_lease(self):
+        self.assertLess(batch_deadline(300).remaining(), 300)
+        self.assertLess(BATCH_DEADLINE_FRACTION, 1)
+
+    def test_jobs_not_reached_go_back_to_the_queue(self):
+        jobs = self.leased_jobs()
+        with mock.patch('agents.verifier.agent.gather_evidence') as gather_evidence:
+            process_jobs(jobs, Deadline(0))
+
+        gather_evidence.assert_not_called()
+        self.assert_released()
+
+    def test_verifier_calls_cut_short_by_the_deadline_go_back_to_the_queue(self):
+        jobs = self.leased_jobs()
+        deadline = Deadline(60)
+
+        def verify(batch, deadline_):
+            deadline.expires_at = 0
+            return {self.claims[0]: VerificationFailure(verdict='UNVERIFIABLE', confidence=0,
+                                                        reasoning='timed out', evidence_sources=[])}
+
+        with mock.patch('agents.verifier.agent.gather_evidence', return_value=''), \
+                mock.patch('agents.verifier.batch_verifier.verify_claims_batch', side_effect=verify):
+            process_jobs(jobs, deadline)
+
+        self.assert_released()
+        self.assertFalse(Claim.objects.exclude(status='pending').exists())
+
+
+class CannedSearch:
+    """Search tool stub returning the same on-topic results for any query"""
+
+    def __init__(self):
+        self.queries = []
+        self.pool = mock.Mock(**{'utilization.return_value': {}})
+
+    def run_results(self, query, deadline=None):
+        self.queries.append(query)
+        return [{'href': f'https://site{n}.example/india', 'title': 'India economy grew 7.2% in 2023',
+                 'body': 'India GDP grew 7.2% in 2023, official data for india show'} for n in range(3)]
+
+    def stable_results(self, query, deadline=None):
+        raise AssertionError('fingerprint search run while verifying')
+
+
+class RetrievalStatsTests(TestCase):
+    def test_searches_avoided_are_recorded_per_job(self):
+        canonical = 'india|grow|7.2%|2023|india|null'
+        enqueue_claims(save_pipeline_claims([canonical], 'text'))
+        jobs = lease_jobs('w')
+        verdict = VerificationResult(verdict='VERIFIED', confidence=0.9, reasoning='ok', evidence_sources=[])
+        search = CannedSearch()
+
+        with mock.patch('agents.verifier.search_tool.search', search), \
+                mock.patch('agents.verifier.batch_verifier.verify_claims_batch', return_value={canonical: verdict}):
+            process_jobs(jobs)
+
+        stats = VerificationJob.objects.get().retrieval_stats
+        # Two planned claim-level searches; the first made the evidence sufficient
+        self.assertEqual(search.queries, ['india 7.2%'])
+        self.assertEqual((stats['planned_searches'], stats['searches_run'], stats['searches_avoided']), (2, 1, 1))
+
+
+class VerifyOrderTests(TestCase):
+    def test_claims_are_gathered_in_priority_order_across_groups(self):
+        store = GlobalClaimStore()
+        claims = [
+            ('india|say|null|null|india|null', 1),
+            ('india|grow|7.2%|2023|india|null', 3),
+            ('china|grow|5%|2023|china|null', 2),
+        ]
+        for canonical, occurrences in claims:
+            for n in range(occurrences):
+                store.add_claim({'canonical_claim': canonical, 'sentence_id': n,
+                                 'paragraph_index': 0, 'original_sentence': canonical})
+        expected = [c['canonical_claim'] for c in prioritize_claims(store.unverified_claims())]
+        self.assertGreater(claim_priority(expected[1]), claim_priority(expected[2]))
+
+        gathered = []
+        with mock.patch('agents.verifier.verify_all_claims.gather_evidence',
+                        side_effect=lambda canonical, **kwargs: gathered.append(canonical) or []), \
+                mock.patch('agents.verifier.verify_all_claims.plan_batches', return_value=[]):
+            verify_unverified_claims(store)
+
+        self.assertEqual(gathered, expected)
+        self.assertEqual(gathered[1], 'china|grow|5%|2023|china|null')
+
+
+class VerificationFailureTests(TestCase):
+    def leased_job(self):
+        saved = save_pipeline_claims(['india|grow|7.2%|2023|india|null'], 'text')
+        enqueue_claims(saved)
+        return lease_jobs('w')
+
+    def test_a_raising_verifier_call_is_a_failure_not_a_verdict(self):
+        with mock.patch('agents.verifier.batch_verifier.CASCADE_ENABLED', False), \
+                mock.patch('agents.verifier.batch_verifier.verify_with_evidence', side_effect=RuntimeError('rate limited')):
+            result = verify_individually('india|grow|7.2%|2023|india|null', '')
+
+        self.assertTrue(result.failed)
+        self.assertFalse(VerificationResult(verdict='UNVERIFIABLE', confidence=0, reasoning='Verification failed: no',
+                                            evidence_sources=[]).failed)
+
+    def run_jobs(self, result):
+        jobs = self.leased_job()
+        with mock.patch('agents.verifier.agent.gather_evidence', return_value=''), \
+                mock.patch('agents.verifier.batch_verifier.verify_claims_batch',
+                           return_value={jobs[0].canonical_claim: result}):
+            process_jobs(jobs)
+        return VerificationJob.objects.get(id=jobs[0].id)
+
+    def test_failures_are_retried_whatever_their_wording(self):
+        job = self.run_jobs(VerificationFailure(verdict='UNVERIFIABLE', confidence=0, reasoning='LLM timeout',
+                                                evidence_sources=[]))
+
+        self.assertEqual((job.status, job.last_error), ('queued', 'LLM timeout'))
+        self.assertEqual(job.claim.status, 'pending')
+
+    def test_verdicts_complete_the_job(self):
+        job = self.run_jobs(VerificationResult(verdict='FALSE', confidence=0.9, reasoning='Verification failed: n/a',
+                                               evidence_sources=[]))
+
+        self.assertEqual(job.status, 'done')
+        self.assertEqual(job.claim.status, 'false')
+        self.assertEqual(job.claim.evidence_fingerprint, '')
+
+
+class SingleFlightTests(TestCase):
+    def start_leader(self, flight, key, result=None, error=None):
+        """Starts a call on another thread that holds `key` until released"""
+        started, release = threading.Event(), threading.Event()
+        outcome = {}
+
+        def fn():
+            started.set()
+            release.wait(5)
+            if error is not None:
+                raise error
+            return result
+
+        def run():
+            try:
+                outcome['result'] = flight.do(key, fn)
+            except Exception as e:
+                outcome['error'] = e
+
+        thread = threading.Thread(target=run)
+        thread.start()
+        started.wait(5)
+        return thread, release, outcome
+
+    def follow(self, flight, key, fn=lambda: 'follower ran', **kwargs):
+        outcome = {}
+
+        def run():
+            try:
+                outcome['result'] = flight.do(key, fn, **kwargs)
+            except Exception as e:
+                outcome['error'] = e
+
+        thread = threading.Thread(target=run)
+        thread.start()
+        return thread, outcome
+
+    def wait_for_follower(self, flight):
+        for _ in range(500):
+            if flight.stats()['coalesced']:
+                return
+            threading.Event().wait(0.01)
+
+    def test_followers_get_the_leaders_result(self):
+        flight = SingleFlight(cross_process=False)
+        leader, release, led = self.start_leader(flight, 'k', result='leader ran')
+        follower, followed = self.follow(flight, 'k')
+        self.wait_for_follower(flight)
+        release.set()
+        leader.join(5)
+        follower.join(5)
+
+        self.assertEqual(led, {'result': 'leader ran'})
+        self.assertEqual(followed, {'result': 'leader ran'})
+        self.assertEqual(flight.stats(), {'in_flight': 0, 'executed': 1, 'coalesced': 1,
+                                          'coalesced_cross_process': 0, 'follower_timeouts': 0})
+
+    def test_followers_get_the_leaders_error(self):
+        flight = SingleFlight(cross_process=False)
+        leader, release, led = self.start_leader(flight, 'k', error=RuntimeError('rate limited'))
+        follower, followed = self.follow(flight, 'k')
+        self.wait_for_follower(flight)
+        release.set()
+        leader.join(5)
+        follower.join(5)
+
+        self.assertIsInstance(led['error'], RuntimeError)
+        self.assertIs(followed['error'], led['error'])
+
+    def test_followers_stop_waiting_at_their_deadline(self):
+        flight = SingleFlight(cross_process=False)
+        leader, release, led = self.start_leader(flight, 'k', result='leader ran')
+        follower, followed = self.follow(flight, 'k', deadline=Deadline(0.05))
+        follower.join(5)
+        release.set()
+        leader.join(5)
+
+        self.assertIsInstance(followed['error'], TimeoutError)
+        self.assertEqual(led, {'result': 'leader ran'})
+        self.assertEqual(flight.stats()['follower_timeouts'], 1)
+
+    def test_cross_process_followers_stop_waiting_at_their_deadline(self):
+        InFlightCall.objects.create(key='k', owner='other-worker',
+                                    expires_at=timezone.now() + timedelta(minutes=1))
+        flight = SingleFlight(cross_process=True)
+
+        with self.assertRaises(TimeoutError):
+            flight.do('k', lambda: 'ran', deadline=Deadline(0.05))
+        self.assertEqual(flight.stats()['executed'], 0)
+
+    def test_pipeline_records_sentences_left_by_a_follower_timeout(self):
+        with mock.patch('agents.claim_extractor.pipeline.classify_sentence', side_effect=TimeoutError):
+            store = run_pipeline('The economy grew by 7.2% last year. Exports rose by 3%.', Deadline(60))
+
+        self.assertEqual(store.all(), [])
+        self.assertEqual(len(store.timed_out_sentences), 2)
+
+
+class StableSearch:
+    """Search tool stub whose fingerprint search returns fixed results"""
+
+    def __init__(self, results):
+        self.results = results
+        self.queries = []
+
+    def stable_results(self, query, deadline=None):
+        self.queries.append(query)
+        return self.results
+
+    def run_results(self, query, deadline=None):
+        raise AssertionError('evidence search run for an unchanged claim')
+
+
+class EvidenceFingerprintTests(TestCase):
+    claim_text = 'india|grow|7.2%|2023|india|null'
+    results = [
+        {'href': 'https://example.com/a?utm_source=x', 'title': 'A', 'body': 'India grew 7.2%'},
+        {'href': 'https://example.org/b', 'title': 'B', 'body': 'GDP up'},
+    ]
+
+    def test_ranking_and_snippets_dont_change_it(self):
+        reworded = [{**self.results[1], 'body': 'Growth figures'}, self.results[0]]
+
+        self.assertEqual(evidence_fingerprint(self.results), evidence_fingerprint(reworded))
+        self.assertNotEqual(evidence_fingerprint(self.results), evidence_fingerprint(self.results[:1]))
+
+    def test_failed_searches_have_no_fingerprint(self):
+        self.assertEqual(EvidencePool(StableSearch(None)).fingerprint(self.claim_text), '')
+        self.assertNotEqual(EvidencePool(StableSearch([])).fingerprint(self.claim_text), '')
+
+    def test_reverify_fingerprints_claims_verified_without_one(self):
+        claim = Claim.objects.create(content=self.claim_text, status='verified',
+                                     verified_at=timezone.now() - timedelta(days=30))
+        verdict = VerificationResult(verdict='VERIFIED', confidence=0.9, reasoning='ok', evidence_sources=[])
+        search = StableSearch(self.results)
+        search.run_results = lambda query, deadline=None: self.results
+
+        with mock.patch('agents.management.commands.reverify_claims.search', search), \
+                mock.patch('agents.management.commands.reverify_claims.verify_claims_batch',
+                           return_value={self.claim_text: verdict}) as verify:
+            call_command('reverify_claims', stdout=io.StringIO())
+
+        verify.assert_called_once()
+        claim.refresh_from_db()
+        self.assertEqual(claim.evidence_fingerprint, evidence_fingerprint(self.results))
+
+    def test_reverify_skips_claims_with_unchanged_evidence(self):
+        stale = timezone.now() - timedelta(days=30)
+        claim = Claim.objects.create(content=self.claim_text, status='verified', verified_at=stale,
+                                     evidence_fingerprint=evidence_fingerprint(self.results))
+
+        with mock.patch('agents.management.commands.reverify_claims.search', StableSearch(self.results)), \
+                mock.patch('agents.management.commands.reverify_claims.verify_claims_batch') as verify:
+            call_command('reverify_claims', stdout=io.StringIO())
+
+        verify.assert_not_called()
+        claim.refresh_from_db()
+        self.assertGreater(claim.verified_at, stale)
+
+
+def verdict(name, confidence=0.9):
+    return VerificationResult(verdict=name, confidence=confidence, reasoning='', evidence_sources=[])
+
+
+class CascadeTests(TestCase):
+    claim_text = 'india|grow|7.2%|2023|india|null'
+
+    def escalate(self, fast, strong=None, deadline=None):
+        stats = CascadeStats()
+        with mock.patch('agents.verifier.agent.verify_with_evidence', return_value=strong) as strong_call:
+            result = escalate_if_needed(self.claim_text, '', fast, deadline, threshold=0.8, stats=stats)
+        return result, strong_call.called, stats.summary()
+
+    def test_confident_fast_verdicts_are_kept(self):
+        fast = verdict('VERIFIED')
+        result, escalated, summary = self.escalate(fast)
+
+        self.assertIs(result, fast)
+        self.assertFalse(escalated)
+        self.assertEqual((summary['verified'], summary['escalated']), (1, 0))
+
+    def test_doubtful_verdicts_go_to_the_strong_model(self):
+        for fast, strong, agreed in [(verdict('VERIFIED', 0.5), verdict('VERIFIED'), True),
+                                     (verdict('UNVERIFIABLE'), verdict('FALSE'), False)]:
+            with self.subTest(fast=fast.verdict):
+                result, escalated, summary = self.escalate(fast, strong)
+
+                self.assertIs(result, strong)
+                self.assertTrue(escalated)
+                self.assertEqual(summary['escalation_rate'], 1.0)
+                self.assertEqual(summary['agreement_rate'], 1.0 if agreed else 0.0)
+
+    def test_fast_failures_are_escalated_but_not_compared(self):
+        result, escalated, summary = self.escalate(None, verdict('FALSE'))
+
+        self.assertTrue(escalated)
+        self.assertEqual((summary['fast_failures'], summary['agreement_rate']), (1, 0.0))
+
+    def test_low_deadline_keeps_the_fast_verdict(self):
+        fast = verdict('UNVERIFIABLE')
+        result, escalated, _ = self.escalate(fast, verdict('FALSE'), Deadline(1))
+
+        self.assertIs(result, fast)
+        self.assertFalse(escalated)
+
+    def test_rates_across_verdicts(self):
+        stats = CascadeStats()
+        stats.record(escalated=False)
+        stats.record(escalated=True, fast_verdict='FALSE', strong_verdict='FALSE')
+        stats.record(escalated=True, fast_verdict='VERIFIED', strong_verdict='FALSE')
+        stats.record(escalated=True)
+
+        self.assertEqual(stats.summary(), {'verified': 4, 'escalated': 3, 'escalation_rate': 0.75,
+                                           'fast_failures': 1, 'agreement_rate': 0.5})
+
+    def test_worker_batches_report_the_cascade(self):
+        enqueue_claims(save_pipeline_claims([self.claim_text], 'text'))
+        output = io.StringIO()
+        with mock.patch('agents.verifier.cascade.CASCADE_ENABLED', True), \
+                mock.patch('agents.verifier.agent.gather_evidence', return_value=''), \
+                mock.patch('agents.verifier.batch_verifier.verify_claims_batch', return_value={}), \
+                contextlib.redirect_stdout(output):
+            process_jobs(lease_jobs('w'))
+
+        self.assertIn('Verification cascade: {', output.getvalue())
+
+
+class APIError(Exception):
+    def __init__(self, status_code):
+        super().__init__(f'HTTP {status_code}')
+        self.status_code = status_code
+
+
+class FakeClient:
+    """Chat model stub answering with its own name, or raising queued errors"""
+
+    def __init__(self, name):
+        self.name = name
+        self.errors = []
+        self.calls = 0
+
+    def invoke(self, input, config=None, **kwargs):
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return self.name
+
+
+class LLMPoolTests(TestCase):
+    def setUp(self):
+        # Member health is process-wide; give each test its own
+        patcher = mock.patch.dict('agents.llm_pool._health', clear=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def pool(self, *names):
+        with mock.patch('agents.llm_pool.build_client', side_effect=lambda member, model: FakeClient(member['api_key'])):
+            pool = LLMPool('model', members=[{'provider': 'groq', 'api_key': name} for name in names])
+        return pool, {client.name: client for client, _ in pool.members}
+
+    def test_rate_limits_fail_over_to_the_next_member(self):
+        pool, clients = self.pool('key-a', 'key-b')
+        clients['key-a'].errors.append(APIError(429))
+
+        self.assertEqual(pool.invoke('prompt'), 'key-b')
+        status = {s['member']: s for s in pool.status()}
+        self.assertEqual(status['groq:…ey-a']['rate_limited'], 1)
+        self.assertFalse(status['groq:…ey-a']['available'])
+        self.assertEqual(status['groq:…ey-a']['headroom'], 0.5)
+
+    def test_other_client_errors_are_raised_without_failover(self):
+        pool, clients = self.pool('key-a', 'key-b')
+        clients['key-a'].errors.append(APIError(400))
+
+        with self.assertRaises(APIError):
+            pool.invoke('prompt')
+        self.assertEqual(clients['key-b'].calls, 0)
+
+    def test_rejected_keys_are_ejected_for_good(self):
+        pool, clients = self.pool('key-a', 'key-b')
+        clients['key-a'].errors.append(APIError(401))
+
+        self.assertEqual(pool.invoke('prompt'), 'key-b')
+        clients['key-b'].errors.append(APIError(429))
+        # key-b is cooling down, but a rejected key is never the fallback
+        with self.assertRaises(APIError) as raised:
+            pool.invoke('prompt')
+        self.assertEqual(raised.exception.status_code, 429)
+        self.assertEqual(clients['key-a'].calls, 1)
+
+        with mock.patch('agents.llm_pool.time.monotonic', return_value=time.monotonic() + 10 ** 6):
+            self.assertEqual([pool.invoke('prompt') for _ in range(3)], ['key-b'] * 3)
+        self.assertEqual(clients['key-a'].calls, 1)
+
+    def test_every_key_rejected_raises_the_auth_error(self):
+        pool, clients = self.pool('key-a')
+        clients['key-a'].errors.append(APIError(403))
+
+        with self.assertRaises(APIError):
+            pool.invoke('prompt')
+        with self.assertRaises(RuntimeError):
+            pool.invoke('prompt')
+
+    def test_ejected_members_return_after_the_cool_down(self):
+        pool, clients = self.pool('key-a', 'key-b')
+        clients['key-a'].errors.extend(APIError(503) for _ in range(3))
+        while clients['key-a'].errors:
+            self.assertEqual(pool.invoke('prompt'), 'key-b')
+
+        self.assertEqual([pool.invoke('prompt') for _ in range(4)], ['key-b'] * 4)
+        self.assertEqual(clients['key-a'].calls, 3)
+
+        with mock.patch('agents.llm_pool.time.monotonic', return_value=time.monotonic() + EJECT_SECONDS + 1):
+            self.assertIn('key-a', [pool.invoke('prompt') for _ in range(4)])
+
+    def test_calls_are_spread_by_headroom(self):
+        pool, clients = self.pool('key-a', 'key-b')
+        pool.members[1][1].headroom = 0.25
+
+        # Successes recover headroom; hold it steady to check the weighting
+        with mock.patch('agents.llm_pool.HEADROOM_RECOVERY', 0):
+            answers = [pool.invoke('prompt') for _ in range(50)]
+        self.assertEqual((answers.count('key-a'), answers.count('key-b')), (40, 10))
+
+
+class BatchVerifierTests(TestCase):
+    items = [(f'claim {n}|grow|{n}%|2023|india|null', 'x' * 400) for n in range(5)]
+    overhead = estimate_tokens(BATCH_VERIFIER_PROMPT.template + batch_parser.get_format_instructions())
+
+    def cost(self, canonical, evidence):
+        return estimate_tokens(format_claim_block(1, canonical, evidence)) + OUTPUT_TOKENS_PER_CLAIM
+
+    def test_batches_fit_the_token_budget(self):
+        budget = self.overhead + 2 * self.cost(*self.items[0]) + 10
+        batches = plan_batches(self.items, token_budget=budget)
+
+        self.assertEqual([len(b) for b in batches], [2, 2, 1])
+        self.assertEqual([item for b in batches for item in b], self.items)
+        for batch in batches:
+            self.assertLessEqual(self.overhead + sum(self.cost(*item) for item in batch), budget)
+
+    def test_batch_size_is_capped(self):
+        self.assertEqual([len(b) for b in plan_batches(self.items, max_batch_size=3)], [3, 2])
+
+    def test_oversized_claims_get_a_batch_of_their_own(self):
+        huge = ('huge|claim|null|null|null|null', 'x' * 40000)
+        batches = plan_batches([self.items[0], huge, self.items[1]])
+
+        self.assertEqual(batches, [[self.items[0]], [huge], [self.items[1]]])
+
+    def test_malformed_items_are_dropped_one_by_one(self):
+        raw = """```json
+{"results": [
+  {"claim_id": 1, "verdict": "VERIFIED", "confidence": 0.9, "reasoning": "ok", "evidence_sources": []},
+  {"claim_id": 2, "verdict": "PROBABLY", "confidence": 0.9, "reasoning": "bad verdict", "evidence_sources": []},
+  {"claim_id": "three", "verdict": "FALSE", "confidence": 0.9, "reasoning": "bad id", "evidence_sources": []},
+  {"claim_id": 9, "verdict": "FALSE", "confidence": 0.9, "reasoning": "not in batch", "evidence_sources": []},
+  {"claim_id": 1, "verdict": "FALSE", "confidence": 0.9, "reasoning": "duplicate", "evidence_sources": []},
+  "not an item"
+]}
+```"""
+        parsed = parse_batch_output(raw, 3)
+
+        self.assertEqual(list(parsed), [1])
+        self.assertEqual(parsed[1].reasoning, 'ok')
+        self.assertEqual(parse_batch_output('not json at all', 3), {})
+        self.assertEqual(parse_batch_output('{"results": "none"}', 3), {})
+
+    def verify_batch(self, raw, deadline=None):
+        batch = self.items[:3]
+        individual = {canonical: verdict('FALSE') for canonical, _ in batch}
+        with mock.patch('agents.verifier.batch_verifier.CASCADE_ENABLED', False), \
+                mock.patch('agents.verifier.batch_verifier.singleflight.do', return_value=raw), \
+                mock.patch('agents.verifier.batch_verifier.verify_individually',
+                           side_effect=lambda canonical, evidence, deadline: individual[canonical]) as retry:
+            results = verify_claims_batch(batch, deadline)
+        return batch, results, [c.args[0] for c in retry.call_args_list]
+
+    def test_missing_and_malformed_verdicts_are_verified_individually(self):
+        raw = ('{"results": [{"claim_id": 2, "verdict": "VERIFIED", "confidence": 0.9, "reasoning": "ok", '
+               '"evidence_sources": []}, {"claim_id": 3, "verdict": "VERIFIED"}]}')
+        batch, results, retried = self.verify_batch(raw)
+
+        self.assertEqual(retried, [batch[0][0], batch[2][0]])
+        self.assertEqual([results[c].verdict for c, _ in batch], ['FALSE', 'VERIFIED', 'FALSE'])
+
+    def test_unparseable_output_falls_back_for_every_claim(self):
+        batch, results, retried = self.verify_batch('Sorry, I cannot help with that.')
+
+        self.assertEqual(retried, [c for c, _ in batch])
+        self.assertEqual(set(results), {c for c, _ in batch})
+
+    def test_no_fallback_once_the_deadline_has_expired(self):
+        batch, results, retried = self.verify_batch('{}', Deadline(0))
+
+        self.assertEqual((retried, results), ([], {}))
+
+
+def result(url, title, body):
+    return {'href': url, 'title': title, 'body': body}
+
+
+class EvidenceSelectorTests(TestCase):
+    claim_text = 'india|grow|exports|null|null|null'
+
+    def test_mirrors_of_a_page_share_a_canonical_url(self):
+        self.assertEqual(canonical_url('https://www.Example.com/news/story/?utm_source=x&id=3&fbclid=y'),
+                         canonical_url('http://m.example.com/news/story?id=3'))
+        self.assertNotEqual(canonical_url('https://example.com/story?id=3'),
+                            canonical_url('https://example.com/story?id=4'))
+
+        kept = deduplicate([
+            result('https://www.example.com/story/', 'First', 'India exports grew'),
+            result('https://m.example.com/story?utm_medium=social', 'Mirror', 'A different summary of it'),
+        ])
+        self.assertEqual([r['title'] for r in kept], ['First'])
+
+    def test_near_identical_snippets_are_dropped(self):
+        body = 'India exports grew 7.2% in 2023 according to the commerce ministry figures released on friday'
+        kept = deduplicate([
+            result('https://a.example/1', 'A', body),
+            result('https://b.example/2', 'B', body + ' morning'),
+            result('https://c.example/3', 'C', 'Rain is expected across the north of the country tomorrow'),
+        ])
+
+        self.assertEqual([r['title'] for r in kept], ['A', 'C'])
+
+    def test_terms_are_weighted_by_their_claim_slot(self):
+        weights = claim_term_weights('the_economy|say|exports|2023|india|null')
+        self.assertEqual(weights, {'economy': 1.0, 'exports': 1.5, '2023': 1.0, 'india': 0.75})
+
+        # Same length, one matching term each: scores follow the slot weights
+        passages = ['india figures reported today', 'grow figures reported today', 'exports figures reported today']
+        scores = bm25_scores(claim_term_weights(self.claim_text), passages)
+        self.assertAlmostEqual(scores[0] / scores[1], 1.0 / 0.5)
+        self.assertAlmostEqual(scores[2] / scores[1], 1.5 / 0.5)
+
+    def test_passages_are_packed_best_first_within_the_budget(self):
+        results = [
+            result('https://a.example/1', 'India exports grow', 'India exports grow fast'),
+            result('https://b.example/2', 'India exports grow', ' '.join(f'word{n}' for n in range(150))),
+            result('https://c.example/3', 'Exports', 'India exports'),
+            result('https://e.example/5', 'Plans', 'Firms plan to grow'),
+            result('https://d.example/4', 'Weather', 'Rain expected tomorrow'),
+        ]
+        # Ranked a, c, b, e; the weather report doesn't match the claim at all
+        evidence = select_evidence(self.claim_text, results, token_budget=60)
+
+        urls = [line.split('URL: ')[1] for line in evidence.splitlines() if 'URL: ' in line]
+        # b (~89 tokens) doesn't fit after a and c; e still does
+        self.assertEqual(urls, ['https://a.example/1', 'https://c.example/3', 'https://e.example/5'])
+        self.assertLessEqual(sum(estimate_tokens(block) for block in evidence.split('\n\n')), 60)
+
+    def test_the_best_passage_is_kept_whatever_its_size(self):
+        evidence = select_evidence(self.claim_text, [result('https://a.example/1', 'India exports grow', 'x' * 280)],
+                                   token_budget=1)
+
+        self.assertIn('https://a.example/1', evidence)
+
+
+class FakeTranscriptApi:
+    """youtube_transcript_api stub recording the requests made to YouTube"""
+    requests = []
+
+    def list(self, video_id):
+        self.requests.append('list')
+        transcript = mock.Mock(language_code='en', language='English', is_generated=True)
+        transcript.fetch.side_effect = lambda: self.requests.append('fetch') or mock.Mock(
+            **{'to_raw_data.return_value': [{'text': 'India grew 7.2%', 'start': 0.0, 'duration': 2.0}]})
+        return [transcript]
+
+
+class FetchVideoTests(TestCase):
+    def test_each_youtube_request_waits_for_the_limiter(self):
+        FakeTranscriptApi.requests = []
+        limiter = mock.Mock(**{'wait.side_effect': lambda host: FakeTranscriptApi.requests.append(f'wait {host}')})
+
+        with mock.patch('youtube_transcript_api.YouTubeTranscriptApi', FakeTranscriptApi):
+            document = fetch_video('abcdefghijk', limiter)
+            cached = fetch_video('abcdefghijk', limiter)
+
+        waited = f'wait {YOUTUBE_HOST}'
+        self.assertEqual(FakeTranscriptApi.requests, [waited, 'list', waited, 'fetch'])
+        self.assertEqual(document.page_content, cached.page_content)
+        self.assertTrue(cached.metadata['cached'])
+
+
+class IngestVideosTests(TestCase):
+    def test_fetched_videos_go_on_to_extraction(self):
+        def fetch(video_id, limiter, force_refresh):
+            if video_id == 'bbbbbbbbbbb':
+                raise RuntimeError('Transcripts are disabled for this video')
+            return mock.Mock(page_content='India grew 7.2%', metadata={'cached': False})
+
+        claim = {'canonical_claim': 'india|grow|7.2%|2023|india|null'}
+        with mock.patch('agents.batch_ingestion.fetch_video', side_effect=fetch), \
+                mock.patch('agents.batch_ingestion.extract_video', return_value={'claims': [claim], 'queued': 1}):
+            events = list(ingest_videos(['aaaaaaaaaaa', 'https://youtu.be/bbbbbbbbbbb', 'ccccccccccc', 'aaaaaaaaaaa'],
+                                        requests_per_second=1000))
+
+        summary = events[-1]['summary']
+        self.assertEqual((summary['videos'], summary['succeeded'], summary['failed'], summary['claims']), (3, 2, 1, 2))
+        self.assertEqual(summary['per_video']['bbbbbbbbbbb']['stage'], 'fetch')
+        self.assertEqual(summary['repeated_claims'], [{'canonical_claim': claim['canonical_claim'], 'videos': 2}])
+        self.assertEqual(sorted(e['video_id'] for e in events if e['event'] == 'extracted'),
+                         ['aaaaaaaaaaa', 'ccccccccccc'])
@@ -4,6 +4,8 @@ from . import views
 
 urlpatterns = [
    path('extract-claims/', views.extract_claims, name='extract_claims'),
+   path('jobs/<uuid:job_id>/', views.extraction_job_view, name='extraction_job'),
    path('yt/', views.yt_analyzer, name='yt_analyzer'),
    path('load-transcript/', views.load_transcript_view, name='load_transcript'),
+   path('batch-ingest/', views.batch_ingest_view, name='batch_ingest'),
 ]
\ No newline at end of file
@@ -0,0 +1,286 @@
+# agents/verification_queue.py
+"""
+Database-backed queue of claims awaiting verification.
+
+Views enqueue the claims they saved and return straight away; the
+`verification_worker` management command leases jobs, verifies them and
+writes the verdicts back to notes.models.Claim.
+"""
+import os
+import socket
+import threading
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Case, F, IntegerField, Q, Value, When
+from django.utils import timezone
+
+from notes.services.claim_persistence import VERDICT_TO_STATUS, format_verification_notes
+
+from .deadline import Deadline
+from .models import VerificationJob
+from .verifier.priority import claim_priority, queue_rank
+
+LEASE_SECONDS = 300
+
+# Share of its lease a worker batch may spend verifying; the rest is left
+# for writing verdicts, so a slow batch never outlives its lease and gets
+# leased (and verified) a second time
+BATCH_DEADLINE_FRACTION = 0.8
+
+# Jobs read per lease attempt; more than `limit` so that losing a few
+# compare-and-sets to other workers still fills the lease
+CANDIDATE_WINDOW = 20
+
+# Retry backoff: 30s, 60s, 120s, ...
+RETRY_BACKOFF_SECONDS = 30
+
+def worker_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}:{threading.get_ident()}"
+
+
+def enqueue_claims(claims, lane: str = 'interactive') -> int:
+    """
+    Queues (Claim, canonical_claim, occurrences) triples for verification.
+    Claims that are already queued, running or verified (e.g. re-submitted
+    text) are skipped. Returns the number of jobs created.
+    """
+    seen = set(
+        VerificationJob.objects.filter(
+            claim_id__in=[claim.id for claim, _, _ in claims],
+            status__in=['queued', 'running', 'done'],
+        ).values_list('claim_id', flat=True)
+    )
+    now = timezone.now()
+    jobs = []
+    for claim, canonical, occurrences in claims:
+        if claim.id in seen:
+            continue
+        seen.add(claim.id)
+        priority = claim_priority(canonical, occurrences)
+        jobs.append(VerificationJob(
+            claim=claim,
+            canonical_claim=canonical,
+            lane=lane,
+            occurrences=occurrences,
+            priority=priority,
+            queue_rank=queue_rank(priority, now),
+            created_at=now,
+        ))
+    VerificationJob.objects.bulk_create(jobs)
+    print(f"[Queue] Enqueued {len(jobs)} claims for verification ({lane})")
+    return len(jobs)
+
+
+def runnable_jobs(now):
+    return VerificationJob.objects.filter(
+        Q(status='queued', available_at__lte=now) |
+        Q(status='running', lease_expires_at__lt=now)
+    )
+
+
+def interactive_waiting() -> bool:
+    """True when interactive jobs are queued and should preempt bulk work"""
+    return runnable_jobs(timezone.now()).filter(lane='interactive').exists()
+
+
+def release_jobs(jobs: list, reason: str = 'preempted by interactive work'):
+    """Hands leased jobs back to the queue untouched (preemption, batch deadline)"""
+    VerificationJob.objects.filter(id__in=[j.id for j in jobs], status='running').update(
+        status='queued',
+        lease_owner='',
+        lease_expires_at=None,
+        attempts=F('attempts') - 1,
+    )
+    print(f"[Queue] Released {len(jobs)} jobs: {reason}")
+
+
+def batch_deadline(lease_seconds: int = LEASE_SECONDS) -> Deadline:
+    """Time budget for verifying jobs leased for `lease_seconds`"""
+    return Deadline(lease_seconds * BATCH_DEADLINE_FRACTION)
+
+
+def lease_jobs(owner: str, limit: int = 1, lease_seconds: int = LEASE_SECONDS) -> list:
+    """
+    Claims up to `limit` runnable jobs for `owner`: queued jobs that are
+    due, plus running jobs whose previous lease has expired.
+
+    Interactive jobs always go first. Within a lane, jobs are taken by
+    priority (occurrences and check-worthiness) plus credit for their age.
+    """
+    now = timezone.now()
+    lane_rank = Case(
+        When(lane='interactive', then=Value(0)),
+        default=Value(1),
+        output_field=IntegerField(),
+    )
+    # queue_rank orders by priority plus ageing credit, so a long-waiting
+    # low-priority job eventually outranks fresh high-priority work
+    window = list(
+        runnable_jobs(now)
+        .annotate(lane_rank=lane_rank)
+        .order_by('lane_rank', '-queue_rank')
+        .values('id', 'lane')[:max(CANDIDATE_WINDOW, limit * 2)]
+    )
+    if not window:
+        return []
+
+    # Never mix lanes in one lease, so bulk batches can be preempted as a whole
+    lane = window[0]['lane']
+    candidates = [c for c in window if c['lane'] == lane]
+
+    leased = []
+    for candidate in candidates:
+        if len(leased) >= limit:
+            break
+        job_id = candidate['id']
+        # Compare-and-set: only one worker's UPDATE can match the old state
+        with transaction.atomic():
+            won = runnable_jobs(now).filter(id=job_id).update(
+                status='running',
+                lease_owner=owner,
+                lease_expires_at=now + timedelta(seconds=lease_seconds),
+                attempts=F('attempts') + 1,
+            )
+            if won:
+                leased.append(VerificationJob.objects.select_related('claim').get(id=job_id))
+    return leased
+
+
+def apply_verdict(claim, result, fingerprint: str = ''):
+    """
+    Sets a claim's status and notes from a VerificationResult (unsaved).
+    The worker leaves `fingerprint` empty: it costs a search of its own, so
+    reverify_claims computes it the first time it re-checks the claim.
+    """
+    claim.status = VERDICT_TO_STATUS.get(result.verdict.upper(), 'pending')
+    claim.verification_notes = format_verification_notes(
+        result.reasoning, result.confidence, result.evidence_sources
+    )
+    claim.verified_at = timezone.now()
+    claim.evidence_fingerprint = fingerprint
+    return ['status', 'verification_notes', 'verified_at', 'evidence_fingerprint', 'updated_at']
+
+
+def complete_job(job: VerificationJob, result, fingerprint: str = '', retrieval_stats: dict = None):
+    """Writes a VerificationResult back to the claim and closes the job"""
+    claim = job.claim
+    update_fields = apply_verdict(claim, result, fingerprint)
+
+    with transaction.atomic():
+        claim.save(update_fields=update_fields)
+        job.status = 'done'
+        job.completed_at = timezone.now()
+        job.lease_expires_at = None
+        job.last_error = ''
+        job.retrieval_stats = retrieval_stats or {}
+        job.save(update_fields=[
+            'status', 'completed_at', 'lease_expires_at', 'last_error', 'retrieval_stats', 'updated_at'
+        ])
+
+
+def fail_job(job: VerificationJob, error: str):
+    """Schedules a retry with backoff, or gives up after max_attempts"""
+    job.last_error = error
+    job.lease_expires_at = None
+
+    if job.attempts < job.max_attempts:
+        job.status = 'queued'
+        job.available_at = timezone.now() + timedelta(
+            seconds=RETRY_BACKOFF_SECONDS * 2 ** (job.attempts - 1)
+        )
+        print(f"[Queue] Job {job.id} failed (attempt {job.attempts}/{job.max_attempts}), retrying later: {error}")
+    else:
+        job.status = 'failed'
+        job.completed_at = timezone.now()
+        print(f"[Queue] Job {job.id} failed permanently: {error}")
+
+    job.save(update_fields=[
+        'status', 'last_error', 'lease_expires_at', 'available_at', 'completed_at', 'updated_at'
+    ])
+
+
+def process_jobs(jobs: list, deadline=None):
+    """
+    Verifies a set of leased jobs together so they share evidence pools
+    and batched verifier calls, then records each outcome. Jobs the batch
+    doesn't finish before `deadline` go back to the queue.
+    """
+    from agents.verifier.agent import gather_evidence
+    from agents.verifier.batch_verifier import plan_batches, verify_claims_batch
+    from agents.verifier.cascade import CASCADE_ENABLED, cascade_stats
+    from agents.verifier.evidence_pool import EvidencePool
+    from agents.verifier.search_tool import search
+
+    preemptible = all(job.lane == 'bulk' for job in jobs)
+
+    pool = EvidencePool(search)
+    by_claim = {}
+    items = []
+    timed_out = []
+    for n, job in enumerate(jobs):
+        if preemptible and interactive_waiting():
+            release_jobs(jobs[n:] + timed_out + [j for c in by_claim.values() for j in c])
+            return
+        if job.canonical_claim in by_claim:
+            by_claim[job.canonical_claim].append(job)
+            continue
+        if deadline is not None and deadline.expired():
+            timed_out.append(job)
+            continue
+        try:
+            evidence = gather_evidence(job.canonical_claim, pool=pool, deadline=deadline)
+        except Exception as e:
+            fail_job(job, f"Evidence search failed: {str(e)}")
+            continue
+        by_claim[job.canonical_claim] = [job]
+        items.append((job.canonical_claim, evidence))
+    if timed_out:
+        release_jobs(timed_out, 'batch deadline reached before evidence search')
+
+    avoided = sum(s['searches_avoided'] for s in pool.retrieval_stats.values())
+    print(
+        f"[Queue] Searches: {pool.shared_searches} shared, {pool.claim_searches} claim-level "
+        f"for {len(items)} claims ({avoided} avoided by sufficient evidence)"
+    )
+    print(f"[Queue] DDGS session pool: {search.pool.utilization()}")
+
+    batches = plan_batches(items)
+    for n, batch in enumerate(batches):
+        if preemptible and interactive_waiting():
+            release_jobs([j for later in batches[n:] for c, _ in later for j in by_claim[c]])
+            return
+        if deadline is not None and deadline.expired():
+            release_jobs([j for later in batches[n:] for c, _ in later for j in by_claim[c]],
+                         'batch deadline reached before verification')
+            break
+        try:
+            results = verify_claims_batch(batch, deadline)
+        except Exception as e:
+            for canonical, _ in batch:
+                for job in by_claim[canonical]:
+                    fail_job(job, str(e))
+            continue
+
+        # Left out of the results, or cut short by the deadline-capped
+        # timeout: not a verdict, and not the claim's failure either
+        unfinished = [
+            j for canonical, _ in batch
+            if canonical not in results or (results[canonical].failed and deadline is not None and deadline.expired())
+            for j in by_claim[canonical]
+        ]
+        if unfinished:
+            release_jobs(unfinished, 'batch deadline reached during verification')
+
+        for canonical, result in results.items():
+            if result.failed and deadline is not None and deadline.expired():
+                continue
+            for job in by_claim[canonical]:
+                if result.failed:
+                    fail_job(job, result.reasoning)
+                else:
+                    complete_job(job, result, retrieval_stats=pool.retrieval_stats.get(canonical))
+                    print(f"[Queue] Job {job.id}: {canonical} → {result.verdict}")
+
+    if CASCADE_ENABLED:
+        print(f"[Queue] Verification cascade: {cascade_stats.summary()}")
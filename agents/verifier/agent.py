@@ -2,10 +2,13 @@
 from langchain_core.output_parsers import PydanticOutputParser
 from langchain_core.runnables import RunnableLambda
 
-from agents.claim_extractor.llm_config import llm
+from agents.claim_extractor.llm_config import llm, llm_for
+from agents.singleflight import flight_key, singleflight
 from .search_tool import search
-from .claim_query_builder import claim_to_search_queries
+from .evidence_pool import EvidencePool
+from .evidence_selector import select_evidence, EVIDENCE_TOKEN_BUDGET
 from .claim_verifier_schema import VerificationResult
+from .cascade import CASCADE_ENABLED, verify_with_cascade
 
 from langchain_core.prompts import PromptTemplate
 
@@ -36,26 +39,43 @@ Return output strictly in the required JSON format.
 parser = PydanticOutputParser(pydantic_object=VerificationResult)
 
 
-def verify_claim(canonical_claim: str) -> VerificationResult:
-    queries = claim_to_search_queries(canonical_claim)
-
-    search_results = []
-    sources = []
-
-    for q in queries:
-        result = search.run(q)
-        search_results.append(result)
-
-    combined_evidence = "\n\n".join(search_results)
-
+def verify_with_evidence(canonical_claim: str, combined_evidence: str, deadline=None,
+                         model=None) -> VerificationResult:
     chain = (
         VERIFIER_PROMPT
-        | llm
+        | llm_for(deadline, model)
         | parser
     )
 
-    return chain.invoke({
-        "claim": canonical_claim,
-        "evidence": combined_evidence,
-        "format_instructions": parser.get_format_instructions()
-    })
+    return singleflight.do(
+        flight_key("verify", (model or llm).model_name, canonical_claim, combined_evidence),
+        lambda: chain.invoke({
+            "claim": canonical_claim,
+            "evidence": combined_evidence,
+            "format_instructions": parser.get_format_instructions()
+        }),
+        serialize=lambda result: result.model_dump(),
+        deserialize=VerificationResult.model_validate,
+        deadline=deadline
+    )
+
+
+def gather_evidence(canonical_claim: str, pool: EvidencePool = None,
+                    token_budget: int = EVIDENCE_TOKEN_BUDGET, deadline=None) -> str:
+    # A standalone claim gets its own pool; batches share one across claims
+    pool = pool or EvidencePool(search)
+    evidence = pool.evidence_for(canonical_claim, deadline)
+    return select_evidence(canonical_claim, evidence, token_budget)
+
+
+def verify_claim(canonical_claim: str, pool: EvidencePool = None, deadline=None,
+                 cascade: bool = None) -> VerificationResult:
+    """
+    Verifies one claim. In cascade mode (VERIFIER_CASCADE, or cascade=True)
+    a fast model answers first and only doubtful verdicts are escalated
+    to the strong model; see cascade.py.
+    """
+    evidence = gather_evidence(canonical_claim, pool, deadline=deadline)
+    if CASCADE_ENABLED if cascade is None else cascade:
+        return verify_with_cascade(canonical_claim, evidence, deadline)
+    return verify_with_evidence(canonical_claim, evidence, deadline)
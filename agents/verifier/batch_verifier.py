@@ -0,0 +1,174 @@
+# batch_verifier.py
+from langchain_core.output_parsers import PydanticOutputParser, StrOutputParser
+from langchain_core.prompts import PromptTemplate
+from langchain_core.utils.json import parse_json_markdown
+from pydantic import ValidationError
+
+from agents.claim_extractor.llm_config import fast_llm, llm, llm_for
+from agents.singleflight import flight_key, singleflight
+from .agent import verify_with_evidence
+from .cascade import CASCADE_ENABLED, escalate_if_needed, verify_with_cascade
+from .claim_verifier_schema import BatchVerificationResult, VerificationFailure, VerificationResult
+from .evidence_selector import estimate_tokens
+
+# Prompt budget for one batched call, in (estimated) tokens
+BATCH_TOKEN_BUDGET = 6000
+
+# Output tokens reserved per claim for its verdict + reasoning
+OUTPUT_TOKENS_PER_CLAIM = 150
+
+MAX_BATCH_SIZE = 10
+
+BATCH_VERIFIER_PROMPT = PromptTemplate(
+    template="""
+You are a professional fact-checker.
+
+Verify EACH claim below using ONLY the search evidence listed under it.
+
+{claims}
+
+Rules:
+- Use ONLY the provided evidence for each claim
+- If evidence clearly supports claim → VERIFIED
+- If evidence contradicts claim → FALSE
+- If evidence partially supports → PARTIALLY_VERIFIED
+- If insufficient or unclear → UNVERIFIABLE
+- Do NOT infer or guess
+- Return exactly one result per claim, with its claim_id
+
+Return output strictly in the required JSON format.
+{format_instructions}
+""",
+    input_variables=["claims", "format_instructions"]
+)
+
+batch_parser = PydanticOutputParser(pydantic_object=BatchVerificationResult)
+
+batch_chain = BATCH_VERIFIER_PROMPT | llm | StrOutputParser()
+
+
+def format_claim_block(claim_id: int, canonical_claim: str, evidence: str) -> str:
+    return f'[Claim {claim_id}]\n"{canonical_claim}"\nSearch Evidence:\n{evidence}\n'
+
+
+def plan_batches(items: list[tuple[str, str]], token_budget: int = BATCH_TOKEN_BUDGET,
+                 max_batch_size: int = MAX_BATCH_SIZE) -> list[list[tuple[str, str]]]:
+    """
+    Greedily packs (canonical_claim, evidence) pairs into batches whose
+    prompt, plus the output reserved for their verdicts, fits the budget.
+    A claim too large for any batch still gets a batch of its own.
+    """
+    overhead = estimate_tokens(
+        BATCH_VERIFIER_PROMPT.template + batch_parser.get_format_instructions()
+    )
+
+    batches, current, used = [], [], overhead
+    for canonical, evidence in items:
+        cost = estimate_tokens(format_claim_block(len(current) + 1, canonical, evidence)) + OUTPUT_TOKENS_PER_CLAIM
+        if current and (used + cost > token_budget or len(current) >= max_batch_size):
+            batches.append(current)
+            current, used = [], overhead
+        current.append((canonical, evidence))
+        used += cost
+
+    if current:
+        batches.append(current)
+    return batches
+
+
+def parse_batch_output(raw: str, batch_size: int) -> dict[int, VerificationResult]:
+    """
+    Validates each item of the model output on its own, so one malformed
+    verdict doesn't throw away the rest of the batch.
+    """
+    try:
+        data = parse_json_markdown(raw)
+    except Exception:
+        return {}
+
+    items = data.get("results", []) if isinstance(data, dict) else data
+    if not isinstance(items, list):
+        return {}
+
+    parsed = {}
+    for item in items:
+        if not isinstance(item, dict):
+            continue
+        try:
+            claim_id = int(item.get("claim_id"))
+            result = VerificationResult.model_validate(item)
+        except (TypeError, ValueError, ValidationError):
+            continue
+        if 1 <= claim_id <= batch_size and claim_id not in parsed:
+            parsed[claim_id] = result
+    return parsed
+
+
+def verify_individually(canonical_claim: str, evidence: str, deadline=None) -> VerificationResult:
+    try:
+        if CASCADE_ENABLED:
+            return verify_with_cascade(canonical_claim, evidence, deadline)
+        return verify_with_evidence(canonical_claim, evidence, deadline)
+    except Exception as e:
+        print(f"    ✗ Error: {str(e)}")
+        return VerificationFailure(
+            verdict="UNVERIFIABLE",
+            confidence=0.0,
+            reasoning=f"Verification failed: {str(e)}",
+            evidence_sources=[]
+        )
+
+
+def verify_claims_batch(batch: list[tuple[str, str]], deadline=None) -> dict[str, VerificationResult]:
+    """
+    Verifies several (canonical_claim, evidence) pairs in one LLM call.
+    Claims missing from the response or with a malformed verdict are
+    retried individually, unless the deadline has expired; those are
+    left out of the result. Returns results keyed by canonical claim.
+
+    In cascade mode the batch goes to the fast model and each doubtful
+    verdict is escalated to the strong model on its own.
+    """
+    if len(batch) == 1:
+        canonical, evidence = batch[0]
+        return {canonical: verify_individually(canonical, evidence, deadline)}
+
+    claims_text = "\n".join(
+        format_claim_block(i, canonical, evidence)
+        for i, (canonical, evidence) in enumerate(batch, 1)
+    )
+
+    try:
+        model = fast_llm if CASCADE_ENABLED else None
+        chain = batch_chain if deadline is None and model is None else (
+            BATCH_VERIFIER_PROMPT | llm_for(deadline, model) | StrOutputParser()
+        )
+        raw = singleflight.do(
+            flight_key("verify_batch", (model or llm).model_name, claims_text),
+            lambda: chain.invoke({
+                "claims": claims_text,
+                "format_instructions": batch_parser.get_format_instructions()
+            }),
+            deadline=deadline
+        )
+        parsed = parse_batch_output(raw, len(batch))
+    except Exception as e:
+        print(f"    ✗ Batch call failed: {str(e)}")
+        parsed = {}
+
+    results = {}
+    for i, (canonical, evidence) in enumerate(batch, 1):
+        if i in parsed and CASCADE_ENABLED:
+            try:
+                results[canonical] = escalate_if_needed(canonical, evidence, parsed[i], deadline)
+            except Exception as e:
+                print(f"    ✗ Escalation failed, keeping fast verdict: {str(e)}")
+                results[canonical] = parsed[i]
+        elif i in parsed:
+            results[canonical] = parsed[i]
+        elif deadline is not None and deadline.expired():
+            print(f"    ⏱️  Deadline reached, not retrying: {canonical}")
+        else:
+            print(f"    ↻ Retrying individually: {canonical}")
+            results[canonical] = verify_individually(canonical, evidence, deadline)
+    return results
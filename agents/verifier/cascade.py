@@ -0,0 +1,108 @@
+# cascade.py
+import os
+import threading
+
+from agents.claim_extractor.llm_config import fast_llm, strong_llm
+from .claim_verifier_schema import VerificationResult
+
+CASCADE_ENABLED = os.getenv("VERIFIER_CASCADE", "false").lower() in ("1", "true", "yes")
+
+# Fast-tier verdicts below this confidence are re-checked by the strong model
+CASCADE_CONFIDENCE_THRESHOLD = float(os.getenv("VERIFIER_CASCADE_THRESHOLD", "0.8"))
+
+# Verdicts the fast model isn't trusted to settle on its own
+ESCALATE_VERDICTS = {"PARTIALLY_VERIFIED", "UNVERIFIABLE"}
+
+
+class CascadeStats:
+    """Escalation rate and fast/strong agreement, shared across threads"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.verified = 0
+        self.escalated = 0
+        self.fast_failures = 0
+        self.agreed = 0
+        self.disagreed = 0
+
+    def record(self, escalated: bool, fast_verdict: str = None, strong_verdict: str = None):
+        with self._lock:
+            self.verified += 1
+            if not escalated:
+                return
+            self.escalated += 1
+            if fast_verdict is None:
+                self.fast_failures += 1
+            elif fast_verdict == strong_verdict:
+                self.agreed += 1
+            else:
+                self.disagreed += 1
+
+    def escalation_rate(self) -> float:
+        return self.escalated / self.verified if self.verified else 0.0
+
+    def agreement_rate(self) -> float:
+        compared = self.agreed + self.disagreed
+        return self.agreed / compared if compared else 0.0
+
+    def summary(self) -> dict:
+        with self._lock:
+            return {
+                "verified": self.verified,
+                "escalated": self.escalated,
+                "escalation_rate": round(self.escalation_rate(), 3),
+                "fast_failures": self.fast_failures,
+                "agreement_rate": round(self.agreement_rate(), 3),
+            }
+
+
+cascade_stats = CascadeStats()
+
+
+def needs_escalation(result: VerificationResult, threshold: float = CASCADE_CONFIDENCE_THRESHOLD) -> bool:
+    return result.verdict in ESCALATE_VERDICTS or result.confidence < threshold
+
+
+def escalate_if_needed(canonical_claim: str, combined_evidence: str, fast: VerificationResult | None,
+                       deadline=None, threshold: float = CASCADE_CONFIDENCE_THRESHOLD,
+                       stats: CascadeStats = cascade_stats) -> VerificationResult:
+    """
+    Keeps a confident fast-tier verdict, otherwise re-verifies with the
+    strong model. `fast=None` means the fast tier failed. If the deadline
+    is too low for a second call, the fast verdict is kept.
+    """
+    from .agent import verify_with_evidence
+
+    if fast is not None and not needs_escalation(fast, threshold):
+        stats.record(escalated=False)
+        return fast
+
+    if fast is not None and deadline is not None and deadline.low():
+        print(f"    ⏱️  Deadline low, keeping fast verdict {fast.verdict}")
+        stats.record(escalated=False)
+        return fast
+
+    strong = verify_with_evidence(canonical_claim, combined_evidence, deadline, model=strong_llm)
+    stats.record(
+        escalated=True,
+        fast_verdict=fast.verdict if fast is not None else None,
+        strong_verdict=strong.verdict
+    )
+    if fast is not None:
+        print(f"    ⬆️  Escalated: fast {fast.verdict} ({fast.confidence}) → strong {strong.verdict} ({strong.confidence})")
+    return strong
+
+
+def verify_with_cascade(canonical_claim: str, combined_evidence: str, deadline=None,
+                        threshold: float = CASCADE_CONFIDENCE_THRESHOLD,
+                        stats: CascadeStats = cascade_stats) -> VerificationResult:
+    """Verifies with the fast model, escalating doubtful verdicts"""
+    from .agent import verify_with_evidence
+
+    try:
+        fast = verify_with_evidence(canonical_claim, combined_evidence, deadline, model=fast_llm)
+    except Exception as e:
+        print(f"    ⚠️  Fast model failed, escalating: {str(e)}")
+        fast = None
+
+    return escalate_if_needed(canonical_claim, combined_evidence, fast, deadline, threshold, stats)
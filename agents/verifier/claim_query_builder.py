@@ -1,5 +1,23 @@
 # claim_query_builder.py
 
+CLAIM_SLOTS = ("subject", "predicate", "object", "time", "location", "source")
+
+
+def parse_canonical_claim(canonical_claim: str) -> dict:
+    """
+    Splits a canonical claim into its named slots.
+
+    "finance_minister|say|7.2%|last_year|india|null" ->
+    {"subject": "finance minister", ..., "source": ""}
+    """
+    parts = canonical_claim.split("|")
+    parts += ["null"] * (len(CLAIM_SLOTS) - len(parts))
+    return {
+        slot: p.replace('_', ' ').strip() if p != "null" else ""
+        for slot, p in zip(CLAIM_SLOTS, parts)
+    }
+
+
 def claim_to_search_queries(canonical_claim: str, context: str = "") -> list[str]:
     """
     Converts canonical claim into SHORT, search-optimized queries.
@@ -8,10 +26,9 @@ def claim_to_search_queries(canonical_claim: str, context: str = "") -> list[str
         canonical_claim: "subject|predicate|object|time|location|source"
         context: Optional context prefix
     """
-    parts = canonical_claim.split("|")
+    slots = parse_canonical_claim(canonical_claim)
     subject, predicate, obj, time, location, source = [
-        p.replace('_', ' ').strip() if p != "null" else "" 
-        for p in parts
+        slots[slot] for slot in CLAIM_SLOTS
     ]
     
     queries = []
@@ -23,4 +23,32 @@ class VerificationResult(BaseModel):
 
     evidence_sources: List[str] = Field(
         description="List of URLs or source names"
-    )
\ No newline at end of file
+    )
+
+    @property
+    def failed(self) -> bool:
+        """True when verification errored and this is not a real verdict"""
+        return False
+
+
+class VerificationFailure(VerificationResult):
+    """
+    Stand-in result for a claim whose verifier call raised. Kept out of
+    the LLM output schema; callers check `result.failed`.
+    """
+
+    @property
+    def failed(self) -> bool:
+        return True
+
+
+class BatchVerificationItem(VerificationResult):
+    claim_id: int = Field(
+        description="Id of the claim this verdict belongs to, as given in the prompt"
+    )
+
+
+class BatchVerificationResult(BaseModel):
+    results: List[BatchVerificationItem] = Field(
+        description="One verdict per claim in the batch"
+    )
@@ -0,0 +1,102 @@
+# ddgs_pool.py
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from duckduckgo_search import DDGS
+
+# Warm DDGS sessions kept per process (one per concurrent verification)
+POOL_SIZE = int(os.getenv("DDGS_POOL_SIZE", "4"))
+
+# Sessions are replaced after this many searches to shed stale cookies
+MAX_USES_PER_SESSION = 200
+
+SESSION_TIMEOUT = 10
+
+
+class DDGSPool:
+    """
+    Bounded pool of long-lived DuckDuckGo clients.
+
+    Each DDGS instance keeps its HTTP client, so reusing it skips the TLS
+    handshake and cookie bootstrap a fresh `DDGS()` pays on every search.
+    A session is only ever used by one thread at a time; sessions that
+    raise are discarded and replaced on next use.
+    """
+
+    def __init__(self, size: int = POOL_SIZE, max_uses: int = MAX_USES_PER_SESSION,
+                 timeout: int = SESSION_TIMEOUT):
+        self.size = size
+        self.max_uses = max_uses
+        self.timeout = timeout
+        self._slots = threading.BoundedSemaphore(size)
+        self._lock = threading.Lock()
+        # LIFO: the most recently used session is the warmest
+        self._idle: list[tuple[DDGS, int]] = []
+        self._in_use = 0
+        self.counters = {
+            "acquired": 0,
+            "created": 0,
+            "reused": 0,
+            "recycled_after_error": 0,
+            "recycled_after_max_uses": 0,
+            "waited": 0,
+            "wait_seconds": 0.0,
+        }
+
+    @contextmanager
+    def session(self):
+        """Borrow a warm DDGS session for one search"""
+        started = time.monotonic()
+        if not self._slots.acquire(blocking=False):
+            self._slots.acquire()
+            with self._lock:
+                self.counters["waited"] += 1
+                self.counters["wait_seconds"] += time.monotonic() - started
+
+        with self._lock:
+            self.counters["acquired"] += 1
+            self._in_use += 1
+            if self._idle:
+                ddgs, uses = self._idle.pop()
+                self.counters["reused"] += 1
+            else:
+                ddgs, uses = None, 0
+
+        try:
+            if ddgs is None:
+                ddgs = DDGS(timeout=self.timeout)
+                with self._lock:
+                    self.counters["created"] += 1
+
+            try:
+                yield ddgs
+            except Exception:
+                # Don't hand a session in an unknown state to the next caller
+                with self._lock:
+                    self.counters["recycled_after_error"] += 1
+                raise
+
+            uses += 1
+            with self._lock:
+                if uses >= self.max_uses:
+                    self.counters["recycled_after_max_uses"] += 1
+                else:
+                    self._idle.append((ddgs, uses))
+        finally:
+            with self._lock:
+                self._in_use -= 1
+            self._slots.release()
+
+    def utilization(self) -> dict:
+        with self._lock:
+            return {
+                "size": self.size,
+                "in_use": self._in_use,
+                "idle": len(self._idle),
+                **self.counters,
+            }
+
+
+ddgs_pool = DDGSPool()
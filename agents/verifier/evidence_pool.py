@@ -0,0 +1,159 @@
+# evidence_pool.py
+import re
+
+from .claim_query_builder import parse_canonical_claim, claim_to_search_queries
+from .evidence_utils import STOP_WORDS, result_text
+from .fingerprint import evidence_fingerprint
+from .sufficiency import SUFFICIENCY_THRESHOLD, sufficiency_score
+
+# A pooled result must cover at least this share of a claim's key terms
+# before we trust it instead of issuing claim-level searches
+RELEVANCE_THRESHOLD = 0.5
+
+# Upper bound on the evidence handed to the verifier for one claim
+MAX_EVIDENCE_RESULTS = 10
+
+def claim_terms(canonical_claim: str) -> set[str]:
+    """Key terms of a claim (subject, predicate, object, time, location)"""
+    slots = parse_canonical_claim(canonical_claim)
+    text = " ".join(
+        slots[slot] for slot in ("subject", "predicate", "object", "time", "location")
+    )
+    return {
+        word for word in re.findall(r"[a-z0-9][a-z0-9.,%]*", text.lower())
+        if (len(word) > 2 or any(c.isdigit() for c in word)) and word not in STOP_WORDS
+    }
+
+
+def group_key(canonical_claim: str) -> str:
+    """Claims sharing subject + location share one evidence pool"""
+    slots = parse_canonical_claim(canonical_claim)
+    return f"{slots['subject'].lower()}|{slots['location'].lower()}"
+
+
+def relevance_score(terms: set[str], result: dict) -> float:
+    """Share of the claim's key terms that appear in a search result"""
+    if not terms:
+        return 0.0
+    combined = result_text(result).lower()
+    return sum(1 for term in terms if term in combined) / len(terms)
+
+
+class EvidencePool:
+    """
+    Shares search results between claims with the same subject/location.
+
+    The first claim of a group pays for one "subject location" search;
+    every other claim in the group reuses it and only falls back to its
+    own claim-level queries while the evidence is still insufficient.
+    """
+
+    def __init__(self, search_tool, threshold: float = RELEVANCE_THRESHOLD,
+                 sufficiency_threshold: float = SUFFICIENCY_THRESHOLD):
+        self.search = search_tool
+        self.threshold = threshold
+        self.sufficiency_threshold = sufficiency_threshold
+        self.retrieval_stats: dict[str, dict] = {}
+        self._pools: dict[str, list[dict]] = {}
+        self._shared_queries: dict[str, str] = {}
+        self.shared_searches = 0
+        self.claim_searches = 0
+        self.fingerprint_searches = 0
+
+    def shared_query(self, canonical_claim: str) -> str:
+        slots = parse_canonical_claim(canonical_claim)
+        subject, location = slots["subject"], slots["location"]
+        if subject and location and location.lower() not in subject.lower():
+            return f"{subject} {location}"
+        return subject
+
+    def pooled_results(self, canonical_claim: str, deadline=None) -> list[dict]:
+        """Search results shared by every claim in this claim's group"""
+        key = group_key(canonical_claim)
+        if key not in self._pools:
+            if deadline is not None and deadline.expired():
+                return []
+            query = self.shared_query(canonical_claim)
+            self._shared_queries[key] = query.lower()
+            if len(query.split()) >= 2:
+                print(f"   🗂️  Fetching shared evidence for group '{query}'")
+                try:
+                    self._pools[key] = self.search.run_results(query, deadline=deadline)
+                except TimeoutError:
+                    return []
+                self.shared_searches += 1
+            else:
+                self._pools[key] = []
+        return self._pools[key]
+
+    def evidence_for(self, canonical_claim: str, deadline=None) -> list[dict]:
+        """
+        Evidence for one claim: the relevant subset of its group's pool,
+        topped up with claim-level searches until the evidence is
+        sufficient (see sufficiency.py) or the planned queries run out.
+        Claim-level searches are skipped when the deadline runs low.
+        """
+        terms = claim_terms(canonical_claim)
+        scored = [
+            (relevance_score(terms, r), r)
+            for r in self.pooled_results(canonical_claim, deadline)
+        ]
+        scored.sort(key=lambda pair: pair[0], reverse=True)
+
+        evidence = [r for score, r in scored if score >= self.threshold]
+        if evidence:
+            print(f"   ♻️  Reusing {len(evidence)} pooled results")
+
+        shared = self._shared_queries.get(group_key(canonical_claim), "")
+        planned = [
+            q for q in claim_to_search_queries(canonical_claim)
+            if q.lower() != shared
+        ]
+
+        searches_run = 0
+        score = sufficiency_score(canonical_claim, evidence)
+        for q in planned:
+            if score >= self.sufficiency_threshold:
+                break
+            if deadline is not None and deadline.low():
+                print(f"   ⏱️  Deadline low, skipping claim-level searches")
+                break
+            try:
+                evidence.extend(self.search.run_results(q, deadline=deadline))
+            except TimeoutError:
+                print(f"   ⏱️  Deadline reached waiting for a shared search")
+                break
+            searches_run += 1
+            self.claim_searches += 1
+            score = sufficiency_score(canonical_claim, evidence)
+
+        self.retrieval_stats[canonical_claim] = {
+            "planned_searches": len(planned),
+            "searches_run": searches_run,
+            "searches_avoided": len(planned) - searches_run,
+            "sufficiency": score,
+        }
+        if searches_run < len(planned) and score >= self.sufficiency_threshold:
+            print(f"   ⏹️  Evidence sufficient ({score:.2f}), skipped {len(planned) - searches_run} searches")
+
+        # Weakly related pooled results still add context after the claim's own
+        evidence.extend(r for s, r in scored if 0 < s < self.threshold)
+        return evidence[:MAX_EVIDENCE_RESULTS]
+
+    def fingerprint(self, canonical_claim: str, deadline=None) -> str:
+        """
+        Evidence fingerprint of a claim (see fingerprint.py), from one fixed
+        all-time search for its first planned query, so it changes only when
+        the pages found for the claim change. '' when the search fails.
+        """
+        queries = claim_to_search_queries(canonical_claim)
+        if not queries:
+            return ""
+        try:
+            results = self.search.stable_results(queries[0], deadline=deadline)
+        except TimeoutError:
+            return ""
+        if results is None:
+            return ""
+        self.fingerprint_searches += 1
+        return evidence_fingerprint(results)
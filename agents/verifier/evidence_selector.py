@@ -0,0 +1,165 @@
+# evidence_selector.py
+import os
+from collections import Counter
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+import numpy as np
+
+from .claim_query_builder import parse_canonical_claim
+from .evidence_utils import STOP_WORDS, tokenize, result_url, result_text
+
+# Prompt tokens allowed for one claim's evidence
+EVIDENCE_TOKEN_BUDGET = int(os.getenv("VERIFIER_EVIDENCE_TOKEN_BUDGET", "700"))
+
+# Snippets whose word-shingle overlap is above this are treated as duplicates
+NEAR_DUPLICATE_JACCARD = 0.8
+
+MAX_SNIPPET_CHARS = 300
+
+# How much a match on each claim slot counts towards a passage's score
+SLOT_WEIGHTS = {
+    "subject": 1.0,
+    "predicate": 0.5,
+    "object": 1.5,
+    "time": 1.0,
+    "location": 0.75,
+}
+
+# BM25 parameters
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+TRACKING_PARAMS = ("utm_", "fbclid", "gclid", "ref", "cmpid")
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token for English text)"""
+    return len(text) // 4 + 1
+
+
+def canonical_url(url: str) -> str:
+    """Normalises a URL so mirrors of the same page compare equal"""
+    parts = urlsplit(url.strip())
+    host = parts.netloc.lower()
+    if host.startswith("www."):
+        host = host[4:]
+    if host.startswith("m."):
+        host = host[2:]
+    query = urlencode([
+        (k, v) for k, v in parse_qsl(parts.query)
+        if not k.lower().startswith(TRACKING_PARAMS)
+    ])
+    return host + urlunsplit(("", "", parts.path.rstrip("/"), query, ""))
+
+
+def shingles(text: str, size: int = 3) -> set:
+    words = tokenize(text)
+    if len(words) < size:
+        return {tuple(words)} if words else set()
+    return {tuple(words[i:i + size]) for i in range(len(words) - size + 1)}
+
+
+def deduplicate(results: list[dict]) -> list[dict]:
+    """Drops results with an already-seen canonical URL or near-identical snippet"""
+    seen_urls = set()
+    kept, kept_shingles = [], []
+
+    for r in results:
+        url = canonical_url(result_url(r))
+        if url and url in seen_urls:
+            continue
+
+        current = shingles(r.get('body', '') or r.get('title', ''))
+        duplicate = False
+        for other in kept_shingles:
+            union = len(current | other)
+            if union and len(current & other) / union >= NEAR_DUPLICATE_JACCARD:
+                duplicate = True
+                break
+        if duplicate:
+            continue
+
+        if url:
+            seen_urls.add(url)
+        kept.append(r)
+        kept_shingles.append(current)
+
+    return kept
+
+
+def claim_term_weights(canonical_claim: str) -> dict[str, float]:
+    """Query terms of a claim with the weight of the slot they came from"""
+    slots = parse_canonical_claim(canonical_claim)
+    weights = {}
+    for slot, weight in SLOT_WEIGHTS.items():
+        for term in tokenize(slots[slot]):
+            if term in STOP_WORDS or (len(term) < 3 and not term[0].isdigit()):
+                continue
+            weights[term] = max(weights.get(term, 0.0), weight)
+    return weights
+
+
+def bm25_scores(term_weights: dict[str, float], passages: list[str]) -> np.ndarray:
+    """
+    Slot-weighted BM25 score of every passage, computed over the whole
+    passage batch at once.
+    """
+    if not passages or not term_weights:
+        return np.zeros(len(passages))
+
+    terms = list(term_weights)
+    weights = np.array([term_weights[t] for t in terms])
+
+    passage_tokens = [tokenize(p) for p in passages]
+    counts = [Counter(tokens) for tokens in passage_tokens]
+    tf = np.array([[c[t] for t in terms] for c in counts], dtype=float)
+    doc_len = np.array([len(tokens) for tokens in passage_tokens], dtype=float)
+
+    n_docs = len(passages)
+    df = (tf > 0).sum(axis=0)
+    idf = np.log(1.0 + (n_docs - df + 0.5) / (df + 0.5))
+
+    avg_len = doc_len.mean() or 1.0
+    norm = BM25_K1 * (1 - BM25_B + BM25_B * doc_len / avg_len)
+    saturated = tf * (BM25_K1 + 1) / (tf + norm[:, None])
+
+    return saturated @ (idf * weights)
+
+
+def format_passage(index: int, result: dict) -> str:
+    title = result.get('title', 'No title')
+    snippet = result.get('body', 'No description')
+    if len(snippet) > MAX_SNIPPET_CHARS:
+        snippet = snippet[:MAX_SNIPPET_CHARS - 3] + "..."
+    return f"{index}. {title}\n   {snippet}\n   URL: {result_url(result)}"
+
+
+def select_evidence(canonical_claim: str, results: list[dict],
+                    token_budget: int = EVIDENCE_TOKEN_BUDGET) -> str:
+    """
+    Deduplicates, ranks and packs search results into at most
+    `token_budget` tokens of evidence text for the verifier.
+    """
+    unique = deduplicate(results)
+    if not unique:
+        return "No relevant results found."
+
+    passages = [result_text(r) for r in unique]
+    scores = bm25_scores(claim_term_weights(canonical_claim), passages)
+    order = np.argsort(-scores, kind="stable")
+
+    # Once something matches the claim, unmatched passages are just noise
+    if scores.max() > 0:
+        order = [i for i in order if scores[i] > 0]
+
+    packed, used = [], 0
+    for i in order:
+        block = format_passage(len(packed) + 1, unique[i])
+        cost = estimate_tokens(block)
+        if packed and used + cost > token_budget:
+            continue
+        packed.append(block)
+        used += cost
+
+    print(f"   📄 Evidence: {len(results)} results → {len(unique)} unique → {len(packed)} packed (~{used} tokens)")
+    return "\n\n".join(packed)
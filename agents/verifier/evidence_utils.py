@@ -0,0 +1,20 @@
+# evidence_utils.py
+import re
+
+STOP_WORDS = {
+    'the', 'and', 'for', 'not', 'with', 'from', 'that', 'this',
+    'said', 'says', 'say', 'was', 'are', 'has', 'have', 'had', 'been',
+}
+
+
+def tokenize(text: str) -> list[str]:
+    """Lowercase word tokens, keeping numbers like 7.2% or 13,000 intact"""
+    return re.findall(r"[a-z0-9]+(?:[.,][0-9]+)*%?", text.lower())
+
+
+def result_url(result: dict) -> str:
+    return result.get('href') or result.get('link') or ''
+
+
+def result_text(result: dict) -> str:
+    return result.get('title', '') + ' ' + result.get('body', '')
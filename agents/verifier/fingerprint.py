@@ -0,0 +1,19 @@
+# fingerprint.py
+import hashlib
+
+from .evidence_selector import canonical_url
+from .evidence_utils import result_url
+
+
+def evidence_fingerprint(results: list[dict]) -> str:
+    """
+    Fingerprint of the evidence found for a claim: the set of canonical
+    result URLs. Ranking and snippets are left out, since search engines
+    reorder results and rewrite snippets from day to day for the same pages.
+
+    `results` should come from EvidencePool.fingerprint's fixed search, not
+    from evidence_for, whose time-limited queries and early stops change
+    the result set from run to run.
+    """
+    urls = sorted({canonical_url(result_url(r)) for r in results})
+    return hashlib.sha256("\n".join(urls).encode("utf-8")).hexdigest()
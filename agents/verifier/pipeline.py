@@ -2,10 +2,14 @@ from agents.claim_extractor.pipeline import run_pipeline
 from agents.verifier.verify_all_claims import verify_unverified_claims
 from dotenv import load_dotenv
 
-def verifier_run_pipeline(text: str):
-    store = run_pipeline(text)
+def verifier_run_pipeline(text: str, deadline=None):
+    """
+    Extracts and verifies claims. With a deadline the claims finished in
+    time are returned and the rest carry a TIMED_OUT verdict.
+    """
+    store = run_pipeline(text, deadline)
 
-    verify_unverified_claims(store)
+    verify_unverified_claims(store, deadline)
     return store.all()
 
 
@@ -0,0 +1,70 @@
+# priority.py
+import math
+import re
+
+from .claim_query_builder import parse_canonical_claim
+
+# Weights of the components of a claim's verification priority
+OCCURRENCE_WEIGHT = 1.0
+CHECK_WORTHINESS_WEIGHT = 2.0
+
+# Priority gained per minute spent waiting, so old claims aren't starved
+AGE_WEIGHT_PER_MINUTE = 0.05
+
+
+def check_worthiness(canonical_claim: str) -> float:
+    """
+    How concrete (and so how checkable) a claim is, from 0 to 1.
+    Specific numbers, dates and places make a claim worth checking first.
+    """
+    slots = parse_canonical_claim(canonical_claim)
+    score = 0.0
+    if slots["subject"]:
+        score += 0.2
+    if slots["object"]:
+        score += 0.1
+        if re.search(r"\d", slots["object"]):
+            score += 0.3
+    if slots["time"]:
+        score += 0.2
+    if slots["location"]:
+        score += 0.1
+    if slots["source"]:
+        score += 0.1
+    return round(min(score, 1.0), 3)
+
+
+def claim_priority(canonical_claim: str, occurrences: int = 1) -> float:
+    """
+    Base priority of a claim: repeated claims first (log-scaled so a
+    40x repeat doesn't drown everything else), then check-worthiness.
+    """
+    return round(
+        OCCURRENCE_WEIGHT * math.log2(1 + max(occurrences, 1)) +
+        CHECK_WORTHINESS_WEIGHT * check_worthiness(canonical_claim),
+        3
+    )
+
+
+def effective_priority(base_priority: float, waited_seconds: float) -> float:
+    """Base priority plus ageing credit for time spent in the queue"""
+    return base_priority + AGE_WEIGHT_PER_MINUTE * max(waited_seconds, 0) / 60
+
+
+def queue_rank(base_priority: float, created_at) -> float:
+    """
+    Sort key for queued jobs that orders them by effective_priority at any
+    moment: effective priority at time t is queue_rank plus
+    AGE_WEIGHT_PER_MINUTE * t (in minutes), the same for every job, so it
+    can be stored once and used for ordering in SQL
+    """
+    return base_priority - AGE_WEIGHT_PER_MINUTE * created_at.timestamp() / 60
+
+
+def prioritize_claims(claims: list[dict]) -> list[dict]:
+    """Orders GlobalClaimStore claims, most prominent first"""
+    return sorted(
+        claims,
+        key=lambda c: claim_priority(c["canonical_claim"], len(c.get("occurrences", []))),
+        reverse=True
+    )
@@ -1,6 +1,7 @@
 # search_tool.py
-from duckduckgo_search import DDGS
 from dotenv import load_dotenv
+from .ddgs_pool import ddgs_pool
+from agents.singleflight import flight_key, singleflight
 import os
 import time
 import re
@@ -11,9 +12,11 @@ class SearchWrapper:
     """
     DuckDuckGo search wrapper with robust query handling and language filtering
     """
-    def __init__(self, params=None):
+    def __init__(self, params=None, pool=None):
         self.params = params or {}
         self.max_results = self.params.get('num', 10)  # Get more, filter to 5
+        # Warm DDGS sessions shared by every search in this process
+        self.pool = pool or ddgs_pool
         print("=" * 50)
         print("INFO: Using DuckDuckGo Search (Free, No API Key Required)")
         print(f"INFO: Max results per query = {self.max_results}")
@@ -210,16 +213,63 @@ class SearchWrapper:
         # At least 1 of top 3 should be relevant
         return relevant_count >= 1
 
-    def run(self, query, attempt=1, max_attempts=3):
+    def run(self, query):
         """
         Run search with automatic query optimization and fallback
         ALWAYS forces English-only results
         """
+        results = self.run_results(query)
+        if not results:
+            return "No relevant results found after trying multiple search strategies."
+        return self.format_results(results)
+
+    def run_results(self, query, deadline=None):
+        """
+        Same search strategy as run(), but returns the structured
+        result dicts (title/href/body) instead of a formatted string.
+        Identical searches already in flight are joined, not repeated
+        (for at most the time left on `deadline`).
+        """
+        return singleflight.do(
+            flight_key("search", query, self.max_results),
+            lambda: self.search_with_fallback(query),
+            deadline=deadline
+        )
+
+    def stable_results(self, query, deadline=None):
+        """
+        Results of one fixed search for `query`: all-time, US English, no
+        fallback strategies or relevance checks, so the same pages give the
+        same results from one day to the next. None when the search fails.
+        """
+        return singleflight.do(
+            flight_key("search-stable", query, self.max_results),
+            lambda: self._stable_search(query),
+            deadline=deadline
+        )
+
+    def _stable_search(self, query):
+        try:
+            with self.pool.session() as ddgs:
+                results = list(ddgs.text(
+                    query,
+                    region='us-en',
+                    safesearch='moderate',
+                    timelimit=None,
+                    max_results=self.max_results
+                ))
+        except Exception as e:
+            print(f"❌ Search error: {str(e)}")
+            return None
+        return self.filter_english_results(results)
+
+    def search_with_fallback(self, query, attempt=1, max_attempts=3):
+        """Tries each query strategy in turn until one gives relevant English results"""
         # Get search queries to try
         search_queries = self.construct_search_queries(query)
         
         if attempt > len(search_queries):
-            return "No relevant results found after trying multiple search strategies."
+            return []
         
         current_query = search_queries[attempt - 1]
         
@@ -230,7 +280,7 @@ class SearchWrapper:
         print(f"\n🔍 Attempt {attempt}/{len(search_queries)} - Searching: '{current_query}'")
         
         try:
-            with DDGS() as ddgs:
+            with self.pool.session() as ddgs:
                 # FORCE ENGLISH-ONLY configurations
                 # Using backend parameter 'l=en' equivalent through region settings
                 search_configs = [
@@ -257,39 +307,36 @@ class SearchWrapper:
                 print(f"⚠️ Zero English results found. Trying next strategy...")
                 if attempt < len(search_queries):
                     time.sleep(0.5)
-                    return self.run(query, attempt + 1, max_attempts)
+                    return self.search_with_fallback(query, attempt + 1, max_attempts)
                 else:
-                    return "Unable to find any English-language results. The topic may not have English coverage, or try rephrasing your query."
+                    return []
             
             # Check relevance of English results
             if self.check_relevance(english_results, current_query):
                 # SUCCESS: Got relevant English results
-                final_results = english_results[:5]
-                formatted = self.format_results(final_results)
-                print(f"✅ SUCCESS: {len(final_results)} relevant English results\n")
-                return formatted
+                print(f"✅ SUCCESS: {len(english_results[:5])} relevant English results\n")
+                return english_results[:5]
             
             # Got English results but not relevant - try next query
             if attempt < len(search_queries):
                 print(f"⚠️ English results found but not relevant. Trying next strategy...")
                 time.sleep(0.5)
-                return self.run(query, attempt + 1, max_attempts)
+                return self.search_with_fallback(query, attempt + 1, max_attempts)
             else:
                 # Last attempt - return what we have
                 print(f"⚠️ Returning best available English results (may not be perfectly relevant)")
-                return self.format_results(english_results[:5])
+                return english_results[:5]
                 
         except Exception as e:
-            error_msg = f"Search error: {str(e)}"
-            print(f"❌ {error_msg}")
+            print(f"❌ Search error: {str(e)}")
             
             # Try next query on error
             if attempt < len(search_queries):
                 print(f"🔄 Retrying with next strategy...")
                 time.sleep(1)
-                return self.run(query, attempt + 1, max_attempts)
+                return self.search_with_fallback(query, attempt + 1, max_attempts)
             
-            return error_msg
+            return []
     
     def format_results(self, results):
         """Format search results as string"""
@@ -315,7 +362,7 @@ class SearchWrapper:
         
         for search_query in search_queries:
             try:
-                with DDGS() as ddgs:
+                with self.pool.session() as ddgs:
                     results = list(ddgs.text(
                         search_query,
                         region='wt-wt',
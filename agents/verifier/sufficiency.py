@@ -0,0 +1,78 @@
+# sufficiency.py
+import re
+from urllib.parse import urlsplit
+
+from .claim_query_builder import parse_canonical_claim
+from .evidence_utils import STOP_WORDS, tokenize, result_url, result_text
+
+# Evidence scoring at or above this is enough to verify the claim
+SUFFICIENCY_THRESHOLD = 0.75
+
+# Relative importance of each claim slot being covered by the evidence
+SLOT_COVERAGE_WEIGHTS = {
+    "subject": 0.3,
+    "object": 0.4,
+    "time": 0.15,
+    "location": 0.15,
+}
+
+COVERAGE_SHARE = 0.7
+DIVERSITY_SHARE = 0.3
+
+# Distinct source domains needed for full diversity credit
+TARGET_DOMAINS = 3
+
+
+def slot_terms(value: str) -> list[str]:
+    return [
+        t for t in tokenize(value)
+        if t not in STOP_WORDS and (len(t) > 2 or t[0].isdigit())
+    ]
+
+
+def slot_covered(slot: str, value: str, evidence_text: str) -> float:
+    """
+    How well one slot appears in the evidence (0-1). Numbers in the
+    object must all appear; other slots need half of their terms.
+    """
+    if slot == "object":
+        numbers = re.findall(r"\d+(?:[.,]\d+)*%?", value)
+        if numbers:
+            return sum(1 for n in numbers if n in evidence_text) / len(numbers)
+
+    terms = slot_terms(value)
+    if not terms:
+        return 1.0
+    found = sum(1 for t in terms if t in evidence_text) / len(terms)
+    return min(1.0, found * 2)
+
+
+def source_diversity(results: list[dict]) -> float:
+    domains = {
+        urlsplit(result_url(r)).netloc.lower().removeprefix("www.")
+        for r in results if result_url(r)
+    }
+    return min(1.0, len(domains) / TARGET_DOMAINS)
+
+
+def sufficiency_score(canonical_claim: str, results: list[dict]) -> float:
+    """
+    Combines coverage of the claim's subject, object numbers, time and
+    location with the number of independent sources backing them.
+    """
+    if not results:
+        return 0.0
+
+    slots = parse_canonical_claim(canonical_claim)
+    evidence_text = " ".join(result_text(r).lower() for r in results)
+
+    present = {slot: w for slot, w in SLOT_COVERAGE_WEIGHTS.items() if slots[slot]}
+    if present:
+        coverage = sum(
+            w * slot_covered(slot, slots[slot], evidence_text)
+            for slot, w in present.items()
+        ) / sum(present.values())
+    else:
+        coverage = 0.0
+
+    return round(COVERAGE_SHARE * coverage + DIVERSITY_SHARE * source_diversity(results), 3)
@@ -1,19 +1,73 @@
 # verify_all_claims.py
-from .agent import verify_claim
+from .agent import gather_evidence
+from .batch_verifier import plan_batches, verify_claims_batch
+from .cascade import CASCADE_ENABLED, cascade_stats
+from .evidence_pool import EvidencePool
+from .priority import prioritize_claims
+from .search_tool import search
 from agents.claim_extractor.claim_store import GlobalClaimStore
 
 
-def verify_unverified_claims(store: GlobalClaimStore):
-    unverified = store.unverified_claims()
+def verify_unverified_claims(store: GlobalClaimStore, deadline=None):
+    """
+    Verifies every unverified claim in the store. With a deadline, claims
+    not verified before it expires are marked TIMED_OUT and the rest of
+    the store is returned as-is.
+    """
+    # Most repeated / most check-worthy claims are resolved first
+    unverified = prioritize_claims(store.unverified_claims())
     print(f"\n📋 Found {len(unverified)} unverified claims to check")
-    
+
+    # Claims about the same subject/location share one evidence search. The
+    # pool keeps each group's results for the whole run, so claims are still
+    # taken in priority order rather than group by group: a low-priority
+    # claim never waits in front of another group's top claim.
+    pool = EvidencePool(search)
+
+    items = []
     for i, claim in enumerate(unverified, 1):
         canonical = claim["canonical_claim"]
-        print(f"\n[{i}/{len(unverified)}] Verifying: {canonical}")
+        if deadline is not None and deadline.expired():
+            for later in unverified[i - 1:]:
+                store.mark_timed_out(later["canonical_claim"], "Request deadline reached before evidence search")
+            print(f"\n⏱️  Deadline reached, {len(unverified) - i + 1} claims marked TIMED_OUT")
+            break
+        print(f"\n[{i}/{len(unverified)}] Gathering evidence: {canonical}")
+        items.append((canonical, gather_evidence(canonical, pool=pool, deadline=deadline)))
+        store.record_retrieval(canonical, pool.retrieval_stats.get(canonical))
+
+    avoided = sum(s["searches_avoided"] for s in pool.retrieval_stats.values())
+    print(
+        f"\n🔎 Searches: {pool.shared_searches} shared, "
+        f"{pool.claim_searches} claim-level for {len(unverified)} claims "
+        f"({avoided} avoided by sufficient evidence)"
+    )
+    print(f"🔌 DDGS session pool: {search.pool.utilization()}")
+
+    # Several claims per verifier call, sized to the prompt token budget
+    batches = plan_batches(items)
+    print(f"🧮 Verifying {len(items)} claims in {len(batches)} LLM calls")
 
-        try:
-            result = verify_claim(canonical)
+    for n, batch in enumerate(batches, 1):
+        if deadline is not None and deadline.expired():
+            for later in batches[n - 1:]:
+                for canonical, _ in later:
+                    store.mark_timed_out(canonical)
+            print(f"\n⏱️  Deadline reached, {len(batches) - n + 1} batches marked TIMED_OUT")
+            break
 
+        print(f"\n[Batch {n}/{len(batches)}] {len(batch)} claims")
+        results = verify_claims_batch(batch, deadline)
+        for canonical, _ in batch:
+            if canonical not in results:
+                store.mark_timed_out(canonical)
+
+        for canonical, result in results.items():
+            # A call cut short by its deadline-capped timeout isn't a verdict
+            if deadline is not None and deadline.expired() and result.failed:
+                store.mark_timed_out(canonical)
+                print(f"    ⏱️  {canonical}: TIMED_OUT")
+                continue
             store.update_verification(
                 canonical_claim=canonical,
                 verdict=result.verdict,
@@ -21,14 +75,7 @@ def verify_unverified_claims(store: GlobalClaimStore):
                 reasoning=result.reasoning,
                 evidence_sources=result.evidence_sources
             )
-            print(f"    → Result: {result.verdict} (confidence: {result.confidence})")
+            print(f"    → {canonical}: {result.verdict} (confidence: {result.confidence})")
 
-        except Exception as e:
-            print(f"    ✗ Error: {str(e)}")
-            store.update_verification(
-                canonical_claim=canonical,
-                verdict="UNVERIFIABLE",
-                confidence=0.0,
-                reasoning=f"Verification failed: {str(e)}",
-                evidence_sources=[]
-            )
+    if CASCADE_ENABLED:
+        print(f"\n🪜 Verification cascade: {cascade_stats.summary()}")
@@ -1,12 +1,21 @@
 # agents/views.py
-from django.shortcuts import render
-from django.http import JsonResponse
+from django.shortcuts import get_object_or_404, redirect, render
+from django.urls import reverse
+from django.http import JsonResponse, StreamingHttpResponse
 from django.views.decorators.http import require_http_methods
 from django.views.decorators.csrf import ensure_csrf_cookie
 import json
 import traceback
 from .forms import ClaimsExtractorForm
-from agents.verifier.pipeline import verifier_run_pipeline
+from django.conf import settings
+from agents.claim_extractor.pipeline import run_pipeline
+from agents.claim_extractor.result_cache import cached_result, store_result, transcript_key
+from agents.deadline import Deadline
+from agents.verification_queue import enqueue_claims
+from agents.batch_ingestion import ingest_videos
+from agents.extraction_jobs import create_job, job_claims, job_status
+from agents.models import ExtractionJob
+from notes.services.claim_persistence import save_pipeline_claims
 
 def extract_claims(request):
     submitted_text = None
@@ -15,107 +24,21 @@ def extract_claims(request):
         form = ClaimsExtractorForm(request.POST)
         if form.is_valid():
             submitted_text = form.cleaned_data["content"]
-            claims = verifier_run_pipeline(submitted_text)
-            
-            # AUTO-SAVE CLAIMS TO NOTES DATABASE
-            try:
-                from notes.models import Claim
-                
-                saved_count = 0
-                for claim_data in claims:
-                    try:
-                        # Extract claim information
-                        # Handle different possible formats
-                        if isinstance(claim_data, dict):
-                            claim_text = claim_data.get('canonical_claim', claim_data.get('claim', claim_data.get('text', '')))
-                            
-                            # Get verification info
-                            verification = claim_data.get('verification', {})
-                            if isinstance(verification, dict):
-                                verification_status = verification.get('verdict', 'UNVERIFIABLE')
-                                confidence = verification.get('confidence', 0.0)
-                                reasoning = verification.get('reasoning', '')
-                                sources = verification.get('evidence_sources', [])
-                            else:
-                                verification_status = claim_data.get('verification', claim_data.get('status', 'UNVERIFIABLE'))
-                                confidence = claim_data.get('confidence', 0.0)
-                                reasoning = claim_data.get('reasoning', '')
-                                sources = claim_data.get('sources', [])
-                        elif isinstance(claim_data, str):
-                            # If it's just a string, use it as the claim
-                            claim_text = claim_data
-                            verification_status = 'UNVERIFIABLE'
-                            confidence = 0.0
-                            reasoning = ''
-                            sources = []
-                        else:
-                            continue
-                        
-                        # Skip empty claims
-                        if not claim_text or claim_text.strip() == '':
-                            continue
-                        
-                        # DEBUG: Temporarily save ALL claims to debug the issue
-                        # TODO: Change back to filtering only VERIFIED when working properly
-                        # if verification_status not in ['VERIFIED', 'TRUE', 'PARTIALLY_VERIFIED']:
-                        #     print(f"   ⏭️  Skipping (not verified): {claim_text[:60]}... ({verification_status})")
-                        #     continue
-                        
-                        # Map verification status to our status choices
-                        status_mapping = {
-                            'VERIFIED': 'verified',
-                            'TRUE': 'verified',
-                            'PARTIALLY_VERIFIED': 'verified',
-                            'FALSE': 'false',
-                            'MISLEADING': 'misleading',
-                            'UNVERIFIABLE': 'pending',
-                            'PENDING': 'pending',
-                        }
-                        
-                        db_status = status_mapping.get(
-                            verification_status.upper() if isinstance(verification_status, str) else 'PENDING',
-                            'pending'
-                        )
-                        
-                        # Build verification notes
-                        verification_notes_parts = []
-                        if reasoning:
-                            verification_notes_parts.append(f"Reasoning: {reasoning}")
-                        if confidence:
-                            verification_notes_parts.append(f"Confidence: {confidence:.0%}")
-                        if sources:
-                            verification_notes_parts.append(f"Sources: {', '.join(sources[:3])}")
-                        
-                        verification_notes = '\n'.join(verification_notes_parts)
-                        
-                        # Create title from first 100 chars of claim
-                        title = claim_text[:100] + '...' if len(claim_text) > 100 else claim_text
-                        
-                        # Save to database
-                        Claim.objects.create(
-                            title=title,
-                            content=claim_text,
-                            verification_notes=verification_notes,
-                            status=db_status,
-                            source_type='text',
-                            created_by=request.user if request.user.is_authenticated else None
-                        )
-                        saved_count += 1
-                        print(f"   ✅ Saved: {claim_text[:60]}... (confidence: {confidence:.0%})")
-                        
-                    except Exception as e:
-                        print(f"Error saving individual claim: {str(e)}")
-                        continue
-                
-                print(f"[Auto-save] Successfully saved {saved_count} VERIFIED claims to Notes database")
-                
-            except ImportError:
-                print("[Auto-save] Notes app not available - claims not saved")
-            except Exception as e:
-                print(f"[Auto-save] Error saving claims: {str(e)}")
-                traceback.print_exc()
+            # Extraction runs in the extraction worker; the job page polls it
+            job = create_job(
+                submitted_text,
+                source_type='text',
+                user=request.user if request.user.is_authenticated else None,
+                force_refresh=form.cleaned_data["force_refresh"]
+            )
 
-            return render(request, "claim_list.html", {'claims': claims})
+            if wants_json(request):
+                return JsonResponse({
+                    'success': True,
+                    'job_id': str(job.id),
+                    'status_url': reverse('extraction_job', args=[job.id]),
+                }, status=202)
+            return redirect('extraction_job', job_id=job.id)
     else:
         form = ClaimsExtractorForm()
 
@@ -124,6 +47,31 @@ def extract_claims(request):
         "submitted_text": submitted_text
     })
 
+
+def wants_json(request):
+    return request.GET.get('format') == 'json' or 'application/json' in request.headers.get('Accept', '')
+
+
+def extraction_job_view(request, job_id):
+    """
+    Progress of an extraction job. JSON (for polling) when asked for it,
+    otherwise the results page once claims are extracted, or a progress
+    page that polls until then.
+    """
+    job = get_object_or_404(ExtractionJob, id=job_id)
+
+    if wants_json(request):
+        return JsonResponse(job_status(job))
+
+    if job.status == 'done':
+        return render(request, "claim_list.html", {
+            'claims': job_claims(job),
+            'timed_out_count': job.progress.get('timed_out_sentences', 0),
+        })
+
+    return render(request, "extraction_job.html", {'job': job})
+
+
 @ensure_csrf_cookie
 def yt_analyzer(request):
     """Render the YouTube analyzer page"""
@@ -132,6 +80,7 @@ def yt_analyzer(request):
 @require_http_methods(["POST"])
 def load_transcript_view(request):
     """Load transcript from YouTube URL"""
+    deadline = Deadline(settings.REQUEST_DEADLINE_SECONDS)
     try:
         # Parse JSON body
         try:
@@ -162,105 +111,41 @@ def load_transcript_view(request):
             print("[View] Extractor module imported successfully")
             print("[View] Starting transcript extraction...")
             
-            transcript_docs = load_transcript(url)
+            force_refresh = bool(data.get('force_refresh'))
+            transcript_docs = load_transcript(url, force_refresh=force_refresh)
             
             if transcript_docs and len(transcript_docs) > 0:
                 transcript_text = transcript_docs[0].page_content
                 print(f"[View] Success! Transcript length: {len(transcript_text)} characters")
                 print(f"[View] Preview: {transcript_text[:100]}...")
                 
-                # Extract and save claims from transcript
+                # Extract and save claims from transcript; verification is queued
+                queued_count = 0
+                timed_out_count = 0
+                claims_cached = False
                 try:
-                    claims = verifier_run_pipeline(transcript_text)
-                    
-                    # AUTO-SAVE CLAIMS TO NOTES DATABASE
-                    from notes.models import Claim
+                    # Same video (and caption language) as before: reuse its claims
+                    cache_key = transcript_key(transcript_docs[0])
+                    cached = None if force_refresh else cached_result(cache_key)
+                    if cached:
+                        claims = cached.claims
+                        timed_out_count = cached.timed_out_sentences
+                        claims_cached = True
+                    else:
+                        store = run_pipeline(transcript_text, deadline, document=transcript_docs[0])
+                        claims = store.all()
+                        timed_out_count = len(store.timed_out_sentences)
+                        store_result(cache_key, 'youtube', claims, timed_out_count)
                     
-                    saved_count = 0
-                    for claim_data in claims:
-                        try:
-                            # Extract claim information
-                            if isinstance(claim_data, dict):
-                                claim_text = claim_data.get('canonical_claim', claim_data.get('claim', claim_data.get('text', '')))
-                                
-                                # Get verification info
-                                verification = claim_data.get('verification', {})
-                                if isinstance(verification, dict):
-                                    verification_status = verification.get('verdict', 'UNVERIFIABLE')
-                                    confidence = verification.get('confidence', 0.0)
-                                    reasoning = verification.get('reasoning', '')
-                                    sources = verification.get('evidence_sources', [])
-                                else:
-                                    verification_status = claim_data.get('verification', 'UNVERIFIABLE')
-                                    confidence = claim_data.get('confidence', 0.0)
-                                    reasoning = claim_data.get('reasoning', '')
-                                    sources = claim_data.get('sources', [])
-                            elif isinstance(claim_data, str):
-                                claim_text = claim_data
-                                verification_status = 'UNVERIFIABLE'
-                                confidence = 0.0
-                                reasoning = ''
-                                sources = []
-                            else:
-                                continue
-                            
-                            if not claim_text or claim_text.strip() == '':
-                                continue
-                            
-                            # DEBUG: Temporarily save ALL claims
-                            # TODO: Change back to filtering when working properly
-                            # if verification_status not in ['VERIFIED', 'TRUE', 'PARTIALLY_VERIFIED']:
-                            #     print(f"   ⏭️  Skipping (not verified): {claim_text[:60]}... ({verification_status})")
-                            #     continue
-                            
-                            # Map status
-                            status_mapping = {
-                                'VERIFIED': 'verified',
-                                'TRUE': 'verified',
-                                'PARTIALLY_VERIFIED': 'verified',
-                                'FALSE': 'false',
-                                'MISLEADING': 'misleading',
-                                'UNVERIFIABLE': 'pending',
-                                'PENDING': 'pending',
-                            }
-                            
-                            db_status = status_mapping.get(
-                                verification_status.upper() if isinstance(verification_status, str) else 'PENDING',
-                                'pending'
-                            )
-                            
-                            # Build verification notes
-                            verification_notes_parts = []
-                            if reasoning:
-                                verification_notes_parts.append(f"Reasoning: {reasoning}")
-                            if confidence:
-                                verification_notes_parts.append(f"Confidence: {confidence:.0%}")
-                            if sources:
-                                verification_notes_parts.append(f"Sources: {', '.join(sources[:3])}")
-                            
-                            verification_notes = '\n'.join(verification_notes_parts)
-                            
-                            # Create title
-                            title = claim_text[:100] + '...' if len(claim_text) > 100 else claim_text
-                            
-                            # Save to database
-                            Claim.objects.create(
-                                title=title,
-                                content=claim_text,
-                                source_url=url,
-                                source_type='youtube',
-                                verification_notes=verification_notes,
-                                status=db_status,
-                                created_by=request.user if request.user.is_authenticated else None
-                            )
-                            saved_count += 1
-                            print(f"   ✅ Saved: {claim_text[:60]}... (confidence: {confidence:.0%})")
-                            
-                        except Exception as e:
-                            print(f"[YT Auto-save] Error saving individual claim: {str(e)}")
-                            continue
-                    
-                    print(f"[YT Auto-save] Successfully saved {saved_count} VERIFIED claims from YouTube transcript")
+                    # AUTO-SAVE CLAIMS TO NOTES DATABASE (one bulk insert)
+                    saved_claims = save_pipeline_claims(
+                        claims,
+                        source_type='youtube',
+                        source_url=url,
+                        user=request.user if request.user.is_authenticated else None
+                    )
+                    print(f"[YT Auto-save] Successfully saved {len(saved_claims)} claims from YouTube transcript")
+                    queued_count = enqueue_claims(saved_claims)
                     
                 except Exception as e:
                     print(f"[YT Auto-save] Error in claim extraction/saving: {str(e)}")
@@ -268,7 +153,11 @@ def load_transcript_view(request):
                 
                 return JsonResponse({
                     'success': True,
-                    'transcript': transcript_text
+                    'transcript': transcript_text,
+                    'cached': transcript_docs[0].metadata.get('cached', False),
+                    'claims_cached': claims_cached,
+                    'queued_claims': queued_count,
+                    'timed_out_sentences': timed_out_count
                 })
             else:
                 print("[View] No transcript documents returned")
@@ -317,4 +206,36 @@ def load_transcript_view(request):
         return JsonResponse({
             'success': False,
             'error': f'Server error: {str(e)}'
-        }, status=500)
\ No newline at end of file
+        }, status=500)
+
+
+@require_http_methods(["POST"])
+def batch_ingest_view(request):
+    """
+    Ingest a playlist, channel or list of videos; streams one server-sent
+    event per video step and a final summary.
+    Body: {"urls": [...], "force_refresh": false}
+    """
+    try:
+        data = json.loads(request.body)
+    except json.JSONDecodeError:
+        return JsonResponse({'success': False, 'error': 'Invalid JSON in request body'}, status=400)
+
+    urls = data.get('urls') or ([data['url']] if data.get('url') else [])
+    if not urls:
+        return JsonResponse({'success': False, 'error': 'No URLs provided'}, status=400)
+
+    user = request.user if request.user.is_authenticated else None
+
+    def event_stream():
+        try:
+            for event in ingest_videos(urls, force_refresh=bool(data.get('force_refresh')), user=user):
+                yield f"data: {json.dumps(event)}\n\n"
+        except Exception as e:
+            traceback.print_exc()
+            yield f"data: {json.dumps({'event': 'error', 'stage': 'batch', 'error': str(e)})}\n\n"
+
+    response = StreamingHttpResponse(event_stream(), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
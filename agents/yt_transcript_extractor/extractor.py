@@ -6,6 +6,8 @@ FINAL WORKING VERSION - Uses instance methods
 
 import re
 
+from .transcript_document import TranscriptDocument
+
 
 def extract_video_id(url):
     """Extract video ID from various YouTube URL formats"""
@@ -23,26 +25,125 @@ def extract_video_id(url):
     return None
 
 
-def load_transcript(url):
+def build_document(segments, metadata):
+    document = TranscriptDocument(segments, metadata)
+    print(f"[Extractor] ✓ Combined text: {len(document.page_content)} characters ({len(document)} timed segments)")
+    print(f"[Extractor] Preview: {document.page_content[:150]}...")
+    return document
+
+
+def fetch_transcript(video_id, before_request=None):
+    """
+    Fetches a transcript from YouTube: English if available, otherwise the
+    first one listed. Returns (language_code, language, is_generated, segments).
+    `before_request()` is called before each of the two requests to YouTube
+    (listing the transcripts, then fetching one), e.g. to rate-limit them.
+    """
+    from youtube_transcript_api import YouTubeTranscriptApi
+
+    # CRITICAL: Create an instance first!
+    # The API uses INSTANCE methods, not static methods
+    print("[Extractor] Creating YouTubeTranscriptApi instance...")
+    ytt_api = YouTubeTranscriptApi()
+    print("[Extractor] ✓ Instance created")
+    
+    # Now call list() on the instance
+    print("[Extractor] Calling api.list()...")
+    if before_request:
+        before_request()
+    transcript_list = ytt_api.list(video_id)
+    
+    print(f"[Extractor] ✓ Got TranscriptList: {type(transcript_list)}")
+    
+    # One pass over the available transcripts: first English one wins,
+    # otherwise fall back to the first one listed
+    selected_transcript = None
+    first_transcript = None
+    available_langs = []
+    
+    print("[Extractor] Available transcripts:")
+    for transcript in transcript_list:
+        try:
+            lang_code = transcript.language_code
+            lang_name = transcript.language
+            is_generated = transcript.is_generated
+            
+            available_langs.append(f"{lang_name} ({lang_code})")
+            print(f"[Extractor]   - {lang_name} ({lang_code}) {'[auto]' if is_generated else '[manual]'}")
+            
+            if first_transcript is None:
+                first_transcript = transcript
+            
+            # Select English transcript if available
+            if selected_transcript is None:
+                if 'en' in lang_code.lower() or 'english' in lang_name.lower():
+                    selected_transcript = transcript
+                    print(f"[Extractor] ✓ Selected English transcript")
+            
+        except Exception as e:
+            print(f"[Extractor] Warning: Error reading transcript: {e}")
+            continue
+    
+    # If no English, use first available
+    if selected_transcript is None and first_transcript is not None:
+        print("[Extractor] No English found, using first available...")
+        selected_transcript = first_transcript
+    
+    if selected_transcript is None:
+        error_msg = f"No transcripts available. Found: {', '.join(available_langs) if available_langs else 'None'}"
+        print(f"[Extractor] ✗ {error_msg}")
+        raise Exception(error_msg)
+    
+    # Fetch the transcript data
+    print("[Extractor] Fetching transcript data...")
+    if before_request:
+        before_request()
+    fetched_transcript = selected_transcript.fetch()
+    
+    print(f"[Extractor] ✓ Got FetchedTranscript: {type(fetched_transcript)}")
+    
+    # Convert to raw data (list of dicts)
+    print("[Extractor] Converting to raw data...")
+    transcript_data = fetched_transcript.to_raw_data()
+    
+    if not transcript_data:
+        error_msg = "Transcript data is empty"
+        print(f"[Extractor] ✗ {error_msg}")
+        raise Exception(error_msg)
+    
+    print(f"[Extractor] ✓ Got {len(transcript_data)} segments")
+    return (
+        selected_transcript.language_code,
+        selected_transcript.language,
+        selected_transcript.is_generated,
+        transcript_data,
+    )
+
+
+def load_transcript(url, force_refresh=False, before_request=None):
     """
     Load transcript from YouTube video
     
+    Transcripts are cached per video and language (see transcript_cache.py):
+    a fresh cached copy is returned without contacting YouTube, and a stale
+    one is served if refreshing it fails.
+    
     Args:
         url (str): YouTube video URL or video ID
+        force_refresh (bool): Skip the cache and refetch from YouTube
+        before_request (callable): Called before each request to YouTube
         
     Returns:
-        list: List containing a single Document-like object with transcript text
+        list: List containing a single TranscriptDocument (transcript text
+        plus a character offset -> video timestamp index)
     """
+    from .transcript_cache import (
+        cache_available, decompress_segments, is_fresh, preferred_entry,
+        record_hit, store_transcript,
+    )
+
     print(f"[Extractor] Starting transcript load for URL: {url}")
     
-    try:
-        from youtube_transcript_api import YouTubeTranscriptApi
-        print("[Extractor] ✓ YouTubeTranscriptApi imported")
-    except ImportError:
-        error_msg = "youtube-transcript-api not installed. Run: pip install youtube-transcript-api"
-        print(f"[Extractor] ✗ {error_msg}")
-        raise Exception(error_msg)
-    
     # Extract video ID
     video_id = extract_video_id(url)
     if not video_id:
@@ -52,85 +153,34 @@ def load_transcript(url):
     
     print(f"[Extractor] Video ID: {video_id}")
     
+    use_cache = cache_available()
+    cached = preferred_entry(video_id) if use_cache else None
+    
+    if cached is not None and is_fresh(cached) and not force_refresh:
+        print(f"[Extractor] ✓ Cache hit: {video_id} ({cached.language_code}), fetched {cached.fetched_at:%Y-%m-%d %H:%M}")
+        record_hit(cached)
+        return [build_document(decompress_segments(cached.segments), {
+            'video_id': video_id, 'language_code': cached.language_code, 'cached': True,
+        })]
+    
     try:
-        # CRITICAL: Create an instance first!
-        # The API uses INSTANCE methods, not static methods
-        print("[Extractor] Creating YouTubeTranscriptApi instance...")
-        ytt_api = YouTubeTranscriptApi()
-        print("[Extractor] ✓ Instance created")
-        
-        # Now call list() on the instance
-        print("[Extractor] Calling api.list()...")
-        transcript_list = ytt_api.list(video_id)
-        
-        print(f"[Extractor] ✓ Got TranscriptList: {type(transcript_list)}")
-        
-        # Iterate through available transcripts
-        selected_transcript = None
-        available_langs = []
-        
-        print("[Extractor] Available transcripts:")
-        for transcript in transcript_list:
-            try:
-                lang_code = transcript.language_code
-                lang_name = transcript.language
-                is_generated = transcript.is_generated
-                
-                available_langs.append(f"{lang_name} ({lang_code})")
-                print(f"[Extractor]   - {lang_name} ({lang_code}) {'[auto]' if is_generated else '[manual]'}")
-                
-                # Select English transcript if available
-                if selected_transcript is None:
-                    if 'en' in lang_code.lower() or 'english' in lang_name.lower():
-                        selected_transcript = transcript
-                        print(f"[Extractor] ✓ Selected English transcript")
-                
-            except Exception as e:
-                print(f"[Extractor] Warning: Error reading transcript: {e}")
-                continue
-        
-        # If no English, use first available
-        if selected_transcript is None and available_langs:
-            print("[Extractor] No English found, using first available...")
-            for transcript in transcript_list:
-                selected_transcript = transcript
-                break
-        
-        if selected_transcript is None:
-            error_msg = f"No transcripts available. Found: {', '.join(available_langs) if available_langs else 'None'}"
-            print(f"[Extractor] ✗ {error_msg}")
-            raise Exception(error_msg)
-        
-        # Fetch the transcript data
-        print("[Extractor] Fetching transcript data...")
-        fetched_transcript = selected_transcript.fetch()
-        
-        print(f"[Extractor] ✓ Got FetchedTranscript: {type(fetched_transcript)}")
-        
-        # Convert to raw data (list of dicts)
-        print("[Extractor] Converting to raw data...")
-        transcript_data = fetched_transcript.to_raw_data()
-        
-        if not transcript_data:
-            error_msg = "Transcript data is empty"
-            print(f"[Extractor] ✗ {error_msg}")
-            raise Exception(error_msg)
-        
-        print(f"[Extractor] ✓ Got {len(transcript_data)} segments")
-        
-        # Combine text
-        full_text = " ".join([entry['text'] for entry in transcript_data])
-        
-        print(f"[Extractor] ✓ Combined text: {len(full_text)} characters")
-        print(f"[Extractor] Preview: {full_text[:150]}...")
+        from youtube_transcript_api import YouTubeTranscriptApi
+        print("[Extractor] ✓ YouTubeTranscriptApi imported")
+    except ImportError:
+        error_msg = "youtube-transcript-api not installed. Run: pip install youtube-transcript-api"
+        print(f"[Extractor] ✗ {error_msg}")
+        raise Exception(error_msg)
+    
+    try:
+        language_code, language, is_generated, transcript_data = fetch_transcript(video_id, before_request)
         
-        # Create Document-like object
-        class SimpleDocument:
-            def __init__(self, content):
-                self.page_content = content
+        if use_cache:
+            store_transcript(video_id, language_code, language, is_generated, transcript_data)
         
         print(f"[Extractor] ✓ SUCCESS! Transcript loaded")
-        return [SimpleDocument(full_text)]
+        return [build_document(transcript_data, {
+            'video_id': video_id, 'language_code': language_code, 'cached': False,
+        })]
         
     except ValueError as e:
         raise Exception(str(e))
@@ -149,6 +199,13 @@ def load_transcript(url):
         
         print(f"[Extractor] ✗ Error: {error_msg}")
         
+        # Refresh failed: an expired copy beats no transcript at all
+        if cached is not None:
+            print(f"[Extractor] ⚠️ Serving stale cached transcript for {video_id}")
+            return [build_document(decompress_segments(cached.segments), {
+                'video_id': video_id, 'language_code': cached.language_code, 'cached': True, 'stale': True,
+            })]
+        
         import traceback
         print("[Extractor] Full traceback:")
         traceback.print_exc()
@@ -0,0 +1,98 @@
+# agents/yt_transcript_extractor/transcript_cache.py
+"""
+Persistent cache of fetched YouTube transcripts, keyed by video id and
+language code (agents.models.TranscriptCache).
+
+Fresh entries are served without contacting YouTube. Expired entries are
+refreshed; if the refresh fails (rate limited, network error) the stale
+copy is served instead of an error.
+"""
+import hashlib
+import json
+import zlib
+from datetime import timedelta
+
+from django.apps import apps
+from django.conf import settings
+from django.db.models import F
+from django.utils import timezone
+
+COMPRESSION_LEVEL = 6
+
+
+def cache_available() -> bool:
+    """False when running outside Django (e.g. the extractor's self-test)"""
+    return apps.ready
+
+
+def compress_segments(segments: list[dict]) -> bytes:
+    raw = json.dumps(segments, ensure_ascii=False, separators=(",", ":"))
+    return zlib.compress(raw.encode("utf-8"), COMPRESSION_LEVEL)
+
+
+def decompress_segments(blob) -> list[dict]:
+    return json.loads(zlib.decompress(bytes(blob)).decode("utf-8"))
+
+
+def segments_hash(segments: list[dict]) -> str:
+    raw = json.dumps(segments, ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def preferred_entry(video_id: str):
+    """
+    The cached transcript load_transcript would pick for this video:
+    English if we have it, otherwise the first one stored.
+    """
+    from agents.models import TranscriptCache
+
+    entries = list(TranscriptCache.objects.filter(video_id=video_id).order_by('id'))
+    for entry in entries:
+        if 'en' in entry.language_code.lower() or 'english' in entry.language.lower():
+            return entry
+    return entries[0] if entries else None
+
+
+def is_fresh(entry) -> bool:
+    return entry.expires_at > timezone.now()
+
+
+def record_hit(entry):
+    type(entry).objects.filter(id=entry.id).update(hits=F('hits') + 1)
+
+
+def store_transcript(video_id: str, language_code: str, language: str,
+                     is_generated: bool, segments: list[dict]):
+    """
+    Saves freshly fetched segments. If they match what's cached, only the
+    expiry moves forward.
+    """
+    from agents.models import TranscriptCache
+
+    now = timezone.now()
+    expires_at = now + timedelta(hours=settings.TRANSCRIPT_CACHE_TTL_HOURS)
+    content_hash = segments_hash(segments)
+
+    unchanged = TranscriptCache.objects.filter(
+        video_id=video_id, language_code=language_code, content_hash=content_hash
+    ).update(fetched_at=now, expires_at=expires_at)
+    if unchanged:
+        print(f"[Transcript cache] {video_id} ({language_code}) unchanged, expiry extended")
+        return
+
+    blob = compress_segments(segments)
+    TranscriptCache.objects.update_or_create(
+        video_id=video_id,
+        language_code=language_code,
+        defaults={
+            'language': language,
+            'is_generated': is_generated,
+            'segments': blob,
+            'segment_count': len(segments),
+            'content_hash': content_hash,
+            'fetched_at': now,
+            'expires_at': expires_at,
+        }
+    )
+    print(f"[Transcript cache] Stored {video_id} ({language_code}): "
+          f"{len(segments)} segments, {len(blob)} bytes compressed")
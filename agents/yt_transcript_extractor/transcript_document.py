@@ -0,0 +1,82 @@
+# agents/yt_transcript_extractor/transcript_document.py
+"""
+Transcript text that remembers where each caption came from in the video.
+
+The captions are joined into `page_content` as before; alongside it we
+keep three NumPy arrays (caption start offset in the text, start time,
+duration). Mapping a character offset back to a timestamp is a binary
+search (bisect) over the offsets, so sentences and claims can be tagged
+with video timestamps without rescanning the transcript.
+"""
+import numpy as np
+
+YOUTUBE_WATCH_URL = "https://www.youtube.com/watch?v={video_id}&t={seconds}s"
+
+
+def format_timestamp(seconds: float) -> str:
+    """90.5 -> '1:30', 3725 -> '1:02:05'"""
+    seconds = int(seconds)
+    hours, rest = divmod(seconds, 3600)
+    minutes, secs = divmod(rest, 60)
+    if hours:
+        return f"{hours}:{minutes:02d}:{secs:02d}"
+    return f"{minutes}:{secs:02d}"
+
+
+class TranscriptDocument:
+    """Document-like object (page_content + metadata) with a timestamp index"""
+
+    def __init__(self, segments: list[dict], metadata: dict = None):
+        self.metadata = metadata or {}
+        self.video_id = self.metadata.get("video_id")
+
+        texts = [segment["text"] for segment in segments]
+        self.page_content = " ".join(texts)
+
+        # Offset of each caption in page_content (+1 for the joining space)
+        lengths = np.fromiter((len(t) + 1 for t in texts), dtype=np.int64, count=len(texts))
+        self.offsets = np.concatenate(([0], np.cumsum(lengths)[:-1])) if len(texts) else lengths
+        self.starts = np.array([float(s.get("start", 0.0)) for s in segments], dtype=np.float64)
+        self.durations = np.array([float(s.get("duration", 0.0)) for s in segments], dtype=np.float64)
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def segment_index(self, char_offsets):
+        """Index of the caption containing each character offset"""
+        index = np.searchsorted(self.offsets, char_offsets, side="right") - 1
+        return np.clip(index, 0, max(len(self.offsets) - 1, 0))
+
+    def time_range(self, char_start: int, char_end: int) -> tuple[float, float]:
+        """Video time span (seconds) covered by page_content[char_start:char_end]"""
+        first, last = self.segment_index([char_start, max(char_end - 1, char_start)])
+        return float(self.starts[first]), float(self.starts[last] + self.durations[last])
+
+    def deep_link(self, seconds: float) -> str | None:
+        if not self.video_id:
+            return None
+        return YOUTUBE_WATCH_URL.format(video_id=self.video_id, seconds=int(seconds))
+
+    def annotate_sentences(self, sentences: list[dict]) -> list[dict]:
+        """
+        Adds start_time/end_time (seconds), a readable timestamp and a deep
+        link to sentence records from sentence_segmentation().
+        """
+        if not len(self):
+            return sentences
+
+        cursor = 0
+        for sentence in sentences:
+            # Segmentation offsets can drift (stripped whitespace, merged
+            # fragments), so re-anchor on the sentence's own text first
+            found = self.page_content.find(sentence["text"][:40], cursor)
+            char_start = found if found >= 0 else sentence["char_start"]
+            char_end = char_start + len(sentence["text"])
+            cursor = max(cursor, char_start)
+
+            start_time, end_time = self.time_range(char_start, char_end)
+            sentence["start_time"] = round(start_time, 2)
+            sentence["end_time"] = round(end_time, 2)
+            sentence["timestamp"] = format_timestamp(start_time)
+            sentence["timestamp_url"] = self.deep_link(start_time)
+        return sentences
@@ -3,14 +3,16 @@ Hybrid analyzer with API fallback to rule-based analysis
 """
 
 import os
-import re
+import time
 from typing import Dict, List, TypedDict
 from pydantic import BaseModel, Field
 import json
 
+from .rule_engine import ScanResult, rule_engine
+
 # Try to import LangChain, but continue if not available
 try:
-    from langchain_groq import ChatGroq
+    from agents.llm_pool import LLMPool, pool_members_config
     from langchain_core.prompts import ChatPromptTemplate
     from langgraph.graph import StateGraph, END
     LANGCHAIN_AVAILABLE = True
@@ -79,15 +81,22 @@ class AnalysisState(TypedDict):
 class RuleBasedAnalyzer:
     """Rule-based analyzer as fallback when API is unavailable"""
     
+    def __init__(self, single_pass: bool = True):
+        # single_pass=False scans once per rule (see analyzer.rule_engine)
+        self.single_pass = single_pass
+    
+    def _scan(self, text: str, group: str) -> ScanResult:
+        if self.single_pass:
+            return rule_engine.scan(text)
+        return rule_engine.scan_reference(text, (group,))
+    
     def extract_named_sources(self, text: str) -> List[Dict]:
         """Extract named sources using regex patterns"""
         sources = []
+        scan = self._scan(text, 'named')
         
         # Pattern 1: "Name, Title, said/stated"
-        pattern1 = r'([A-Z][a-z]+ [A-Z][a-z]+(?:\s+[A-Z][a-z]+)?),\s*([^,]+?),\s*(?:said|stated|told|explained)'
-        matches1 = re.finditer(pattern1, text)
-        
-        for match in matches1:
+        for match in scan.quoted_sources[:10]:
             name = match.group(1).strip()
             title = match.group(2).strip()
             # Get surrounding context
@@ -104,12 +113,13 @@ class RuleBasedAnalyzer:
             })
         
         # Pattern 2: "According to Name" or "Name said"
-        pattern2 = r'(?:according to|said)\s+([A-Z][a-z]+ [A-Z][a-z]+(?:\s+[A-Z][a-z]+)?)'
-        matches2 = re.finditer(pattern2, text, re.IGNORECASE)
-        
-        for match in matches2:
+        names = {s['name'] for s in sources}
+        for match in scan.attributed_sources:
+            if len(sources) >= 10:
+                break
             name = match.group(1).strip()
-            if not any(s['name'] == name for s in sources):
+            if name not in names:
+                names.add(name)
                 start = max(0, match.start() - 30)
                 end = min(len(text), match.end() + 100)
                 context = text[start:end].strip()
@@ -145,32 +155,17 @@ class RuleBasedAnalyzer:
         """Detect anonymous attribution phrases"""
         phrases = []
         
-        # Common anonymous patterns
-        patterns = [
-            (r'sources?\s+(?:say|said|claim|told|familiar)', 8),
-            (r'officials?\s+(?:say|said|claim|told)', 7),
-            (r'according to reports?', 9),
-            (r'it is (?:believed|understood|reported)', 8),
-            (r'(?:people|insiders?)\s+familiar with', 9),
-            (r'allegedly', 7),
-            (r'reportedly', 7),
-            (r'anonymous\s+(?:source|official)', 10),
-            (r'unnamed\s+(?:source|official)', 9),
-            (r'experts?\s+(?:say|believe|suggest)', 5),
-        ]
-        
-        for pattern, vagueness in patterns:
-            matches = re.finditer(pattern, text, re.IGNORECASE)
-            for match in matches:
-                start = max(0, match.start() - 50)
-                end = min(len(text), match.end() + 100)
-                context = text[start:end].strip()
-                
-                phrases.append({
-                    "phrase": match.group(0),
-                    "context": context[:200],
-                    "vagueness_score": vagueness
-                })
+        # Common anonymous patterns (ANONYMOUS_RULES), in rule order
+        for vagueness, match in self._scan(text, 'anonymous').anonymous[:15]:
+            start = max(0, match.start() - 50)
+            end = min(len(text), match.end() + 100)
+            context = text[start:end].strip()
+            
+            phrases.append({
+                "phrase": match.group(0),
+                "context": context[:200],
+                "vagueness_score": vagueness
+            })
         
         return phrases[:15]  # Limit to top 15
     
@@ -179,16 +174,14 @@ class RuleBasedAnalyzer:
         bias_list = []
         
         # Check for loaded language
-        loaded_words = ['shocking', 'outrageous', 'devastating', 'incredible', 'unbelievable', 'stunning']
-        for word in loaded_words:
-            if re.search(rf'\b{word}\b', text, re.IGNORECASE):
-                bias_list.append({
-                    "bias_type": "Language Bias",
-                    "severity": "MEDIUM",
-                    "evidence": f"Use of loaded word: '{word}'",
-                    "context": "Throughout article"
-                })
-                break
+        word = self._scan(text, 'loaded').loaded_word
+        if word:
+            bias_list.append({
+                "bias_type": "Language Bias",
+                "severity": "MEDIUM",
+                "evidence": f"Use of loaded word: '{word}'",
+                "context": "Throughout article"
+            })
         
         # Check for one-sided sourcing
         if len(named_sources) > 0:
@@ -253,37 +246,77 @@ class RuleBasedAnalyzer:
 # ADVANCED ANALYZER WITH API FALLBACK
 # ============================================
 
+# Bump when analysis logic or scoring changes; stored articles analyzed by
+# another version are re-analyzed
+ANALYZER_VERSION = "1"
+
 class AdvancedSourceAnalyzer:
     """Advanced analyzer that tries API first, falls back to rules"""
     
     def __init__(self, api_key: str = None):
         self.api_key = api_key or os.getenv('GROQ_API_KEY')
-        self.use_api = LANGCHAIN_AVAILABLE and self.api_key
+        # An explicit key pins the analyzer to it; otherwise use every
+        # configured key/provider (GROQ_API_KEYS, LLM_POOL_MEMBERS)
+        self.pool_members = (
+            [{"provider": "groq", "api_key": api_key}] if api_key
+            else pool_members_config() if LANGCHAIN_AVAILABLE else []
+        )
+        self.use_api = LANGCHAIN_AVAILABLE and bool(self.pool_members)
         self.fallback = RuleBasedAnalyzer()
         
         if self.use_api:
             try:
-                self.llm_analytical = ChatGroq(
-                    api_key=self.api_key,
+                self.llm_analytical = LLMPool(
                     model="llama-3.3-70b-versatile",
+                    members=self.pool_members,
                     temperature=0.0,
                     max_tokens=4000
                 )
-                print("✓ Using Groq API for analysis")
+                print(f"✓ Using Groq API for analysis ({len(self.pool_members)} keys)")
             except Exception as e:
                 print(f"✗ Failed to initialize Groq API: {e}")
                 self.use_api = False
         else:
             print("✓ Using rule-based fallback analysis")
     
-    def analyze_article(self, article_text: str, metadata: Dict = None) -> Dict:
-        """Run complete analysis"""
+    @property
+    def version(self) -> str:
+        """Analyzer version plus mode; API and rule-based results differ"""
+        return f"{ANALYZER_VERSION}-{'api' if self.use_api else 'rules'}"
+    
+    def analyze_article(self, article_text: str, metadata: Dict = None, progress=None) -> Dict:
+        """
+        Run complete analysis. `progress(stage, message, **details)` is
+        called as each stage finishes (see iter_analysis).
+        """
+        for stage, message, details in self.iter_analysis(article_text, metadata):
+            if stage == 'complete':
+                return details['results']
+            if progress:
+                progress(stage, message, **details)
+    
+    def iter_analysis(self, article_text: str, metadata: Dict = None):
+        """
+        Run complete analysis stage by stage, yielding (stage, message,
+        details) when each stage finishes: sources, anonymous, bias,
+        red_flags, metrics, recommendations. details has the stage's
+        elapsed_ms and its counts. The last event is ('complete', message,
+        {'results': <analysis dict>, 'elapsed_ms': <total>}).
+        """
         
         print(f"\n{'='*60}")
         print(f"Starting analysis... (API: {self.use_api})")
         print(f"{'='*60}\n")
         
+        # Time spent in each stage, not counting the caller's work between events
+        stage_ms = []
+        
+        def finished(stage, started, message, **counts):
+            stage_ms.append((time.perf_counter() - started) * 1000)
+            return stage, message, {'elapsed_ms': round(stage_ms[-1], 1), **counts}
+        
         # Extract named sources
+        started = time.perf_counter()
         if self.use_api:
             named_sources = self._extract_sources_api(article_text)
         else:
@@ -291,8 +324,12 @@ class AdvancedSourceAnalyzer:
             named_sources = [NamedSource(**s) for s in named_sources_data]
         
         print(f"✓ Found {len(named_sources)} named sources")
+        high_cred = sum(1 for s in named_sources if s.credibility == "high")
+        yield finished('sources', started, f"Extracted {len(named_sources)} named sources ({high_cred} high credibility)",
+                       named_count=len(named_sources), high_credibility=high_cred)
         
         # Detect anonymous phrases
+        started = time.perf_counter()
         if self.use_api:
             anonymous_phrases = self._detect_anonymous_api(article_text)
         else:
@@ -300,8 +337,11 @@ class AdvancedSourceAnalyzer:
             anonymous_phrases = [AnonymousPhrase(**p) for p in anon_data]
         
         print(f"✓ Found {len(anonymous_phrases)} anonymous phrases")
+        yield finished('anonymous', started, f"Found {len(anonymous_phrases)} anonymous attributions",
+                       anonymous_count=len(anonymous_phrases))
         
         # Detect bias
+        started = time.perf_counter()
         if self.use_api:
             bias_analysis = []  # API version would go here
         else:
@@ -309,11 +349,10 @@ class AdvancedSourceAnalyzer:
             bias_analysis = [BiasAnalysis(**b) for b in bias_data]
         
         print(f"✓ Detected {len(bias_analysis)} bias instances")
-        
-        # Calculate metrics
-        high_cred = sum(1 for s in named_sources if s.credibility == "high")
+        yield finished('bias', started, f"Detected {len(bias_analysis)} bias indicators", bias_count=len(bias_analysis))
         
         # Identify red flags
+        started = time.perf_counter()
         if self.use_api:
             red_flags_data = []  # API version would go here
         else:
@@ -325,24 +364,29 @@ class AdvancedSourceAnalyzer:
         
         red_flags = [RedFlag(**f) for f in red_flags_data]
         print(f"✓ Identified {len(red_flags)} red flags")
+        yield finished('red_flags', started, f"Identified {len(red_flags)} red flags", red_flag_count=len(red_flags))
         
         # Calculate quality metrics
+        started = time.perf_counter()
         quality_metrics = self._calculate_metrics(
             named_sources, anonymous_phrases, red_flags, bias_analysis
         )
+        final_score = quality_metrics.transparency_score
+        yield finished('metrics', started, f"Transparency score computed: {final_score}/100", score=final_score)
         
         # Generate recommendations
+        started = time.perf_counter()
         recommendations = self._generate_recommendations(
             len(named_sources), len(anonymous_phrases), high_cred, red_flags
         )
-        
-        final_score = quality_metrics.transparency_score
+        yield finished('recommendations', started, f"Generated {len(recommendations)} recommendations",
+                       recommendation_count=len(recommendations))
         
         print(f"\n{'='*60}")
         print(f"Final Transparency Score: {final_score}/100")
         print(f"{'='*60}\n")
         
-        return {
+        results = {
             "named_sources": [s.dict() for s in named_sources],
             "anonymous_phrases": [p.dict() for p in anonymous_phrases],
             "red_flags": [f.dict() for f in red_flags],
@@ -368,6 +412,8 @@ class AdvancedSourceAnalyzer:
             "transparency_score": final_score,
             "unique_source_count": len(named_sources) + len(anonymous_phrases)
         }
+        total_ms = round(sum(stage_ms), 1)
+        yield 'complete', f"Analysis complete in {total_ms} ms", {'results': results, 'elapsed_ms': total_ms}
     
     def _extract_sources_api(self, text: str) -> List[NamedSource]:
         """Extract sources using API"""
@@ -0,0 +1,144 @@
+"""
+Batch analysis of many article URLs (e.g. a whole section of a news site).
+
+Pages are scraped and analyzed on two thread pools (see
+agents/batch_pipeline.py), with each domain limited to a few requests in
+flight. Finished analyses are saved with bulk_create in batches. Pages
+whose text is unchanged since their last analysis by the same analyzer
+version are reported with the stored article instead of being analyzed
+again.
+"""
+import time
+from collections import Counter
+from urllib.parse import urlparse
+
+from django.conf import settings
+from django.db import transaction
+
+from agents.batch_pipeline import HostRateLimiter, StagePools
+
+from .agents import AdvancedSourceAnalyzer
+from .models import Article
+from .scraper import ArticleScraper
+
+
+def domain_of(url):
+    return urlparse(url).netloc.lower()
+
+
+def clean_urls(urls):
+    """De-duplicated http(s) URLs, plus errors for anything else"""
+    valid, errors = [], []
+    for url in urls:
+        url = url.strip()
+        if not url:
+            continue
+        if urlparse(url).scheme in ('http', 'https') and domain_of(url):
+            valid.append(url)
+        else:
+            errors.append({'url': url, 'error': 'Not an http(s) URL'})
+    return list(dict.fromkeys(valid)), errors
+
+
+def scrape(url, limiter):
+    domain = domain_of(url)
+    limiter.acquire(domain)
+    try:
+        return ArticleScraper().scrape_article(url)
+    finally:
+        limiter.release(domain)
+
+
+def analyze(analyzer, scraped_data, url):
+    results = analyzer.analyze_article(scraped_data['content'], {
+        'title': scraped_data.get('title', 'Untitled'),
+        'url': url
+    })
+    return Article.from_analysis(scraped_data, url, results, analyzer.version)
+
+
+def save_articles(articles):
+    with transaction.atomic():
+        return Article.objects.bulk_create(articles, batch_size=settings.ARTICLE_BULK_BATCH_SIZE)
+
+
+def analyze_urls(urls, scrape_workers=None, analyze_workers=None, requests_per_second=None,
+                 max_per_domain=None, save=True, force_refresh=False):
+    """
+    Analyzes article URLs, yielding 'resolved', then 'scraped' /
+    'unchanged' / 'analyzed' / 'error' for each URL and 'saved' for each
+    bulk insert, and finally {'event': 'done', 'summary': {...}}.
+    """
+    scrape_workers = scrape_workers or settings.ANALYZER_SCRAPE_WORKERS
+    analyze_workers = analyze_workers or settings.ANALYZER_WORKERS
+    limiter = HostRateLimiter(
+        requests_per_second or settings.ANALYZER_DOMAIN_REQUESTS_PER_SECOND,
+        max_per_domain or settings.ANALYZER_DOMAIN_CONCURRENCY,
+    )
+    analyzer = AdvancedSourceAnalyzer()
+    started = time.monotonic()
+
+    urls, errors = clean_urls(urls)
+    for error in errors:
+        yield {'event': 'error', 'stage': 'input', **error}
+    yield {'event': 'resolved', 'urls': len(urls), 'domains': len({domain_of(u) for u in urls})}
+
+    results = {}
+    unsaved = []
+
+    def flush():
+        saved = save_articles(unsaved)
+        for article in saved:
+            results[article.url]['article_id'] = article.id
+        unsaved.clear()
+        return {'event': 'saved', 'articles': [{'url': a.url, 'article_id': a.id} for a in saved]}
+
+    with StagePools({'scrape': scrape_workers, 'analyze': analyze_workers}, 'article') as pools:
+        for url in urls:
+            pools.submit('scrape', url, scrape, url, limiter)
+        for stage, url, future in pools.completed():
+            try:
+                value = future.result()
+                if stage == 'scrape' and not value['success']:
+                    raise ValueError(value['error'])
+            except Exception as e:
+                results[url] = {'status': 'failed', 'stage': stage, 'error': str(e)}
+                yield {'event': 'error', 'stage': stage, 'url': url, 'error': str(e)}
+                continue
+
+            if stage == 'scrape':
+                results[url] = {'status': 'scraped', 'title': value.get('title')}
+                yield {'event': 'scraped', 'url': url, 'title': value.get('title'),
+                       'characters': len(value['content'])}
+                previous = None if force_refresh else Article.previous_analysis(url, value['content'], analyzer.version)
+                if previous:
+                    results[url].update(status='done', score=previous.transparency_score,
+                                        article_id=previous.id, unchanged=True)
+                    yield {'event': 'unchanged', 'url': url, 'article_id': previous.id,
+                           'score': previous.transparency_score}
+                    continue
+                pools.submit('analyze', url, analyze, analyzer, value, url)
+            else:
+                if save:
+                    unsaved.append(value)
+                results[url].update(status='done', score=value.transparency_score)
+                yield {'event': 'analyzed', 'url': url, 'score': value.transparency_score,
+                       'done': sum(1 for r in results.values() if r['status'] in ('done', 'failed')),
+                       'total': len(urls)}
+                if len(unsaved) >= settings.ARTICLE_BULK_BATCH_SIZE:
+                    yield flush()
+        if unsaved:
+            yield flush()
+
+    scores = [r['score'] for r in results.values() if r['status'] == 'done']
+    yield {'event': 'done', 'summary': {
+        'urls': len(urls),
+        'succeeded': len(scores),
+        'failed': sum(1 for r in results.values() if r['status'] == 'failed') + len(errors),
+        'saved': sum(1 for r in results.values() if 'article_id' in r and not r.get('unchanged')),
+        'unchanged': sum(1 for r in results.values() if r.get('unchanged')),
+        'mean_score': round(sum(scores) / len(scores), 1) if scores else None,
+        'per_domain': dict(Counter(domain_of(url) for url, r in results.items() if r['status'] == 'done')),
+        'per_url': results,
+        'seconds': round(time.monotonic() - started, 1),
+    }}
@@ -0,0 +1,144 @@
+"""
+lxml extraction engine for ArticleScraper (SCRAPER_ENGINE=lxml).
+
+The page is parsed incrementally with lxml's HTMLPullParser as chunks
+arrive, and content is extracted in the same pass: boilerplate subtrees
+(scripts, navigation, asides, forms...) are skipped and freed as soon as
+they close, and each paragraph is kept or dropped by its text density
+(characters per tag) and link density. Once an <article> or <main>
+element closes holding a full article, parsing stops; the rest of the
+page is never read.
+
+When the server doesn't declare a charset, the encoding is sniffed from the
+start of the page (byte order mark, then <meta charset>) and defaults to
+UTF-8; left to itself libxml2 would decode such pages as latin-1.
+"""
+import codecs
+import itertools
+import re
+
+from lxml import etree
+
+BOILERPLATE_TAGS = {'script', 'style', 'nav', 'header', 'footer', 'aside', 'iframe', 'form', 'noscript', 'svg'}
+CONTAINER_TAGS = {'article', 'main'}
+
+# A paragraph is content when it has this many characters...
+MIN_PARAGRAPH_CHARS = 25
+# ...at least this many characters per element inside it...
+MIN_TEXT_DENSITY = 10
+# ...and no more than this share of its text is link text
+MAX_LINK_DENSITY = 0.5
+
+# Same bar as the BeautifulSoup engine for "this container is the article"
+MIN_CONTAINER_PARAGRAPHS = 4
+MIN_ARTICLE_CHARS = 200
+
+WHITESPACE = re.compile(r'\s+')
+
+# Bytes searched for a <meta charset> (the HTML spec prescans 1024; pages
+# with long <head>s often declare it later)
+PRESCAN_BYTES = 4096
+META_CHARSET = re.compile(rb'<meta[^>]+charset\s*=\s*["\']?\s*([-\w.:]+)', re.IGNORECASE)
+BYTE_ORDER_MARKS = [
+    (codecs.BOM_UTF8, 'utf-8'),
+    (codecs.BOM_UTF16_LE, 'utf-16-le'),
+    (codecs.BOM_UTF16_BE, 'utf-16-be'),
+]
+
+
+def sniff_encoding(head):
+    """Encoding of a page from its first bytes; UTF-8 when nothing says otherwise"""
+    for mark, encoding in BYTE_ORDER_MARKS:
+        if head.startswith(mark):
+            return encoding
+    match = META_CHARSET.search(head[:PRESCAN_BYTES])
+    if match:
+        try:
+            return codecs.lookup(match.group(1).decode('ascii')).name
+        except (LookupError, UnicodeDecodeError):
+            pass
+    return 'utf-8'
+
+
+def clean_text(element):
+    return WHITESPACE.sub(' ', ''.join(element.itertext())).strip()
+
+
+def is_content(paragraph, text):
+    if len(text) < MIN_PARAGRAPH_CHARS:
+        return False
+    tags = sum(1 for _ in paragraph.iter())
+    if len(text) / tags < MIN_TEXT_DENSITY:
+        return False
+    link_chars = sum(len(clean_text(a)) for a in paragraph.iter('a'))
+    return link_chars / len(text) <= MAX_LINK_DENSITY
+
+
+def extract_article(chunks, encoding=None):
+    """
+    (title, content) from an iterable of HTML byte chunks; content is None
+    when no article text is found. Stops consuming `chunks` once the main
+    content has been read. `encoding` is the charset the server declared, if any.
+    """
+    chunks = iter(chunks)
+    if encoding is None:
+        head = b''
+        for chunk in chunks:
+            head += chunk
+            if len(head) >= PRESCAN_BYTES:
+                break
+        encoding = sniff_encoding(head)
+        chunks = itertools.chain([head], chunks)
+
+    parser = etree.HTMLPullParser(events=('start', 'end'), encoding=encoding, remove_comments=True)
+    titles = {}
+    paragraphs = []
+    skip_depth = 0
+    # [element, index of its first paragraph] for open article/main elements
+    containers = []
+
+    for chunk in chunks:
+        parser.feed(chunk)
+        for event, element in parser.read_events():
+            tag = element.tag if isinstance(element.tag, str) else ''
+
+            if event == 'start':
+                if tag in BOILERPLATE_TAGS:
+                    skip_depth += 1
+                elif tag in CONTAINER_TAGS and not skip_depth:
+                    containers.append([element, len(paragraphs)])
+                continue
+
+            if tag == 'h1' and 'h1' not in titles:
+                titles['h1'] = clean_text(element)
+            elif tag == 'title' and 'title' not in titles:
+                titles['title'] = clean_text(element)
+            elif tag == 'meta':
+                key = element.get('property') or element.get('name')
+                if key in ('og:title', 'twitter:title') and element.get('content'):
+                    titles.setdefault(key, element.get('content'))
+
+            if tag in BOILERPLATE_TAGS:
+                skip_depth -= 1
+                element.clear()
+            elif tag == 'p' and not skip_depth:
+                text = clean_text(element)
+                if is_content(element, text):
+                    paragraphs.append(text)
+                element.clear()
+            elif containers and containers[-1][0] is element:
+                _, first = containers.pop()
+                found = paragraphs[first:]
+                if len(found) >= MIN_CONTAINER_PARAGRAPHS and len('\n\n'.join(found)) > MIN_ARTICLE_CHARS:
+                    return pick_title(titles), '\n\n'.join(found)
+
+    parser.close()
+    text = '\n\n'.join(paragraphs)
+    return pick_title(titles), text if len(text) > MIN_ARTICLE_CHARS else None
+
+
+def pick_title(titles):
+    for key in ('h1', 'og:title', 'twitter:title', 'title'):
+        if titles.get(key):
+            return titles[key]
+    return 'Untitled Article'
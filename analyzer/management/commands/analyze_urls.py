@@ -0,0 +1,54 @@
+# analyzer/management/commands/analyze_urls.py
+import json
+
+from django.core.management.base import BaseCommand
+
+from analyzer.batch import analyze_urls
+
+
+class Command(BaseCommand):
+    help = "Scrape and analyze many article URLs concurrently (e.g. a whole section of a news site)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('urls', nargs='*', help='Article URLs')
+        parser.add_argument('--file', help='Read URLs from a file, one per line')
+        parser.add_argument('--scrape-workers', type=int, default=None, help='Concurrent page fetches')
+        parser.add_argument('--analyze-workers', type=int, default=None, help='Concurrent analyses')
+        parser.add_argument('--rate', type=float, default=None, help='Requests per second to each domain')
+        parser.add_argument('--per-domain', type=int, default=None, help='Requests in flight per domain')
+        parser.add_argument('--no-save', action='store_true', help="Don't save Article rows")
+        parser.add_argument('--force-refresh', action='store_true',
+                            help='Re-analyze articles even if unchanged since their last analysis')
+
+    def handle(self, *args, **options):
+        urls = list(options['urls'])
+        if options['file']:
+            with open(options['file']) as f:
+                urls.extend(line.strip() for line in f if line.strip())
+
+        for event in analyze_urls(
+            urls,
+            scrape_workers=options['scrape_workers'],
+            analyze_workers=options['analyze_workers'],
+            requests_per_second=options['rate'],
+            max_per_domain=options['per_domain'],
+            save=not options['no_save'],
+            force_refresh=options['force_refresh'],
+        ):
+            kind = event['event']
+            if kind == 'resolved':
+                self.stdout.write(f"📰 {event['urls']} articles on {event['domains']} domains")
+            elif kind == 'scraped':
+                self.stdout.write(f"   ⬇️  {event['url']} ({event['characters']} chars)")
+            elif kind == 'analyzed':
+                self.stdout.write(f"   ✅ [{event['done']}/{event['total']}] {event['url']}: {event['score']}/100")
+            elif kind == 'unchanged':
+                self.stdout.write(f"   ⏭️  {event['url']}: unchanged, article #{event['article_id']} ({event['score']}/100)")
+            elif kind == 'saved':
+                self.stdout.write(f"   💾 Saved {len(event['articles'])} articles")
+            elif kind == 'error':
+                self.stderr.write(f"   ✗ {event['url']} ({event['stage']}): {event['error']}")
+            elif kind == 'done':
+                summary = event['summary']
+                summary.pop('per_url')
+                self.stdout.write(self.style.SUCCESS(json.dumps(summary, indent=2)))
@@ -0,0 +1,105 @@
+# analyzer/management/commands/benchmark_extractors.py
+import hashlib
+import os
+import statistics
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from analyzer.scraper import CHUNK_SIZE, ArticleScraper, get_session, iter_limited
+
+ENGINES = ['bs4', 'lxml']
+
+
+def token_f1(text, reference):
+    """Bag-of-words F1 of extracted text against a reference text"""
+    got, want = Counter((text or '').lower().split()), Counter((reference or '').lower().split())
+    overlap = sum((got & want).values())
+    if not overlap:
+        return 0.0
+    precision, recall = overlap / sum(got.values()), overlap / sum(want.values())
+    return 2 * precision * recall / (precision + recall)
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the scraper's HTML extraction engines on a saved corpus of "
+        "pages: parse time and extraction quality. A page's quality is "
+        "scored against <name>.txt next to <name>.html when present "
+        "(hand-checked article text), otherwise the engines are compared "
+        "with each other. Pages are fed in the scraper's network chunk size, "
+        "as the lxml engine's streaming parse sees them."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('corpus', nargs='?', default=os.path.join(settings.BASE_DIR, 'cache', 'html_corpus'),
+                            help='Directory of saved .html pages')
+        parser.add_argument('--add', nargs='+', metavar='URL', default=[],
+                            help='Download these pages into the corpus first')
+        parser.add_argument('--repeat', type=int, default=5, help='Timed runs per page and engine')
+
+    def handle(self, *args, **options):
+        corpus = options['corpus']
+        for url in options['add']:
+            self.save_page(corpus, url)
+
+        pages = sorted(name for name in os.listdir(corpus) if name.endswith('.html')) if os.path.isdir(corpus) else []
+        if not pages:
+            raise CommandError(f"No .html pages in {corpus} (use --add URL to save some)")
+
+        scrapers = {engine: ArticleScraper(engine=engine) for engine in ENGINES}
+        timings = {engine: [] for engine in ENGINES}
+        scores = {engine: [] for engine in ENGINES}
+
+        for name in pages:
+            with open(os.path.join(corpus, name), 'rb') as f:
+                html = f.read()
+            chunks = [html[i:i + CHUNK_SIZE] for i in range(0, len(html), CHUNK_SIZE)]
+            reference_path = os.path.join(corpus, name[:-len('.html')] + '.txt')
+            reference = None
+            if os.path.exists(reference_path):
+                with open(reference_path, encoding='utf-8') as f:
+                    reference = f.read()
+
+            contents = {}
+            line = [f"{name[:40]:40}"]
+            for engine, scraper in scrapers.items():
+                runs = []
+                for _ in range(options['repeat']):
+                    started = time.perf_counter()
+                    _, contents[engine] = scraper.extract(iter(chunks))
+                    runs.append(time.perf_counter() - started)
+                timings[engine].append(statistics.median(runs))
+                line.append(f"{engine} {statistics.median(runs) * 1000:7.1f} ms {len(contents[engine] or ''):6} chars")
+
+            if reference is not None:
+                for engine in ENGINES:
+                    scores[engine].append(token_f1(contents[engine], reference))
+                line.append("F1 " + " / ".join(f"{scores[e][-1]:.2f}" for e in ENGINES))
+            else:
+                line.append(f"agreement {token_f1(contents['lxml'], contents['bs4']):.2f}")
+            self.stdout.write("  ".join(line))
+
+        self.stdout.write("")
+        for engine in ENGINES:
+            summary = f"{engine:5} total {sum(timings[engine]) * 1000:8.1f} ms"
+            if scores[engine]:
+                summary += f"  mean F1 {statistics.mean(scores[engine]):.3f} over {len(scores[engine])} pages"
+            self.stdout.write(summary)
+        speedup = sum(timings['bs4']) / max(sum(timings['lxml']), 1e-9)
+        self.stdout.write(self.style.SUCCESS(f"lxml is {speedup:.1f}x the speed of bs4 on {len(pages)} pages"))
+
+    def save_page(self, corpus, url):
+        os.makedirs(corpus, exist_ok=True)
+        response = get_session().get(url, headers=ArticleScraper().headers, timeout=10, stream=True)
+        try:
+            response.raise_for_status()
+            html = b''.join(iter_limited(response))
+        finally:
+            response.close()
+        path = os.path.join(corpus, hashlib.sha256(url.encode('utf-8')).hexdigest()[:16] + '.html')
+        with open(path, 'wb') as f:
+            f.write(html)
+        self.stdout.write(f"💾 Saved {url} -> {path}")
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.18 on 2026-10-19 00:42
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Article',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('title', models.CharField(max_length=500)),
+                ('content', models.TextField()),
+                ('url', models.URLField(blank=True, max_length=1000, null=True)),
+                ('named_sources', models.JSONField(default=list)),
+                ('anonymous_phrases', models.JSONField(default=list)),
+                ('unique_source_count', models.IntegerField(default=0)),
+                ('transparency_score', models.FloatField(default=0.0)),
+                ('red_flags', models.JSONField(default=list)),
+                ('source_breakdown', models.JSONField(default=dict)),
+                ('attribution_patterns', models.JSONField(default=dict)),
+                ('analyzed_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Article Analysis',
+                'verbose_name_plural': 'Article Analyses',
+                'ordering': ['-analyzed_at'],
+            },
+        ),
+    ]
@@ -1,3 +1,5 @@
+import hashlib
+
 from django.db import models
 from django.utils import timezone
 
@@ -6,7 +8,12 @@ class Article(models.Model):
     
     title = models.CharField(max_length=500)
     content = models.TextField()
-    url = models.URLField(max_length=1000, blank=True, null=True)
+    url = models.URLField(max_length=1000, blank=True, null=True, db_index=True)
+    
+    # Fingerprint of the analyzed text and the analyzer that produced the
+    # results; an unchanged page is not analyzed again by the same version
+    content_hash = models.CharField(max_length=64, blank=True)
+    analyzer_version = models.CharField(max_length=40, blank=True)
     
     # Source data
     named_sources = models.JSONField(default=list)
@@ -32,6 +39,42 @@ class Article(models.Model):
     def __str__(self):
         return f"{self.title[:50]} - Score: {self.transparency_score}"
     
+    @staticmethod
+    def fingerprint(content):
+        normalized = ' '.join((content or '').split())
+        return hashlib.sha256(normalized.encode('utf-8')).hexdigest()
+    
+    @classmethod
+    def previous_analysis(cls, url, content, analyzer_version):
+        """The latest analysis of this exact text at `url` by this analyzer version, if any"""
+        return cls.objects.filter(
+            url=url,
+            content_hash=cls.fingerprint(content),
+            analyzer_version=analyzer_version
+        ).order_by('-analyzed_at').first()
+    
+    @classmethod
+    def from_analysis(cls, scraped_data, url, results, analyzer_version=''):
+        """Unsaved Article for scraped page data and AdvancedSourceAnalyzer results"""
+        return cls(
+            title=scraped_data.get('title', 'Untitled'),
+            content=scraped_data['content'],
+            url=url,
+            content_hash=cls.fingerprint(scraped_data['content']),
+            analyzer_version=analyzer_version,
+            named_sources=results['named_sources'],
+            anonymous_phrases=results['anonymous_phrases'],
+            unique_source_count=results['unique_source_count'],
+            transparency_score=results['transparency_score'],
+            red_flags=results['red_flags'],
+            source_breakdown=results['source_breakdown'],
+            attribution_patterns={
+                'bias_analysis': results['bias_analysis'],
+                'source_quality': results['source_quality'],
+                'recommendations': results['improvement_recommendations']
+            }
+        )
+    
     @property
     def bias_analysis(self):
         """Helper property to access bias analysis from attribution_patterns"""
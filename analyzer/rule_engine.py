@@ -0,0 +1,161 @@
+"""
+Compiled rule engine behind RuleBasedAnalyzer.
+
+All source-attribution rules are compiled once, at import. Rather than
+one re.finditer per rule over the whole article, `scan` makes a single
+pass over the lowercased text with one literal alternation of every
+rule's leading keyword (Python's re has no multi-pattern automaton, and
+a case-insensitive alternation of the full rules is slower than the
+separate scans it replaces). Each rule is then tried only where one of
+its keywords starts, with its original regex anchored at that position,
+so the matches are exactly those of the per-rule scans. The quoted-source
+rule starts with a capitalized name rather than a keyword and keeps its
+own case-sensitive scan.
+
+`scan_reference` is the per-rule path: used for text where lowercasing
+would shift or hide keyword positions, and by `manage.py
+benchmark_rules` to check that both paths agree.
+"""
+import re
+
+# "Name Surname, Title, said"
+QUOTED_SOURCE_PATTERN = re.compile(
+    r'([A-Z][a-z]+ [A-Z][a-z]+(?:\s+[A-Z][a-z]+)?),\s*([^,]+?),\s*(?:said|stated|told|explained)'
+)
+
+# "according to Name Surname" / "said Name Surname"
+ATTRIBUTED_SOURCE_PATTERN = re.compile(
+    r'(?:according to|said)\s+([A-Z][a-z]+ [A-Z][a-z]+(?:\s+[A-Z][a-z]+)?)', re.IGNORECASE
+)
+ATTRIBUTED_SOURCE_KEYWORDS = ['according to', 'said']
+
+# (pattern, vagueness score, keywords every match starts with)
+ANONYMOUS_RULES = [
+    (r'sources?\s+(?:say|said|claim|told|familiar)', 8, ['source']),
+    (r'officials?\s+(?:say|said|claim|told)', 7, ['official']),
+    (r'according to reports?', 9, ['according to']),
+    (r'it is (?:believed|understood|reported)', 8, ['it is']),
+    (r'(?:people|insiders?)\s+familiar with', 9, ['people', 'insider']),
+    (r'allegedly', 7, ['allegedly']),
+    (r'reportedly', 7, ['reportedly']),
+    (r'anonymous\s+(?:source|official)', 10, ['anonymous']),
+    (r'unnamed\s+(?:source|official)', 9, ['unnamed']),
+    (r'experts?\s+(?:say|believe|suggest)', 5, ['expert']),
+]
+ANONYMOUS_PATTERNS = [
+    (re.compile(pattern, re.IGNORECASE), vagueness) for pattern, vagueness, _ in ANONYMOUS_RULES
+]
+
+LOADED_WORDS = ['shocking', 'outrageous', 'devastating', 'incredible', 'unbelievable', 'stunning']
+LOADED_WORD_PATTERNS = {word: re.compile(rf'\b{word}\b', re.IGNORECASE) for word in LOADED_WORDS}
+
+# Characters that re.IGNORECASE matches to ASCII letters but str.lower()
+# doesn't map to them (dotless i, long s)
+UNSAFE_FOR_LOWERCASE = re.compile('[ıſ]')
+
+
+class ScanResult:
+    def __init__(self):
+        self.quoted_sources = []      # QUOTED_SOURCE_PATTERN matches, in text order
+        self.attributed_sources = []  # ATTRIBUTED_SOURCE_PATTERN matches, in text order
+        self.anonymous = []           # (vagueness, match), by rule then text order
+        self.loaded_word = None       # first of LOADED_WORDS in the text
+
+
+class RuleEngine:
+    def __init__(self):
+        # keyword -> what to try where it starts: ('attributed', None),
+        # ('anonymous', rule index) or ('loaded', word)
+        self.keyword_rules = {}
+        for keyword in ATTRIBUTED_SOURCE_KEYWORDS:
+            self.keyword_rules.setdefault(keyword, []).append(('attributed', None))
+        for index, (_, _, keywords) in enumerate(ANONYMOUS_RULES):
+            for keyword in keywords:
+                self.keyword_rules.setdefault(keyword, []).append(('anonymous', index))
+        for word in LOADED_WORDS:
+            self.keyword_rules.setdefault(word, []).append(('loaded', word))
+
+        # Only one keyword is reported per position, so none may be a
+        # prefix of another
+        for keyword in self.keyword_rules:
+            assert not any(other != keyword and other.startswith(keyword) for other in self.keyword_rules), keyword
+
+        alternation = '|'.join(re.escape(k) for k in sorted(self.keyword_rules, key=len, reverse=True))
+        self.keyword_pattern = re.compile(f'(?=({alternation}))')
+
+        # (text, ScanResult) of the last scan: the analyzer's three rule
+        # groups ask about the same article one after another. Replaced
+        # as a whole tuple, so concurrent readers never see a mismatch.
+        self._last = (None, None)
+
+    def scan(self, text):
+        """All rule matches in `text`; repeated calls with the same text reuse the result"""
+        last_text, last_result = self._last
+        if last_text is text:
+            return last_result
+
+        lowered = text.lower()
+        if len(lowered) != len(text) or UNSAFE_FOR_LOWERCASE.search(text):
+            result = self.scan_reference(text)
+        else:
+            result = self._scan_keywords(text, lowered)
+
+        self._last = (text, result)
+        return result
+
+    def clear(self):
+        self._last = (None, None)
+
+    def _scan_keywords(self, text, lowered):
+        result = ScanResult()
+        result.quoted_sources = list(QUOTED_SOURCE_PATTERN.finditer(text))
+
+        anonymous = [[] for _ in ANONYMOUS_PATTERNS]
+        loaded_words = set()
+        # Like finditer, a rule's matches never overlap each other
+        attributed_end = 0
+        anonymous_end = [0] * len(ANONYMOUS_PATTERNS)
+
+        for hit in self.keyword_pattern.finditer(lowered):
+            pos = hit.start()
+            for kind, rule in self.keyword_rules[hit.group(1)]:
+                if kind == 'attributed':
+                    if pos >= attributed_end:
+                        match = ATTRIBUTED_SOURCE_PATTERN.match(text, pos)
+                        if match:
+                            result.attributed_sources.append(match)
+                            attributed_end = match.end()
+                elif kind == 'anonymous':
+                    if pos >= anonymous_end[rule]:
+                        pattern, vagueness = ANONYMOUS_PATTERNS[rule]
+                        match = pattern.match(text, pos)
+                        if match:
+                            anonymous[rule].append((vagueness, match))
+                            anonymous_end[rule] = match.end()
+                elif rule not in loaded_words and LOADED_WORD_PATTERNS[rule].match(text, pos):
+                    loaded_words.add(rule)
+
+        result.anonymous = [hit for rule_hits in anonymous for hit in rule_hits]
+        result.loaded_word = next((word for word in LOADED_WORDS if word in loaded_words), None)
+        return result
+
+    def scan_reference(self, text, groups=('named', 'anonymous', 'loaded')):
+        """The same matches, one re.finditer/re.search per rule"""
+        result = ScanResult()
+        if 'named' in groups:
+            result.quoted_sources = list(QUOTED_SOURCE_PATTERN.finditer(text))
+            result.attributed_sources = list(ATTRIBUTED_SOURCE_PATTERN.finditer(text))
+        if 'anonymous' in groups:
+            result.anonymous = [
+                (vagueness, match)
+                for pattern, vagueness in ANONYMOUS_PATTERNS
+                for match in pattern.finditer(text)
+            ]
+        if 'loaded' in groups:
+            result.loaded_word = next(
+                (word for word, pattern in LOADED_WORD_PATTERNS.items() if pattern.search(text)), None
+            )
+        return result
+
+
+rule_engine = RuleEngine()
@@ -1,29 +1,189 @@
+import hashlib
+import json
+import os
+import threading
+import time
+
 import requests
 from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
 from urllib.parse import urlparse
-import time
+
+# Connection pools: one per host (up to POOL_HOSTS hosts kept open), each
+# holding up to POOL_SIZE keep-alive connections
+POOL_HOSTS = int(os.getenv('SCRAPER_POOL_HOSTS', '32'))
+POOL_SIZE = int(os.getenv('SCRAPER_POOL_SIZE', '8'))
+
+# Pages larger than this are rejected instead of being read into memory
+MAX_RESPONSE_BYTES = int(os.getenv('SCRAPER_MAX_RESPONSE_BYTES', str(5 * 1024 * 1024)))
+CHUNK_SIZE = 64 * 1024
+
+# HTML extraction engine: 'bs4' (BeautifulSoup, html.parser) or 'lxml'
+# (streamed parse with text-density boilerplate removal, see lxml_extractor.py)
+ENGINE = os.getenv('SCRAPER_ENGINE', 'bs4')
+
+# On-disk HTTP cache: extracted title/content plus the ETag/Last-Modified
+# validators, so an unchanged page costs a 304 and no re-parse
+CACHE_DIR = os.getenv(
+    'SCRAPER_CACHE_DIR',
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'cache', 'scraper')
+)
+# Entries older than this are ignored (the page is fetched and parsed again);
+# past CACHE_MAX_ENTRIES files the least recently written are removed
+CACHE_MAX_AGE_DAYS = float(os.getenv('SCRAPER_CACHE_MAX_AGE_DAYS', '30'))
+CACHE_MAX_ENTRIES = int(os.getenv('SCRAPER_CACHE_MAX_ENTRIES', '5000'))
+# The directory is checked against CACHE_MAX_ENTRIES once per this many writes
+CACHE_PRUNE_EVERY = 100
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_session():
+    """The process-wide requests.Session shared by all scrapers"""
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=POOL_HOSTS, pool_maxsize=POOL_SIZE)
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            _session = session
+    return _session
+
+
+class ResponseTooLarge(requests.exceptions.RequestException):
+    pass
+
+
+class HTTPCache:
+    """
+    One JSON file per (engine, URL) under CACHE_DIR: the entry holds that
+    engine's extraction, so switching engines never serves the other's output
+    """
+    
+    def __init__(self, directory=CACHE_DIR, max_age_days=CACHE_MAX_AGE_DAYS, max_entries=CACHE_MAX_ENTRIES):
+        self.directory = directory
+        self.max_age = max_age_days * 86400
+        self.max_entries = max_entries
+        self._writes = 0
+        self._lock = threading.Lock()
+    
+    def _path(self, url, engine):
+        key = f"{engine}\n{url}"
+        return os.path.join(self.directory, hashlib.sha256(key.encode('utf-8')).hexdigest() + '.json')
+    
+    def get(self, url, engine):
+        try:
+            with open(self._path(url, engine), encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if time.time() - entry.get('fetched_at', 0) > self.max_age:
+            return None
+        return entry
+    
+    def set(self, url, engine, entry):
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._path(url, engine)
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(entry, f)
+        os.replace(tmp, path)
+        
+        with self._lock:
+            self._writes += 1
+            prune = self._writes % CACHE_PRUNE_EVERY == 1
+        if prune:
+            self.prune()
+    
+    def prune(self):
+        """Removes expired entries, then the oldest ones past max_entries"""
+        try:
+            files = [e for e in os.scandir(self.directory) if e.name.endswith('.json')]
+        except OSError:
+            return
+        now = time.time()
+        by_age = sorted(files, key=lambda e: e.stat().st_mtime, reverse=True)
+        for index, entry in enumerate(by_age):
+            if index >= self.max_entries or now - entry.stat().st_mtime > self.max_age:
+                try:
+                    os.remove(entry.path)
+                except OSError:
+                    pass
+
+
+def conditional_headers(entry):
+    headers = {}
+    if entry and entry.get('etag'):
+        headers['If-None-Match'] = entry['etag']
+    if entry and entry.get('last_modified'):
+        headers['If-Modified-Since'] = entry['last_modified']
+    return headers
+
+
+def iter_limited(response, limit=MAX_RESPONSE_BYTES):
+    """Response body chunks, refusing anything over `limit` bytes"""
+    length = response.headers.get('Content-Length')
+    if length and length.isdigit() and int(length) > limit:
+        raise ResponseTooLarge(f'Page is larger than {limit // 1024} KB')
+    
+    size = 0
+    for chunk in response.iter_content(CHUNK_SIZE):
+        size += len(chunk)
+        if size > limit:
+            raise ResponseTooLarge(f'Page is larger than {limit // 1024} KB')
+        yield chunk
+
+
+def load_engine(name):
+    """The engine to use; falls back to bs4 when lxml isn't installed"""
+    if name == 'lxml':
+        try:
+            from . import lxml_extractor
+            return 'lxml'
+        except ImportError:
+            print("⚠️ lxml not installed, using the BeautifulSoup engine")
+    return 'bs4'
+
 
 class ArticleScraper:
     """Web scraper for extracting article content"""
     
-    def __init__(self):
+    def __init__(self, cache=None, engine=None):
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
         }
+        self.session = get_session()
+        self.cache = cache or HTTPCache()
+        self.engine = load_engine(engine or ENGINE)
     
     def scrape_article(self, url):
         """Scrape article from URL"""
         try:
-            response = requests.get(url, headers=self.headers, timeout=10)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Extract title
-            title = self._extract_title(soup)
-            
-            # Extract main content
-            content = self._extract_content(soup)
+            cached = self.cache.get(url, self.engine)
+            response = self.session.get(
+                url,
+                headers={**self.headers, **conditional_headers(cached)},
+                timeout=10,
+                stream=True
+            )
+            try:
+                if response.status_code == 304 and cached:
+                    print(f"🗄️ Not modified, using cached extraction: {url}")
+                    return {
+                        'success': True,
+                        'title': cached['title'],
+                        'content': cached['content'],
+                        'url': url,
+                        'not_modified': True
+                    }
+                response.raise_for_status()
+                # Charset only if the server declared one; otherwise the parser sniffs it
+                encoding = response.encoding if 'charset' in response.headers.get('Content-Type', '') else None
+                title, content = self.extract(iter_limited(response), encoding)
+            finally:
+                response.close()
             
             if not content:
                 return {
@@ -31,11 +191,23 @@ class ArticleScraper:
                     'error': 'Could not extract article content from this URL'
                 }
             
+            etag = response.headers.get('ETag')
+            last_modified = response.headers.get('Last-Modified')
+            if etag or last_modified:
+                self.cache.set(url, self.engine, {
+                    'etag': etag,
+                    'last_modified': last_modified,
+                    'title': title,
+                    'content': content,
+                    'fetched_at': time.time()
+                })
+            
             return {
                 'success': True,
                 'title': title,
                 'content': content,
-                'url': url
+                'url': url,
+                'not_modified': False
             }
             
         except requests.exceptions.RequestException as e:
@@ -49,6 +221,15 @@ class ArticleScraper:
                 'error': f'Scraping error: {str(e)}'
             }
     
+    def extract(self, chunks, encoding=None):
+        """(title, content) from HTML byte chunks with the selected engine"""
+        if self.engine == 'lxml':
+            from .lxml_extractor import extract_article
+            return extract_article(chunks, encoding)
+        
+        soup = BeautifulSoup(b''.join(chunks), 'html.parser', from_encoding=encoding)
+        return self._extract_title(soup), self._extract_content(soup)
+    
     def _extract_title(self, soup):
         """Extract article title"""
         # Try multiple selectors
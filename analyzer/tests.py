@@ -1,3 +1,289 @@
-from django.test import TestCase
+import json
+import os
+import tempfile
+import time
+from unittest import mock
 
-# Create your tests here.
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from .agents import AdvancedSourceAnalyzer, RuleBasedAnalyzer
+from .batch import analyze_urls
+from .lxml_extractor import extract_article, sniff_encoding
+from .models import Article
+from .rule_engine import rule_engine
+from .scraper import ArticleScraper, HTTPCache
+from .views import ANALYSIS_STEPS
+
+
+def done_events(urls, force_refresh=False):
+    yield {'event': 'done', 'summary': {'urls': len(urls)}}
+
+
+@mock.patch('analyzer.views.analyze_urls', side_effect=done_events)
+class AnalyzeBatchStreamTests(TestCase):
+    def post_json(self, body, client=None, **headers):
+        return (client or self.client).post(reverse('analyze_batch'), json.dumps(body),
+                                            content_type='application/json', headers=headers)
+
+    def test_streams_a_list_of_urls(self, analyze_urls):
+        response = self.post_json({'urls': ['https://example.com/a', 'https://example.com/b']})
+
+        self.assertEqual(response.status_code, 200)
+        body = b''.join(response.streaming_content).decode()
+        self.assertIn('"urls": 2', body)
+        analyze_urls.assert_called_once_with(['https://example.com/a', 'https://example.com/b'],
+                                             force_refresh=False)
+
+    def test_rejects_urls_that_are_not_a_list_of_strings(self, analyze_urls):
+        for body in [{'urls': 'https://example.com/a'}, {'urls': ['https://example.com/a', 3]},
+                     ['https://example.com/a'], {'urls': []}]:
+            with self.subTest(body=body):
+                self.assertEqual(self.post_json(body).status_code, 400)
+        analyze_urls.assert_not_called()
+
+    def test_json_clients_need_the_csrf_token(self, analyze_urls):
+        client = Client(enforce_csrf_checks=True)
+        client.get(reverse('analyzer'))
+        body = {'urls': ['https://example.com/a']}
+
+        self.assertEqual(self.post_json(body, client).status_code, 403)
+        response = self.post_json(body, client, X_CSRFToken=client.cookies['csrftoken'].value)
+        self.assertEqual(response.status_code, 200)
+
+
+class HTTPCacheTests(TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+
+    def entry(self, content, age_days=0):
+        return {'etag': '"v1"', 'title': 'Title', 'content': content,
+                'fetched_at': time.time() - age_days * 86400}
+
+    def test_entries_are_kept_per_engine(self):
+        cache = HTTPCache(self.directory)
+        cache.set('https://example.com/a', 'bs4', self.entry('bs4 text'))
+
+        self.assertEqual(cache.get('https://example.com/a', 'bs4')['content'], 'bs4 text')
+        self.assertIsNone(cache.get('https://example.com/a', 'lxml'))
+
+    def test_old_entries_are_ignored(self):
+        cache = HTTPCache(self.directory, max_age_days=30)
+        cache.set('https://example.com/a', 'bs4', self.entry('old', age_days=31))
+
+        self.assertIsNone(cache.get('https://example.com/a', 'bs4'))
+
+    def test_prune_keeps_the_newest_entries(self):
+        cache = HTTPCache(self.directory, max_entries=2)
+        for n in range(3):
+            cache.set(f'https://example.com/{n}', 'bs4', self.entry(str(n)))
+            path = cache._path(f'https://example.com/{n}', 'bs4')
+            os.utime(path, (time.time() - 10 + n, time.time() - 10 + n))
+        cache.prune()
+
+        self.assertIsNone(cache.get('https://example.com/0', 'bs4'))
+        self.assertEqual(cache.get('https://example.com/2', 'bs4')['content'], '2')
+        self.assertEqual(len(os.listdir(self.directory)), 2)
+
+
+ARTICLE_TEXT = (
+    "Officials say the bridge will reopen in May. Jane Smith, a city engineer, said "
+    "repairs were on schedule. According to reports, costs rose sharply."
+)
+
+
+def scraped(content=ARTICLE_TEXT):
+    return {'success': True, 'title': 'Bridge repairs', 'content': content}
+
+
+# Rule-based analysis, whatever API keys the environment has
+@mock.patch('analyzer.agents.pool_members_config', return_value=[])
+class PreviousAnalysisTests(TestCase):
+    url = 'https://example.com/bridge'
+
+    def run_batch(self, content=ARTICLE_TEXT, **kwargs):
+        with mock.patch('analyzer.batch.scrape', return_value=scraped(content)):
+            return list(analyze_urls([self.url], **kwargs))
+
+    def test_unchanged_articles_are_not_reanalyzed(self, _):
+        self.run_batch()
+        events = self.run_batch()
+
+        self.assertIn('unchanged', [e['event'] for e in events])
+        self.assertEqual(events[-1]['summary']['unchanged'], 1)
+        self.assertEqual(Article.objects.count(), 1)
+
+    def test_changed_text_and_force_refresh_are_reanalyzed(self, _):
+        self.run_batch()
+        self.run_batch(ARTICLE_TEXT + " Traffic will be diverted.")
+        self.run_batch(force_refresh=True)
+
+        self.assertEqual(Article.objects.count(), 3)
+
+    def test_other_analyzer_versions_dont_count(self, _):
+        self.run_batch()
+        Article.objects.update(analyzer_version='0-rules')
+
+        self.assertNotIn('unchanged', [e['event'] for e in self.run_batch()])
+
+    def test_stream_serves_the_stored_analysis(self, _):
+        self.run_batch()
+        previous = Article.objects.get()
+
+        with mock.patch('analyzer.views.ArticleScraper.scrape_article', return_value=scraped()), \
+                mock.patch('analyzer.agents.AdvancedSourceAnalyzer.iter_analysis') as iter_analysis:
+            response = self.client.post(reverse('analyze_stream'), {'article_url': self.url})
+            events = [json.loads(line[len('data: '):])
+                      for line in b''.join(response.streaming_content).decode().split('\n\n') if line]
+
+        iter_analysis.assert_not_called()
+        self.assertEqual(events[-1]['article_id'], previous.id)
+        self.assertTrue(events[-1]['cached'])
+        self.assertEqual(Article.objects.count(), 1)
+
+
+class AnalysisProgressTests(TestCase):
+    stages = list(ANALYSIS_STEPS) + ['complete']
+
+    def analyzer(self, members):
+        # LLMPool stubbed: API mode without a network call
+        with mock.patch('analyzer.agents.pool_members_config', return_value=members), \
+                mock.patch('analyzer.agents.LLMPool'):
+            return AdvancedSourceAnalyzer()
+
+    def test_events_follow_the_analysis_steps(self):
+        for members, use_api in [([], False), ([{'provider': 'groq', 'api_key': 'key'}], True)]:
+            with self.subTest(use_api=use_api):
+                analyzer = self.analyzer(members)
+                self.assertEqual(analyzer.use_api, use_api)
+
+                events = list(analyzer.iter_analysis(ARTICLE_TEXT))
+
+                self.assertEqual([stage for stage, _, _ in events], self.stages)
+                for stage, message, details in events:
+                    self.assertGreaterEqual(details['elapsed_ms'], 0)
+                self.assertEqual(events[-1][2]['results']['final_score'], events[-3][2]['score'])
+
+    def test_analyze_article_reports_each_stage(self):
+        analyzer = self.analyzer([])
+        progress = mock.Mock()
+
+        results = analyzer.analyze_article(ARTICLE_TEXT, progress=progress)
+
+        self.assertEqual([c.args[0] for c in progress.call_args_list], list(ANALYSIS_STEPS))
+        self.assertEqual(results, list(analyzer.iter_analysis(ARTICLE_TEXT))[-1][2]['results'])
+
+    def test_stream_sends_one_event_per_stage(self):
+        with mock.patch('analyzer.agents.pool_members_config', return_value=[]), \
+                mock.patch('analyzer.views.ArticleScraper.scrape_article', return_value=scraped()):
+            response = self.client.post(reverse('analyze_stream'), {'article_url': 'https://example.com/bridge'})
+            events = [json.loads(line[len('data: '):])
+                      for line in b''.join(response.streaming_content).decode().split('\n\n') if line]
+
+        staged = [e['step'] for e in events if 'elapsed_ms' in e and e['step'].startswith('agent')]
+        self.assertEqual(staged, [step for step, _, _ in ANALYSIS_STEPS.values()])
+        self.assertEqual(events[-1]['step'], 'complete')
+        self.assertEqual(events[-1]['article_id'], Article.objects.get().id)
+
+
+RULE_TEXTS = [
+    '',
+    ARTICLE_TEXT,
+    # Keywords shared by rules, and rule matches overlapping each other
+    'According to reports, said John Adams Smith. Sources said insiders familiar with it agreed.',
+    'ACCORDING TO Mary Jones, OFFICIALS SAID it was SHOCKING. Allegedly, reportedly, anonymous source.',
+    # Loaded words only as whole words
+    'Shockingly, the unbelievably stunning result was incredible.',
+    # Text whose lowercase form is a different length, or uses ı/ſ for ASCII letters
+    'İstanbul officials said costs rose, said Ali Kaya.',
+    'Experts ſay otherwise; ıt is believed, said Jane Doe.',
+    # More matches than the analyzer reports
+    ' '.join(f'{first} {last}, an aide, said so. Said {last} {first} later.'
+             for first in ('Anna', 'Ben', 'Carl', 'Dora') for last in ('Lee', 'Moss', 'Nash', 'Ortiz'))
+    + ' Sources say so.' * 40,
+]
+
+
+class RuleEngineEquivalenceTests(TestCase):
+    def spans(self, matches):
+        return [(m.start(), m.end(), m.groups()) for m in matches]
+
+    def test_single_pass_scan_matches_the_per_rule_scans(self):
+        for text in RULE_TEXTS:
+            with self.subTest(text=text[:40]):
+                fast, reference = rule_engine.scan(text), rule_engine.scan_reference(text)
+                self.assertEqual(self.spans(fast.quoted_sources), self.spans(reference.quoted_sources))
+                self.assertEqual(self.spans(fast.attributed_sources), self.spans(reference.attributed_sources))
+                self.assertEqual([(v, m.span()) for v, m in fast.anonymous],
+                                 [(v, m.span()) for v, m in reference.anonymous])
+                self.assertEqual(fast.loaded_word, reference.loaded_word)
+
+    def test_analyzer_output_is_the_same_in_both_modes(self):
+        single_pass, per_rule = RuleBasedAnalyzer(single_pass=True), RuleBasedAnalyzer(single_pass=False)
+        for text in RULE_TEXTS:
+            with self.subTest(text=text[:40]):
+                named = single_pass.extract_named_sources(text)
+                self.assertEqual(named, per_rule.extract_named_sources(text))
+                self.assertEqual(single_pass.detect_anonymous_phrases(text), per_rule.detect_anonymous_phrases(text))
+                self.assertEqual(single_pass.detect_bias(text, named), per_rule.detect_bias(text, named))
+
+
+ARTICLE_BODY = ''.join(
+    f'<p>Paragraph {n}: the café owner’s résumé was naïve, said the report, at some length.</p>'
+    for n in range(6)
+)
+
+
+def page(head=''):
+    return (f'<html><head>{head}<title>Café news</title></head><body><nav><p>Home | World | Café</p></nav>'
+            f'<article><h1>Café résumé</h1>{ARTICLE_BODY}</article><footer>Footer</footer></body></html>')
+
+
+def in_chunks(data, size):
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+class LxmlExtractorTests(TestCase):
+    def test_utf8_pages_without_a_charset(self):
+        title, content = extract_article([page().encode('utf-8')])
+
+        self.assertEqual(title, 'Café résumé')
+        self.assertIn('the café owner’s résumé was naïve', content)
+        self.assertNotIn('Ã', content)
+
+    def test_meta_charset_and_declared_encoding(self):
+        html = page('<meta http-equiv="Content-Type" content="text/html; charset=windows-1252">')
+        data = html.replace('’', "'").encode('cp1252')
+
+        self.assertIn("café owner's résumé", extract_article([data])[1])
+        self.assertIn("café owner's résumé", extract_article([data], 'cp1252')[1])
+
+    def test_sniffing(self):
+        self.assertEqual(sniff_encoding(b'\xef\xbb\xbf<html>'), 'utf-8')
+        self.assertEqual(sniff_encoding(b'<meta charset="ISO-8859-1">'), 'iso8859-1')
+        self.assertEqual(sniff_encoding(b'<meta charset="no-such-charset">'), 'utf-8')
+        self.assertEqual(sniff_encoding(b'<html>'), 'utf-8')
+
+    def test_chunked_feed_matches_a_single_chunk(self):
+        data = page().encode('utf-8')
+        # 7-byte chunks split multi-byte characters between chunks
+        self.assertEqual(extract_article(in_chunks(data, 7)), extract_article([data]))
+
+    def test_stops_reading_once_the_article_closes(self):
+        data = page().encode('utf-8') + b'<p>unread</p>' * 5000
+        chunks = iter(in_chunks(data, 1024))
+        extract_article(chunks)
+
+        self.assertTrue(list(chunks))
+
+    def test_both_engines_agree(self):
+        data = in_chunks(page().encode('utf-8'), 64)
+        lxml_title, lxml_content = ArticleScraper(engine='lxml').extract(iter(data))
+        bs4_title, bs4_content = ArticleScraper(engine='bs4').extract(iter(data))
+
+        self.assertEqual(lxml_title, bs4_title)
+        for n in range(6):
+            self.assertIn(f'Paragraph {n}: the café owner’s résumé', lxml_content)
+            self.assertIn(f'Paragraph {n}: the café owner’s résumé', bs4_content)
@@ -5,5 +5,6 @@ urlpatterns = [
     path('', views.index, name='analyzer'),
     path('analyze/', views.analyze_article_stream, name='analyze'),
     path('analyze-stream/', views.analyze_article_stream, name='analyze_stream'),
+    path('analyze-batch/', views.analyze_batch_stream, name='analyze_batch'),
     path('results/<int:article_id>/', views.results, name='results'),
 ]
\ No newline at end of file
@@ -1,15 +1,32 @@
 from django.shortcuts import render, redirect, get_object_or_404
 from django.http import JsonResponse, StreamingHttpResponse
-from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.csrf import csrf_exempt, ensure_csrf_cookie
 from .models import Article
 from .agents import AdvancedSourceAnalyzer
 from .scraper import ArticleScraper
+from .batch import analyze_urls
 import json
 import time
 from dotenv import load_dotenv
 
 load_dotenv()
 
+# analyze_article stage -> (stream step, agent label, progress % once the stage is done)
+ANALYSIS_STEPS = {
+    'sources': ('agent1', 'Agent 1: Deep Source Extractor', 35),
+    'anonymous': ('agent2', 'Agent 2: Anonymous Hunter', 50),
+    'bias': ('agent3', 'Agent 3: Bias Detector', 65),
+    'red_flags': ('agent4', 'Agent 4: Red Flag Auditor', 75),
+    'metrics': ('agent5', 'Agent 5: Quality Calculator', 90),
+    'recommendations': ('agent6', 'Agent 6: Recommendation Engine', 95),
+}
+
+
+def timing(elapsed_ms):
+    """Suffix with a measured duration for progress messages"""
+    return f" ({elapsed_ms:.0f} ms)" if elapsed_ms >= 1 else " (<1 ms)"
+
+@ensure_csrf_cookie
 def index(request):
     """Analyzer main page with split-screen layout"""
     recent_analyses = Article.objects.all()[:10]
@@ -21,69 +38,51 @@ def analyze_article_stream(request):
     """Stream analysis progress in real-time with advanced agents"""
     if request.method == 'POST':
         article_url = request.POST.get('article_url', '')
+        force_refresh = request.POST.get('force_refresh', '').lower() in ('1', 'true', 'on', 'yes')
         
         def event_stream():
             try:
                 # Step 1: Scraping
-                yield f"data: {json.dumps({'step': 'scraping', 'message': 'Initializing web scraper...', 'agent': 'Web Scraper'})}\n\n"
-                time.sleep(0.3)
+                yield f"data: {json.dumps({'step': 'scraping', 'message': f'Fetching content from {article_url}', 'agent': 'Web Scraper', 'progress': 5})}\n\n"
                 
+                started = time.perf_counter()
                 scraper = ArticleScraper()
-                yield f"data: {json.dumps({'step': 'scraping', 'message': f'Fetching content from {article_url}', 'agent': 'Web Scraper'})}\n\n"
-                
                 scraped_data = scraper.scrape_article(article_url)
                 
                 if not scraped_data['success']:
                     yield f"data: {json.dumps({'step': 'error', 'message': scraped_data['error']})}\n\n"
                     return
                 
-                yield f"data: {json.dumps({'step': 'scraping', 'message': 'Content extracted successfully', 'agent': 'Web Scraper', 'progress': 15})}\n\n"
-                time.sleep(0.3)
+                elapsed_ms = round((time.perf_counter() - started) * 1000, 1)
+                message = f"Content extracted ({len(scraped_data['content'])} chars)" + timing(elapsed_ms)
+                yield f"data: {json.dumps({'step': 'scraping', 'message': message, 'agent': 'Web Scraper', 'progress': 15, 'elapsed_ms': elapsed_ms})}\n\n"
                 
                 # Step 2: Initialize advanced agent system
-                yield f"data: {json.dumps({'step': 'init', 'message': 'Initializing LangChain multi-agent system...', 'agent': 'System', 'progress': 20})}\n\n"
+                started = time.perf_counter()
                 analyzer = AdvancedSourceAnalyzer()
-                time.sleep(0.3)
+                elapsed_ms = round((time.perf_counter() - started) * 1000, 1)
+                message = f"Initialized {'LLM agents' if analyzer.use_api else 'rule-based analysis'}" + timing(elapsed_ms)
+                yield f"data: {json.dumps({'step': 'init', 'message': message, 'agent': 'System', 'progress': 20, 'elapsed_ms': elapsed_ms})}\n\n"
                 
                 article_text = scraped_data['content']
                 
-                # Step 3: Deep Source Extraction
-                yield f"data: {json.dumps({'step': 'agent1', 'message': 'Performing deep source extraction with credibility analysis...', 'agent': 'Agent 1: Deep Source Extractor', 'progress': 30})}\n\n"
-                time.sleep(0.5)
-                yield f"data: {json.dumps({'step': 'agent1', 'message': 'Analyzing source credentials and expertise relevance...', 'agent': 'Agent 1: Deep Source Extractor', 'progress': 35})}\n\n"
-                time.sleep(0.5)
-                
-                # Step 4: Anonymous Attribution Analysis
-                yield f"data: {json.dumps({'step': 'agent2', 'message': 'Hunting anonymous attributions with vagueness scoring...', 'agent': 'Agent 2: Anonymous Hunter', 'progress': 45})}\n\n"
-                time.sleep(0.5)
-                yield f"data: {json.dumps({'step': 'agent2', 'message': 'Calculating vagueness scores for each phrase...', 'agent': 'Agent 2: Anonymous Hunter', 'progress': 50})}\n\n"
-                time.sleep(0.5)
-                
-                # Step 5: Bias Detection
-                yield f"data: {json.dumps({'step': 'agent3', 'message': 'Detecting selection, framing, and language bias...', 'agent': 'Agent 3: Bias Detector', 'progress': 60})}\n\n"
-                time.sleep(0.5)
-                yield f"data: {json.dumps({'step': 'agent3', 'message': 'Analyzing source bias and omission patterns...', 'agent': 'Agent 3: Bias Detector', 'progress': 65})}\n\n"
-                time.sleep(0.5)
-                
-                # Step 6: Red Flag Identification
-                yield f"data: {json.dumps({'step': 'agent4', 'message': 'Identifying journalism red flags with severity levels...', 'agent': 'Agent 4: Red Flag Auditor', 'progress': 75})}\n\n"
-                time.sleep(0.5)
-                
-                # Step 7: Quality Metrics
-                yield f"data: {json.dumps({'step': 'agent5', 'message': 'Calculating diversity, authority, independence scores...', 'agent': 'Agent 5: Quality Calculator', 'progress': 85})}\n\n"
-                time.sleep(0.5)
-                yield f"data: {json.dumps({'step': 'agent5', 'message': 'Computing final transparency score with strict criteria...', 'agent': 'Agent 5: Quality Calculator', 'progress': 90})}\n\n"
-                time.sleep(0.5)
-                
-                # Step 8: Generate Recommendations
-                yield f"data: {json.dumps({'step': 'agent6', 'message': 'Generating actionable improvement recommendations...', 'agent': 'Agent 6: Recommendation Engine', 'progress': 95})}\n\n"
-                time.sleep(0.5)
+                # Same text analyzed by the same analyzer version: serve the stored analysis
+                previous = None if force_refresh else Article.previous_analysis(article_url, article_text, analyzer.version)
+                if previous:
+                    yield f"data: {json.dumps({'step': 'complete', 'message': 'Article unchanged since its last analysis, showing stored results', 'agent': 'System', 'progress': 100, 'article_id': previous.id, 'score': previous.transparency_score, 'cached': True})}\n\n"
+                    return
                 
-                # Run the complete analysis
-                results = analyzer.analyze_article(article_text, {
+                # Steps 3-8: one event as each analysis stage finishes
+                for stage, message, details in analyzer.iter_analysis(article_text, {
                     'title': scraped_data.get('title', 'Untitled'),
                     'url': article_url
-                })
+                }):
+                    if stage == 'complete':
+                        results = details['results']
+                        break
+                    step, agent, progress = ANALYSIS_STEPS[stage]
+                    event = {'step': step, 'message': message + timing(details['elapsed_ms']), 'agent': agent, 'progress': progress, **details}
+                    yield f"data: {json.dumps(event)}\n\n"
                 
                 # Determine score interpretation
                 transparency_score = results['transparency_score']
@@ -99,25 +98,10 @@ def analyze_article_stream(request):
                     score_verdict = "Critical - Severe transparency issues"
                 
                 yield f"data: {json.dumps({'step': 'agent6', 'message': f'Score: {transparency_score}/100 - {score_verdict}', 'agent': 'Agent 6: Recommendation Engine', 'progress': 98})}\n\n"
-                time.sleep(0.3)
                 
                 # Save to database
-                article = Article.objects.create(
-                    title=scraped_data.get('title', 'Untitled'),
-                    content=article_text,
-                    url=article_url,
-                    named_sources=results['named_sources'],
-                    anonymous_phrases=results['anonymous_phrases'],
-                    unique_source_count=results['unique_source_count'],
-                    transparency_score=transparency_score,
-                    red_flags=results['red_flags'],
-                    source_breakdown=results['source_breakdown'],
-                    attribution_patterns={
-                        'bias_analysis': results['bias_analysis'],
-                        'source_quality': results['source_quality'],
-                        'recommendations': results['improvement_recommendations']
-                    }
-                )
+                article = Article.from_analysis(scraped_data, article_url, results, analyzer.version)
+                article.save()
                 
                 yield f"data: {json.dumps({'step': 'complete', 'message': 'Advanced analysis complete!', 'agent': 'System', 'progress': 100, 'article_id': article.id, 'score': transparency_score})}\n\n"
                 
@@ -131,6 +115,49 @@ def analyze_article_stream(request):
     
     return JsonResponse({'error': 'POST method required'}, status=405)
 
+def analyze_batch_stream(request):
+    """
+    Analyze a list of article URLs concurrently; streams one server-sent
+    event per URL step and a final summary.
+    Body: {"urls": [...]} (JSON) or a newline-separated `urls` form field;
+    ?force_refresh=1 re-analyzes articles that haven't changed
+
+    CSRF-protected like the app's other POST endpoints: JSON clients send
+    the `csrftoken` cookie (set by the analyzer page) as an X-CSRFToken header.
+    """
+    if request.method != 'POST':
+        return JsonResponse({'error': 'POST method required'}, status=405)
+    
+    if request.content_type == 'application/json':
+        try:
+            data = json.loads(request.body)
+        except json.JSONDecodeError:
+            return JsonResponse({'error': 'Invalid JSON in request body'}, status=400)
+        if not isinstance(data, dict):
+            return JsonResponse({'error': 'Request body must be a JSON object'}, status=400)
+        urls = data.get('urls') or []
+        if not isinstance(urls, list) or not all(isinstance(url, str) for url in urls):
+            return JsonResponse({'error': '"urls" must be a list of URL strings'}, status=400)
+    else:
+        urls = request.POST.get('urls', '').splitlines()
+    
+    if not urls:
+        return JsonResponse({'error': 'No URLs provided'}, status=400)
+    
+    force_refresh = request.GET.get('force_refresh', '').lower() in ('1', 'true', 'on', 'yes')
+    
+    def event_stream():
+        try:
+            for event in analyze_urls(urls, force_refresh=force_refresh):
+                yield f"data: {json.dumps(event)}\n\n"
+        except Exception as e:
+            yield f"data: {json.dumps({'event': 'error', 'stage': 'batch', 'error': str(e)})}\n\n"
+    
+    response = StreamingHttpResponse(event_stream(), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
 def results(request, article_id):
     """Display analysis results"""
     article = get_object_or_404(Article, id=article_id)
@@ -81,6 +81,10 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        # Background verification workers write concurrently with web requests
+        'OPTIONS': {
+            'timeout': 20,
+        },
     }
 }
 
@@ -129,4 +133,39 @@ STATICFILES_DIRS = [os.path.join(BASE_DIR, 'static')]
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 os.makedirs(os.path.join(BASE_DIR, 'media/reports/pdf'), exist_ok=True)
-os.makedirs(os.path.join(BASE_DIR, 'media/reports/video'), exist_ok=True)
\ No newline at end of file
+os.makedirs(os.path.join(BASE_DIR, 'media/reports/video'), exist_ok=True)
+
+# Background claim verification (python manage.py verification_worker)
+VERIFICATION_WORKER_THREADS = int(os.getenv('VERIFICATION_WORKER_THREADS', '4'))
+VERIFICATION_JOBS_PER_LEASE = int(os.getenv('VERIFICATION_JOBS_PER_LEASE', '5'))
+
+# Time budget for one claim extraction request; kept below the 60s proxy
+# timeout so partial results are returned instead of a gateway error
+REQUEST_DEADLINE_SECONDS = float(os.getenv('REQUEST_DEADLINE_SECONDS', '50'))
+
+# Verdicts older than this are re-checked by `manage.py reverify_claims`
+REVERIFY_AFTER_DAYS = float(os.getenv('REVERIFY_AFTER_DAYS', '7'))
+
+# YouTube transcripts are served from the database cache for this long
+TRANSCRIPT_CACHE_TTL_HOURS = float(os.getenv('TRANSCRIPT_CACHE_TTL_HOURS', '168'))
+
+# Playlist/channel batch ingestion (agents/batch_ingestion.py)
+BATCH_FETCH_WORKERS = int(os.getenv('BATCH_FETCH_WORKERS', '4'))
+BATCH_EXTRACT_WORKERS = int(os.getenv('BATCH_EXTRACT_WORKERS', '2'))
+YOUTUBE_REQUESTS_PER_SECOND = float(os.getenv('YOUTUBE_REQUESTS_PER_SECOND', '1'))
+
+# Background claim extraction (python manage.py extraction_worker)
+EXTRACTION_WORKER_THREADS = int(os.getenv('EXTRACTION_WORKER_THREADS', '2'))
+# Time budget for one extraction job (and one video in batch ingestion);
+# kept below the job lease (agents/extraction_jobs.LEASE_SECONDS) so a slow
+# job finishes with partial results instead of being re-run by another worker
+EXTRACTION_JOB_DEADLINE_SECONDS = float(os.getenv('EXTRACTION_JOB_DEADLINE_SECONDS', '540'))
+# Claims are inserted with bulk_create in batches of this many rows
+CLAIM_BULK_BATCH_SIZE = int(os.getenv('CLAIM_BULK_BATCH_SIZE', '500'))
+
+# Batch article analysis (analyzer/batch.py)
+ANALYZER_SCRAPE_WORKERS = int(os.getenv('ANALYZER_SCRAPE_WORKERS', '8'))
+ANALYZER_WORKERS = int(os.getenv('ANALYZER_WORKERS', '4'))
+ANALYZER_DOMAIN_REQUESTS_PER_SECOND = float(os.getenv('ANALYZER_DOMAIN_REQUESTS_PER_SECOND', '1'))
+ANALYZER_DOMAIN_CONCURRENCY = int(os.getenv('ANALYZER_DOMAIN_CONCURRENCY', '2'))
+ARTICLE_BULK_BATCH_SIZE = int(os.getenv('ARTICLE_BULK_BATCH_SIZE', '20'))
@@ -0,0 +1,81 @@
+# Generated by Django 5.2.18 on 2026-10-19 00:11
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Claim',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('title', models.CharField(max_length=500)),
+                ('content', models.TextField()),
+                ('source_url', models.URLField(blank=True, null=True)),
+                ('source_type', models.CharField(default='text', max_length=50)),
+                ('status', models.CharField(choices=[('pending', 'Pending Verification'), ('verified', 'Verified'), ('false', 'False'), ('misleading', 'Misleading')], default='pending', max_length=20)),
+                ('verification_notes', models.TextField(blank=True)),
+                ('language', models.CharField(choices=[('en', 'English'), ('es', 'Spanish'), ('fr', 'French'), ('de', 'German'), ('hi', 'Hindi'), ('zh', 'Chinese'), ('ar', 'Arabic')], default='en', max_length=5)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('is_archived', models.BooleanField(default=False)),
+                ('tags', models.CharField(blank=True, help_text='Comma-separated tags', max_length=500)),
+                ('created_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='NewsReport',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('title', models.CharField(max_length=500)),
+                ('format_type', models.CharField(choices=[('pdf', 'PDF Document'), ('video', 'Video (Veo 3)')], max_length=10)),
+                ('language', models.CharField(choices=[('en', 'English'), ('es', 'Spanish'), ('fr', 'French'), ('de', 'German'), ('hi', 'Hindi'), ('zh', 'Chinese'), ('ar', 'Arabic')], default='en', max_length=5)),
+                ('content', models.TextField(help_text='Generated report content/script')),
+                ('pdf_file', models.FileField(blank=True, null=True, upload_to='reports/pdf/')),
+                ('video_file', models.FileField(blank=True, null=True, upload_to='reports/video/')),
+                ('video_prompt', models.TextField(blank=True, help_text='Prompt sent to Veo 3')),
+                ('generated_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('claims', models.ManyToManyField(related_name='reports', to='notes.claim')),
+                ('created_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-generated_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='VideoGenerationJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('processing', 'Processing'), ('completed', 'Completed'), ('failed', 'Failed')], default='pending', max_length=20)),
+                ('error_message', models.TextField(blank=True)),
+                ('veo3_job_id', models.CharField(blank=True, max_length=200)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('completed_at', models.DateTimeField(blank=True, null=True)),
+                ('report', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='video_jobs', to='notes.newsreport')),
+            ],
+            options={
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='claim',
+            index=models.Index(fields=['-created_at'], name='notes_claim_created_796764_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='claim',
+            index=models.Index(fields=['status'], name='notes_claim_status_85edfc_idx'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-19 00:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notes', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='claim',
+            name='evidence_fingerprint',
+            field=models.CharField(blank=True, max_length=64),
+        ),
+        migrations.AddField(
+            model_name='claim',
+            name='verified_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,69 @@
+# Generated by Django 5.2.18 on 2026-10-19 02:40
+
+import hashlib
+
+from django.db import migrations, models
+
+
+def content_hash(claim):
+    # Same as Claim.compute_content_hash (historical models have no custom methods)
+    normalized = ' '.join((claim.content or '').lower().split())
+    key = '\x1f'.join([normalized, (claim.source_url or '').strip(), claim.source_type or ''])
+    return hashlib.sha256(key.encode('utf-8')).hexdigest()
+
+
+def backfill_and_dedupe(apps, schema_editor):
+    """
+    Hashes existing claims and folds duplicates into one row per hash:
+    the one with a verdict if any, otherwise the oldest. Verification jobs
+    and report links of the duplicates are moved to the row that is kept.
+    """
+    Claim = apps.get_model('notes', 'Claim')
+    VerificationJob = apps.get_model('agents', 'VerificationJob')
+    Through = Claim.reports.through
+
+    groups = {}
+    for claim in Claim.objects.order_by('id').iterator():
+        groups.setdefault(content_hash(claim), []).append(claim)
+
+    removed = 0
+    for digest, claims in groups.items():
+        claims.sort(key=lambda c: (c.verified_at is None, c.id))
+        keep, duplicates = claims[0], [c.id for c in claims[1:]]
+        if duplicates:
+            VerificationJob.objects.filter(claim_id__in=duplicates).update(claim_id=keep.id)
+            linked = set(Through.objects.filter(claim_id=keep.id).values_list('newsreport_id', flat=True))
+            for link in Through.objects.filter(claim_id__in=duplicates):
+                if link.newsreport_id not in linked:
+                    Through.objects.create(newsreport_id=link.newsreport_id, claim_id=keep.id)
+                    linked.add(link.newsreport_id)
+            Through.objects.filter(claim_id__in=duplicates).delete()
+            Claim.objects.filter(id__in=duplicates).delete()
+            removed += len(duplicates)
+        Claim.objects.filter(id=keep.id).update(content_hash=digest)
+
+    if removed:
+        print(f"\n  Removed {removed} duplicate claims")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notes', '0002_claim_verified_at'),
+        ('agents', '0005_extraction_job'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='claim',
+            name='content_hash',
+            field=models.CharField(default='', editable=False, max_length=64),
+            preserve_default=False,
+        ),
+        migrations.RunPython(backfill_and_dedupe, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='claim',
+            name='content_hash',
+            field=models.CharField(editable=False, max_length=64, unique=True),
+        ),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 5.2.18 on 2026-10-19 01:27
+
+from importlib import import_module
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from django.db import migrations, models
+
+# Re-hashes every claim and folds rows that now share a hash into one
+backfill_and_dedupe = import_module('notes.migrations.0003_claim_content_hash').backfill_and_dedupe
+
+
+def split_deep_link(url):
+    """(video URL without the t= parameter, the deep link) or (url, '') if it has none"""
+    parts = urlsplit(url or '')
+    query = parse_qsl(parts.query, keep_blank_values=True)
+    if not any(key == 't' for key, _ in query):
+        return url, ''
+    kept = urlencode([(key, value) for key, value in query if key != 't'])
+    return urlunsplit(parts._replace(query=kept)), url
+
+
+def move_deep_links(apps, schema_editor):
+    """Moves timestamp deep links stored as source_url to timestamp_url"""
+    Claim = apps.get_model('notes', 'Claim')
+    moved = 0
+    for claim in Claim.objects.filter(source_type='youtube', source_url__contains='t=').iterator():
+        source_url, timestamp_url = split_deep_link(claim.source_url)
+        if timestamp_url:
+            Claim.objects.filter(id=claim.id).update(source_url=source_url, timestamp_url=timestamp_url)
+            moved += 1
+    if moved:
+        backfill_and_dedupe(apps, schema_editor)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notes', '0003_claim_content_hash'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='claim',
+            name='timestamp_url',
+            field=models.URLField(blank=True, max_length=500),
+        ),
+        migrations.RunPython(move_deep_links, migrations.RunPython.noop),
+    ]
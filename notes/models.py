@@ -1,4 +1,6 @@
 # notes/models.py
+import hashlib
+
 from django.db import models
 from django.utils import timezone
 from django.contrib.auth.models import User
@@ -27,10 +29,19 @@ class Claim(models.Model):
     content = models.TextField()
     source_url = models.URLField(blank=True, null=True)
     source_type = models.CharField(max_length=50, default='text')  # text, youtube, article
+    # Where in the source the claim is first made (YouTube timestamp link);
+    # kept out of source_url, which is part of content_hash, so re-ingesting
+    # a video whose caption timings shifted doesn't create new claims
+    timestamp_url = models.URLField(max_length=500, blank=True)
     
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
     verification_notes = models.TextField(blank=True)
     
+    # When the verdict was last confirmed, and a fingerprint of the evidence
+    # it was based on (see agents/management/commands/reverify_claims.py)
+    verified_at = models.DateTimeField(null=True, blank=True)
+    evidence_fingerprint = models.CharField(max_length=64, blank=True)
+    
     language = models.CharField(max_length=5, choices=LANGUAGE_CHOICES, default='en')
     
     created_at = models.DateTimeField(default=timezone.now)
@@ -41,6 +52,10 @@ class Claim(models.Model):
     is_archived = models.BooleanField(default=False)
     tags = models.CharField(max_length=500, blank=True, help_text="Comma-separated tags")
     
+    # Identity of the claim as ingested (normalized content + source), so
+    # re-submitting the same text or video updates rows instead of adding them
+    content_hash = models.CharField(max_length=64, unique=True, editable=False)
+    
     class Meta:
         ordering = ['-created_at']
         indexes = [
@@ -51,6 +66,21 @@ class Claim(models.Model):
     def __str__(self):
         return f"{self.title[:50]}... ({self.status})"
     
+    @staticmethod
+    def compute_content_hash(content, source_url, source_type):
+        normalized = ' '.join((content or '').lower().split())
+        key = '\x1f'.join([normalized, (source_url or '').strip(), source_type or ''])
+        return hashlib.sha256(key.encode('utf-8')).hexdigest()
+    
+    def save(self, *args, **kwargs):
+        # Kept in step with edits, so an edited claim is matched by its new
+        # content and can't collide with (or be overwritten as) its old self
+        self.content_hash = self.compute_content_hash(self.content, self.source_url, self.source_type)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and {'content', 'source_url', 'source_type'} & set(update_fields):
+            kwargs['update_fields'] = {*update_fields, 'content_hash'}
+        super().save(*args, **kwargs)
+    
     def get_tags_list(self):
         """Return tags as a list"""
         if self.tags:
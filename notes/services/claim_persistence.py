@@ -0,0 +1,137 @@
+# notes/services/claim_persistence.py
+"""
+Saving extracted claims to notes.Claim.
+
+Every path that stores pipeline output (the extraction worker, the
+YouTube transcript view, batch ingestion and notes' bulk_save_claims)
+goes through here, so claims are mapped the same way everywhere and
+written with bulk_create inside a single transaction.
+
+Writes are upserts on Claim.content_hash: re-submitting the same text or
+video refreshes the existing rows instead of creating duplicates.
+"""
+from django.conf import settings
+from django.db import transaction
+
+from notes.models import Claim
+
+# Columns refreshed when an ingested claim already exists (the deep link
+# follows the latest caption timings). The verdict is left alone;
+# re-verification is reverify_claims' job.
+UPSERT_UPDATE_FIELDS = ['title', 'timestamp_url', 'updated_at']
+
+VERDICT_TO_STATUS = {
+    'VERIFIED': 'verified',
+    'TRUE': 'verified',
+    'PARTIALLY_VERIFIED': 'verified',
+    'FALSE': 'false',
+    'MISLEADING': 'misleading',
+    'UNVERIFIABLE': 'pending',
+    'PENDING': 'pending',
+    'TIMED_OUT': 'pending',
+}
+
+
+def format_verification_notes(reasoning, confidence, sources) -> str:
+    parts = []
+    if reasoning:
+        parts.append(f"Reasoning: {reasoning}")
+    if confidence:
+        parts.append(f"Confidence: {confidence:.0%}")
+    if sources:
+        parts.append(f"Sources: {', '.join(sources[:3])}")
+    return '\n'.join(parts)
+
+
+def claim_title(claim_text: str) -> str:
+    return claim_text[:100] + '...' if len(claim_text) > 100 else claim_text
+
+
+def claim_from_pipeline(claim_data, source_type: str = 'text', source_url: str = '', user=None):
+    """
+    Unsaved Claim for one pipeline claim (a ClaimStore dict or a plain
+    string), as (Claim, canonical_claim, occurrences); None if it's empty.
+    """
+    if isinstance(claim_data, str):
+        claim_data = {'canonical_claim': claim_data}
+    elif not isinstance(claim_data, dict):
+        return None
+
+    claim_text = claim_data.get('canonical_claim', claim_data.get('claim', claim_data.get('text', '')))
+    if not claim_text or not claim_text.strip():
+        return None
+
+    verification = claim_data.get('verification') or {}
+    if not isinstance(verification, dict):
+        verification = {
+            'verdict': verification,
+            'confidence': claim_data.get('confidence'),
+            'reasoning': claim_data.get('reasoning'),
+            'evidence_sources': claim_data.get('sources'),
+        }
+    verdict = verification.get('verdict') or 'PENDING'
+
+    # Deep-link to where the claim is first made (YouTube timestamps)
+    occurrences = claim_data.get('occurrences') or []
+    timestamp_url = occurrences[0].get('timestamp_url') if occurrences else None
+
+    claim = Claim(
+        title=claim_title(claim_text),
+        content=claim_text,
+        source_url=source_url or '',
+        timestamp_url=timestamp_url or '',
+        source_type=source_type,
+        verification_notes=format_verification_notes(
+            verification.get('reasoning'),
+            verification.get('confidence'),
+            verification.get('evidence_sources'),
+        ),
+        status=VERDICT_TO_STATUS.get(verdict.upper() if isinstance(verdict, str) else 'PENDING', 'pending'),
+        created_by=user,
+    )
+    return claim, claim_text, len(occurrences) or 1
+
+
+def save_claims(claims: list, batch_size: int = None) -> list[int]:
+    """
+    Upserts unsaved Claim objects with bulk_create in one transaction, in
+    batches of CLAIM_BULK_BATCH_SIZE rows. Returns the ids in input order;
+    claims that already existed (or repeat within `claims`) get the id of
+    the existing row. Raises ValueError for a claim without content: all
+    empty claims would hash alike and collapse into one row.
+    """
+    if not claims:
+        return []
+    if any(not (claim.content or '').strip() for claim in claims):
+        raise ValueError('Claims without content cannot be saved')
+
+    unique = {}
+    for claim in claims:
+        claim.content_hash = Claim.compute_content_hash(claim.content, claim.source_url, claim.source_type)
+        unique.setdefault(claim.content_hash, claim)
+
+    with transaction.atomic():
+        Claim.objects.bulk_create(
+            list(unique.values()),
+            batch_size=batch_size or settings.CLAIM_BULK_BATCH_SIZE,
+            update_conflicts=True,
+            unique_fields=['content_hash'],
+            update_fields=UPSERT_UPDATE_FIELDS,
+        )
+
+    for claim in claims:
+        claim.id = unique[claim.content_hash].id
+    return [claim.id for claim in claims]
+
+
+def save_pipeline_claims(claims_data: list, source_type: str = 'text', source_url: str = '',
+                         user=None, batch_size: int = None) -> list[tuple]:
+    """
+    Maps pipeline claims to Claim rows and saves them in bulk. Returns
+    (Claim, canonical_claim, occurrences) triples, ready for enqueue_claims.
+    """
+    rows = [claim_from_pipeline(claim_data, source_type, source_url, user) for claim_data in claims_data]
+    rows = [row for row in rows if row is not None]
+    claim_ids = save_claims([claim for claim, _, _ in rows], batch_size)
+    print(f"💾 Saved {len(rows)} {source_type} claims ({len(set(claim_ids))} distinct rows)")
+    return rows
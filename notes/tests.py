@@ -1,3 +1,189 @@
-from django.test import TestCase
+import json
 
-# Create your tests here.
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.test import TestCase, TransactionTestCase
+from django.urls import reverse
+
+from .models import Claim
+from .services.claim_persistence import save_claims, save_pipeline_claims
+
+
+def saved_ids(rows):
+    return [claim.id for claim, _, _ in rows]
+
+
+class SaveClaimsTests(TestCase):
+    def test_resubmitting_updates_existing_rows(self):
+        first = save_pipeline_claims(['The sky is green.', 'Water boils at 50C.'], 'text')
+        second = save_pipeline_claims(['The sky is green.', 'Water boils at 50C.'], 'text')
+
+        self.assertEqual(saved_ids(first), saved_ids(second))
+        self.assertEqual(Claim.objects.count(), 2)
+
+    def test_repeats_within_a_batch_share_one_row(self):
+        ids = save_claims([
+            Claim(title='a', content='The sky is green.', source_type='text'),
+            Claim(title='a', content='the  SKY is green.', source_type='text'),
+        ])
+
+        self.assertEqual(ids[0], ids[1])
+        self.assertEqual(Claim.objects.count(), 1)
+
+    def test_same_text_from_another_source_is_a_separate_claim(self):
+        save_pipeline_claims(['The sky is green.'], 'text')
+        save_pipeline_claims(['The sky is green.'], 'youtube', source_url='https://youtu.be/abc')
+
+        self.assertEqual(Claim.objects.count(), 2)
+
+    def test_upsert_keeps_the_verdict(self):
+        [claim_id] = saved_ids(save_pipeline_claims(['The sky is green.'], 'text'))
+        Claim.objects.filter(id=claim_id).update(status='false', verification_notes='Reasoning: no')
+
+        save_pipeline_claims(['The sky is green.'], 'text')
+
+        claim = Claim.objects.get(id=claim_id)
+        self.assertEqual(claim.status, 'false')
+        self.assertEqual(claim.verification_notes, 'Reasoning: no')
+
+    def test_caption_timing_changes_dont_create_new_claims(self):
+        video_url = 'https://www.youtube.com/watch?v=abc'
+
+        def ingest(seconds):
+            claim = {'canonical_claim': 'The sky is green.',
+                     'occurrences': [{'timestamp_url': f'{video_url}&t={seconds}s'}]}
+            return saved_ids(save_pipeline_claims([claim], 'youtube', source_url=video_url))
+
+        first, second = ingest(12), ingest(15)
+
+        self.assertEqual(first, second)
+        claim = Claim.objects.get()
+        self.assertEqual(claim.source_url, video_url)
+        self.assertEqual(claim.timestamp_url, f'{video_url}&t=15s')
+
+    def test_empty_claims_are_rejected(self):
+        with self.assertRaises(ValueError):
+            save_claims([Claim(title='a', content='The sky is green.', source_type='text'),
+                         Claim(title='b', content='  ', source_type='text')])
+
+        self.assertFalse(Claim.objects.exists())
+
+    def test_bulk_save_skips_empty_claims(self):
+        body = {'claims': [{'claim': ''}, {'claim': 'The sky is green.'}, {'title': 'No claim'}, {'claim': ' \n'},
+                           {'claim': 'Water boils at 50C.'}]}
+
+        response = self.client.post(reverse('bulk_save_claims'), json.dumps(body), content_type='application/json')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual((response.json()['created_count'], response.json()['skipped_count']), (2, 3))
+        self.assertEqual(sorted(Claim.objects.values_list('content', flat=True)),
+                         ['The sky is green.', 'Water boils at 50C.'])
+
+
+class ClaimEditTests(TestCase):
+    def edit(self, claim, **changes):
+        data = {
+            'title': claim.title,
+            'content': claim.content,
+            'source_url': claim.source_url or '',
+            'source_type': claim.source_type,
+            'status': claim.status,
+            'verification_notes': claim.verification_notes,
+            'language': claim.language,
+            'tags': claim.tags,
+            **changes,
+        }
+        return self.client.post(reverse('claim_edit', args=[claim.id]), data)
+
+    def test_edit_then_reingest_creates_a_new_row(self):
+        [claim_id] = saved_ids(save_pipeline_claims(['The sky is green.'], 'text'))
+        response = self.edit(Claim.objects.get(id=claim_id), title='Edited', content='Edited content')
+        self.assertEqual(response.status_code, 200)
+
+        [reingested_id] = saved_ids(save_pipeline_claims(['The sky is green.'], 'text'))
+
+        self.assertNotEqual(reingested_id, claim_id)
+        edited = Claim.objects.get(id=claim_id)
+        self.assertEqual((edited.title, edited.content), ('Edited', 'Edited content'))
+        self.assertEqual(edited.content_hash, Claim.compute_content_hash('Edited content', '', 'text'))
+
+    def test_editing_into_a_duplicate_is_a_form_error(self):
+        first, second = saved_ids(save_pipeline_claims(['The sky is green.', 'Water boils at 50C.'], 'text'))
+
+        response = self.edit(Claim.objects.get(id=second), content='The sky is green.')
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('content', response.json()['errors'])
+        self.assertEqual(Claim.objects.get(id=second).content, 'Water boils at 50C.')
+
+
+class ContentHashMigrationTests(TransactionTestCase):
+    before = [('notes', '0002_claim_verified_at'), ('agents', '0005_extraction_job')]
+    after = [('notes', '0003_claim_content_hash')]
+
+    def setUp(self):
+        executor = MigrationExecutor(connection)
+        executor.migrate(self.before)
+        self.apps = executor.loader.project_state(self.before).apps
+
+    def tearDown(self):
+        executor = MigrationExecutor(connection)
+        executor.migrate(executor.loader.graph.leaf_nodes())
+
+    def test_duplicates_are_folded_into_the_verified_row(self):
+        OldClaim = self.apps.get_model('notes', 'Claim')
+        OldJob = self.apps.get_model('agents', 'VerificationJob')
+        oldest = OldClaim.objects.create(title='t', content='The sky is green.', source_type='text')
+        verified = OldClaim.objects.create(title='t', content='the sky  is GREEN.', source_type='text',
+                                           status='false', verified_at='2026-01-01T00:00Z')
+        other = OldClaim.objects.create(title='t', content='Water boils at 50C.', source_type='text')
+        OldJob.objects.create(claim_id=oldest.id, canonical_claim='The sky is green.')
+
+        executor = MigrationExecutor(connection)
+        executor.migrate(self.after)
+        apps = executor.loader.project_state(self.after).apps
+        NewClaim = apps.get_model('notes', 'Claim')
+        NewJob = apps.get_model('agents', 'VerificationJob')
+
+        self.assertEqual(set(NewClaim.objects.values_list('id', flat=True)), {verified.id, other.id})
+        self.assertEqual(NewJob.objects.get().claim_id, verified.id)
+        self.assertEqual(
+            NewClaim.objects.get(id=verified.id).content_hash,
+            Claim.compute_content_hash('The sky is green.', '', 'text'),
+        )
+
+
+class TimestampUrlMigrationTests(TransactionTestCase):
+    before = [('notes', '0003_claim_content_hash')]
+    after = [('notes', '0004_claim_timestamp_url')]
+
+    def setUp(self):
+        executor = MigrationExecutor(connection)
+        executor.migrate(self.before)
+        self.apps = executor.loader.project_state(self.before).apps
+
+    def tearDown(self):
+        executor = MigrationExecutor(connection)
+        executor.migrate(executor.loader.graph.leaf_nodes())
+
+    def test_deep_links_move_out_of_source_url(self):
+        OldClaim = self.apps.get_model('notes', 'Claim')
+        video_url = 'https://www.youtube.com/watch?v=abc'
+
+        def create(content, source_url, **fields):
+            return OldClaim.objects.create(title='t', content=content, source_type='youtube', source_url=source_url,
+                                           content_hash=Claim.compute_content_hash(content, source_url, 'youtube'),
+                                           **fields)
+
+        verified = create('The sky is green.', f'{video_url}&t=12s', status='false', verified_at='2026-01-01T00:00Z')
+        create('The sky is green.', f'{video_url}&t=15s')
+        other = create('Water boils at 50C.', f'{video_url}&t=40s')
+
+        executor = MigrationExecutor(connection)
+        executor.migrate(self.after)
+        NewClaim = executor.loader.project_state(self.after).apps.get_model('notes', 'Claim')
+
+        self.assertEqual(set(NewClaim.objects.values_list('id', flat=True)), {verified.id, other.id})
+        moved = NewClaim.objects.get(id=other.id)
+        self.assertEqual((moved.source_url, moved.timestamp_url), (video_url, f'{video_url}&t=40s'))
+        self.assertEqual(moved.content_hash, Claim.compute_content_hash('Water boils at 50C.', video_url, 'youtube'))
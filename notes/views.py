@@ -4,6 +4,7 @@ from django.http import JsonResponse, FileResponse
 from django.views.decorators.http import require_http_methods
 from django.views.decorators.csrf import ensure_csrf_cookie
 from django.core.paginator import Paginator
+from django.db import IntegrityError, transaction
 from django.db.models import Q
 import json
 
@@ -11,6 +12,7 @@ from .models import Claim, NewsReport, VideoGenerationJob
 from .forms import ClaimForm, NewsReportForm
 from .services.pdf_generator import generate_news_pdf
 from .services.veo3_generator import generate_video_with_veo3
+from .services.claim_persistence import save_claims
 
 
 @ensure_csrf_cookie
@@ -69,6 +71,16 @@ def claim_create(request):
             claim = form.save(commit=False)
             if request.user.is_authenticated:
                 claim.created_by = request.user
+            
+            existing = Claim.objects.filter(
+                content_hash=Claim.compute_content_hash(claim.content, claim.source_url, claim.source_type)
+            ).first()
+            if existing:
+                return JsonResponse({
+                    'success': True,
+                    'claim_id': existing.id,
+                    'message': 'Claim already exists'
+                })
             claim.save()
             
             return JsonResponse({
@@ -101,7 +113,16 @@ def claim_edit(request, claim_id):
             claim = form.save(commit=False)
             if request.user.is_authenticated and not claim.created_by:
                 claim.created_by = request.user
-            claim.save()
+            try:
+                with transaction.atomic():
+                    claim.save()
+            except IntegrityError:
+                # Claim.content_hash is unique: the edit duplicates another claim
+                form.add_error('content', 'Another claim already has this content and source.')
+                return JsonResponse({
+                    'success': False,
+                    'errors': form.errors
+                }, status=400)
             
             return JsonResponse({
                 'success': True,
@@ -146,10 +167,10 @@ def bulk_save_claims(request):
         source_url = data.get('source_url', '')
         source_type = data.get('source_type', 'text')
         
-        created_claims = []
-        
-        for claim_data in claims_data:
-            claim = Claim.objects.create(
+        # Empty claims would all share one content hash; there's nothing to save
+        with_content = [c for c in claims_data if (c.get('claim') or '').strip()]
+        claims = [
+            Claim(
                 title=claim_data.get('title', claim_data.get('claim', ''))[:500],
                 content=claim_data.get('claim', ''),
                 source_url=source_url,
@@ -158,14 +179,18 @@ def bulk_save_claims(request):
                 status='pending',
                 created_by=request.user if request.user.is_authenticated else None
             )
-            created_claims.append({
-                'id': claim.id,
-                'title': claim.title
-            })
+            for claim_data in with_content
+        ]
+        claim_ids = save_claims(claims)
+        created_claims = [
+            {'id': claim_id, 'title': claim.title}
+            for claim_id, claim in zip(claim_ids, claims)
+        ]
         
         return JsonResponse({
             'success': True,
             'created_count': len(created_claims),
+            'skipped_count': len(claims_data) - len(with_content),
             'claims': created_claims
         })
         